@@ -56,6 +56,13 @@ class ConfigManager:
             # raise ConfigError("SCRAPING_API_KEY is missing", config_path=env_file_path)
             
         self.lever_api_key = os.getenv('LEVER_API_KEY')
+
+        # Optional on-disk cache of SerpApi responses (saves API credits on repeated dev/test runs)
+        self.enable_http_cache = os.getenv('ENABLE_HTTP_CACHE', 'false').strip().lower() in ('1', 'true', 'yes')
+        self.http_cache_path = os.getenv('HTTP_CACHE_PATH', '.serpapi_cache')
+
+        # Client-side SerpApi request rate limit (requests/second); 0 disables throttling
+        self.serpapi_max_qps = self._get_float_config('SERPAPI_MAX_QPS', 5.0)
         
         # --- Notion Specific Config --- 
         # self.notion_token = os.getenv('NOTION_TOKEN')
@@ -77,6 +84,8 @@ class ConfigManager:
         self.db_path = os.getenv('DB_PATH', 'sqlite:///leads.db')
         if self.db_path == 'sqlite:///leads.db':
             logger.warning("DB_PATH is not set, defaulting to 'sqlite:///leads.db' in the project root.")
+        # Opt-in WAL journaling (plus synchronous=NORMAL) for file-backed SQLite; it rewrites the DB file and adds -wal/-shm sidecars
+        self.sqlite_wal = os.getenv('SQLITE_WAL', 'false').strip().lower() in ('1', 'true', 'yes')
 
         # Simple validation examples (can be expanded)
         if not self.target_location:
@@ -85,6 +94,17 @@ class ConfigManager:
 
         logger.info("ConfigurationManager initialized.")
 
+    def _get_float_config(self, env_var_name, default_value):
+        """Reads a float from an environment variable, falling back to the default if unset or invalid."""
+        value_str = os.getenv(env_var_name)
+        if value_str is None or not value_str.strip():
+            return default_value
+        try:
+            return float(value_str)
+        except ValueError:
+            logger.warning(f"{env_var_name}='{value_str}' is not a number, defaulting to {default_value}.")
+            return default_value
+
     def _get_list_config(self, env_var_name, default_value=None):
         """Helper to get a list from a comma-separated env var."""
         value_str = os.getenv(env_var_name)
@@ -46,9 +46,10 @@ class DataAcquisitionError(PersonalResearchAgentError):
         return base_str
 
 class ApiLimitError(DataAcquisitionError):
-    """Raised when an API rate limit is hit."""
-    def __init__(self, message="API rate limit exceeded", source=None, original_exception=None):
+    """Raised when an API rate limit is hit. retry_after holds the server's requested wait in seconds, if any."""
+    def __init__(self, message="API rate limit exceeded", source=None, original_exception=None, retry_after=None):
         super().__init__(message, source, original_exception)
+        self.retry_after = retry_after
 
 class ApiAuthError(DataAcquisitionError):
     """Raised for API authentication failures."""
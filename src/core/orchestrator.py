@@ -35,7 +35,7 @@ class Orchestrator:
             self.greenhouse_client = GreenhouseClient(config_manager=self.config_manager)
             
             # Initialize processing component
-            self.lead_processor = LeadProcessor(config_manager=self.config_manager, company_scraper=self.company_scraper)
+            self.lead_processor = LeadProcessor(config_manager=self.config_manager, company_scraper=self.company_scraper, db_manager=self.db_manager)
             
             logger.info("Orchestrator initialized successfully.")
             
@@ -90,7 +90,6 @@ class Orchestrator:
                      scraped = self.linkedin_scraper.scrape_pms_by_location(keywords=keywords, location=location)
                      logger.info(f"Scraped {len(scraped)} raw leads for query: {query}")
                      raw_leads.extend(scraped)
-                     time.sleep(random.uniform(2, 5)) # Delay between searches
                  except Exception as e:
                      logger.error(f"Error during LinkedIn scraping for query {query}: {e}")
             else:
@@ -182,7 +181,6 @@ class Orchestrator:
                     leads_failed += 1
                     # No rollback here, managed_session handles it if exception bubbles up
                     # But consider finer-grained error handling if needed
-                time.sleep(random.uniform(1, 3))
 
         logger.info(f"Database storage complete. Added: {leads_added}, Updated: {leads_updated}, Failed: {leads_failed}")
         logger.info("LinkedIn Data Acquisition Workflow Finished.")
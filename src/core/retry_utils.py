@@ -3,6 +3,10 @@ import random
 import logging
 import requests # For specific exceptions
 import functools # Add this import
+import email.utils
+import math
+import threading
+from datetime import datetime, timezone
 
 # It's good practice for utils to have their own logger or use a common one
 logger = logging.getLogger(__name__)
@@ -10,13 +14,65 @@ logger = logging.getLogger(__name__)
 # Import custom exceptions if they are to be specifically caught and handled by retry
 from .exceptions import ApiLimitError, DataAcquisitionError, ApiAuthError # Keep ApiAuthError import for the check
 
+def parse_retry_after(value):
+    """
+    Parses a Retry-After header value (delay in seconds or an HTTP-date) into seconds to wait.
+    Returns None if the value is missing, unparseable or not finite (e.g. "inf" or "nan").
+    """
+    if value is None:
+        return None
+    try:
+        seconds = float(value)
+    except (TypeError, ValueError):
+        pass
+    else:
+        return max(0.0, seconds) if math.isfinite(seconds) else None
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+class RateLimiter:
+    """
+    Thread-safe token bucket: allows `rate` calls per second on average, with bursts of up to
+    `burst` calls. acquire() blocks just long enough to stay under the limit, so concurrent
+    callers are spaced out up front instead of tripping a 429 and backing off afterwards.
+    """
+
+    def __init__(self, rate, burst=None):
+        if rate <= 0:
+            raise ValueError(f"rate must be positive, got {rate}")
+        self.rate = float(rate)
+        self.capacity = float(burst) if burst is not None else max(1.0, self.rate)
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Takes one token, sleeping until it is available. Returns the seconds waited."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+            # Reserve the token even if it is not there yet (the balance may go negative), so
+            # waiting callers queue up behind each other rather than all waking at once
+            self._tokens -= 1.0
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
 def retry_with_backoff(retries=3, initial_delay=1, backoff_factor=2, jitter=True, 
                        retry_on_exceptions=(requests.exceptions.ConnectionError, 
                                             requests.exceptions.Timeout,
                                             ApiLimitError, # Only retry on these specific exceptions by default
                                             DataAcquisitionError # REMOVED ApiAuthError from this default tuple
                                             ),
-                       retry_on_status_codes=(429, 500, 502, 503, 504)):
+                       retry_on_status_codes=(429, 500, 502, 503, 504),
+                       max_delay=None):
     """
     A decorator to retry a function with exponential backoff and jitter.
 
@@ -24,9 +80,16 @@ def retry_with_backoff(retries=3, initial_delay=1, backoff_factor=2, jitter=True
     :param initial_delay: Initial delay in seconds.
     :param backoff_factor: Multiplier for the delay in each retry (e.g., 2 for doubling).
     :param jitter: If True, add a random small amount to the delay to prevent thundering herd.
+                   If "full", sleep a random amount between 0 and the backoff delay ("full jitter"),
+                   which spreads out clients that would otherwise retry in lockstep.
     :param retry_on_exceptions: A tuple of exception types that should trigger a retry.
     :param retry_on_status_codes: A tuple of HTTP status codes that should trigger a retry 
                                    (if the decorated function returns a response object with a status_code).
+    :param max_delay: Optional cap in seconds on the backoff delay of any single retry.
+
+    If the caught exception carries a `retry_after` (e.g. ApiLimitError built from a Retry-After header),
+    the wait is never shorter than what the server asked for. If that exceeds max_delay, retrying
+    sooner would be pointless, so the exception is re-raised at once instead of blocking the caller.
     """
     def decorator(func):
         @functools.wraps(func)
@@ -73,9 +136,19 @@ def retry_with_backoff(retries=3, initial_delay=1, backoff_factor=2, jitter=True
                 if current_retries < retries:
                     current_retries += 1
                     
-                    actual_delay = delay
-                    if jitter:
-                        actual_delay += random.uniform(0, delay * 0.1) # Add up to 10% jitter
+                    actual_delay = delay if max_delay is None else min(delay, max_delay)
+                    if jitter == "full":
+                        actual_delay = random.uniform(0, actual_delay)
+                    elif jitter:
+                        actual_delay += random.uniform(0, actual_delay * 0.1) # Add up to 10% jitter
+
+                    server_retry_after = getattr(last_exception, 'retry_after', None)
+                    if server_retry_after is not None:
+                        if max_delay is not None and server_retry_after > max_delay:
+                            logger.error(f"Function {func.__name__}: server asked to retry after {server_retry_after:.0f}s, "
+                                         f"more than max_delay={max_delay}s. Giving up.")
+                            raise last_exception
+                        actual_delay = max(server_retry_after, actual_delay)
                     
                     logger.info(f"Waiting {actual_delay:.2f} seconds before next retry for {func.__name__}.")
                     time.sleep(actual_delay)
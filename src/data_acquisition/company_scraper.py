@@ -1,48 +1,107 @@
+from __future__ import annotations
+
+import functools
 import logging
+import os
 import time
 import random
-import requests
+import threading
+from types import MappingProxyType
+from urllib.parse import urlparse
 import json
-import serpapi # Use the main package import
-from typing import Optional, Dict, Any
+from typing import TYPE_CHECKING, Optional, Dict, Any
+
+if TYPE_CHECKING:
+    from requests.adapters import HTTPAdapter
+
+# serpapi and requests are imported on first use, so importing this module stays cheap
 
-# Assuming config_manager.py is in src/config/
-# Adjust path if necessary, or ensure calling code handles PYTHONPATH
-import sys
-import os
-current_dir = os.path.dirname(os.path.abspath(__file__))
-sys.path.append(os.path.abspath(os.path.join(current_dir, '..')))
 try:
-    from config.config_manager import ConfigManager
+    import orjson # Optional fast JSON encoder for debug dumps
 except ImportError:
-    # Fallback for cases where the script is run in a different context or structure
-    # This might indicate a need to better manage PYTHONPATH in the execution environment
-    logging.error("Failed to import ConfigManager from config.config_manager. Attempting fallback.")
-    # Add parent of current_dir (src) to sys.path if not already there
-    src_path = os.path.abspath(os.path.join(current_dir, '..'))
-    if src_path not in sys.path:
-        sys.path.insert(0, src_path)
-    try:
-        from config.config_manager import ConfigManager # Try again relative to src
-    except ImportError:
-        logging.critical("Critical: ConfigManager could not be imported. CompanyScraper will not function.")
-        # Define a dummy ConfigManager to prevent outright crashing if tests or other modules import this
-        class ConfigManager:
-            def __init__(self, *args, **kwargs):
-                self.scraping_api_key = None
-                logging.warning("Using dummy ConfigManager for CompanyScraper due to import failure.")
-            def get_config(self, key, default=None):
-                if key == "SCRAPING_API_KEY":
-                    return self.scraping_api_key
-                return default
+    orjson = None
+
+from config.config_manager import ConfigManager
 
 logger = logging.getLogger(__name__)
 
 # Define a default cache expiry for company data
 DEFAULT_COMPANY_CACHE_EXPIRY_SECONDS = 3600 * 24 # 24 hours
+# How long a caller waits on another thread's in-flight fetch for the same URL
+INFLIGHT_WAIT_TIMEOUT_SECONDS = 30
+# Cache key prefix for name-keyed company bundles (URL-keyed entries share the same cache)
+BUNDLE_CACHE_PREFIX = "bundle::"
+
+@functools.lru_cache(maxsize=1)
+def _get_cache_expiry_seconds(config_manager: ConfigManager) -> int:
+    """Resolves COMPANY_CACHE_EXPIRY_SECONDS once per ConfigManager instead of on every scraper construction."""
+    try:
+        return int(config_manager.get_config("COMPANY_CACHE_EXPIRY_SECONDS", DEFAULT_COMPANY_CACHE_EXPIRY_SECONDS))
+    except (ValueError, TypeError):
+        logger.warning(f"Invalid COMPANY_CACHE_EXPIRY_SECONDS. Using default: {DEFAULT_COMPANY_CACHE_EXPIRY_SECONDS}s")
+        return DEFAULT_COMPANY_CACHE_EXPIRY_SECONDS
+
+# Constant Google search parameters for get_company_info (api_key is held by the client)
+COMPANY_INFO_PARAMS_TEMPLATE = MappingProxyType({"engine": "google", "gl": "us", "hl": "en"})
+
+# Transport-level retry policy for the SerpApi session
+SERPAPI_RETRY_TOTAL = 5
+SERPAPI_RETRY_BACKOFF_FACTOR = 0.5
+SERPAPI_RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+# Longest server Retry-After the transport will sleep through before giving up
+SERPAPI_MAX_RETRY_AFTER_SECONDS = 30
+
+def _build_retrying_adapter() -> HTTPAdapter:
+    """Builds a pooled HTTPAdapter that retries idempotent SerpApi GETs with exponential backoff."""
+    from requests.adapters import HTTPAdapter
+    from urllib3.exceptions import MaxRetryError, ResponseError
+    from urllib3.util.retry import Retry
+
+    class _BoundedRetry(Retry):
+        """Gives up instead of sleeping when the server asks for more than SERPAPI_MAX_RETRY_AFTER_SECONDS."""
+
+        def get_retry_after(self, response):
+            retry_after = super().get_retry_after(response)
+            if retry_after is not None and retry_after > SERPAPI_MAX_RETRY_AFTER_SECONDS:
+                raise MaxRetryError(
+                    None,
+                    response.geturl(),
+                    ResponseError(f"Retry-After of {retry_after}s exceeds {SERPAPI_MAX_RETRY_AFTER_SECONDS}s"),
+                )
+            return retry_after
+
+    retry = _BoundedRetry(
+        total=SERPAPI_RETRY_TOTAL,
+        backoff_factor=SERPAPI_RETRY_BACKOFF_FACTOR,
+        status_forcelist=SERPAPI_RETRY_STATUS_CODES,
+        allowed_methods=frozenset({"GET"}),
+        respect_retry_after_header=True,
+    )
+    return HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=retry)
+
+def _is_linkedin_company_url(link: str) -> bool:
+    """Checks the host and path of a link, so 'linkedin.com/company/' in a query string doesn't match."""
+    parsed = urlparse(link.lower())
+    host = parsed.hostname or ""
+    return (host == "linkedin.com" or host.endswith(".linkedin.com")) and parsed.path.startswith("/company/")
+
+# Process-wide scraper handed out by CompanyScraper.shared()
+_SHARED_SCRAPER: Optional["CompanyScraper"] = None
+_SHARED_SCRAPER_LOCK = threading.Lock()
+
+def _dump_results(results: Dict[str, Any]) -> str:
+    """Pretty-prints a SerpApi response for debug logging, preferring orjson when installed."""
+    # SerpResults is a UserDict, so fall back to dict() for anything the encoder doesn't know
+    if orjson is not None:
+        return orjson.dumps(results, default=dict, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(results, default=dict, indent=2)
 
 class CompanyScraper:
-    """Scrapes company information using external APIs like SerpApi."""
+    """
+    Scrapes company information using external APIs like SerpApi.
+    When scraping many companies, prefer CompanyScraper.shared(config) over constructing new
+    instances so the SerpApi connection pool and the company cache are reused across threads.
+    """
     
     def __init__(self, config_manager: ConfigManager):
         self.config = config_manager
@@ -50,19 +109,33 @@ class CompanyScraper:
         if not self.api_key:
              logger.warning("SCRAPING_API_KEY not found for CompanyScraper. Company info scraping will likely fail.")
         # Initialize the client once if using the Client pattern
-        self.client = serpapi.Client(api_key=self.api_key) if self.api_key else None
+        self.client = None
+        if self.api_key:
+            import serpapi # Deferred: only needed once a key is configured
+            self.client = serpapi.Client(api_key=self.api_key)
+            # Transient failures (429/5xx, honouring Retry-After) are retried inside urllib3
+            self.client.session.mount("https://", _build_retrying_adapter())
 
         # Initialize cache and expiry
         self.cache: Dict[str, Dict[str, Any]] = {}
-        self.cache_expiry_seconds = self.config.get_config(
-            "COMPANY_CACHE_EXPIRY_SECONDS",
-            DEFAULT_COMPANY_CACHE_EXPIRY_SECONDS
-        )
-        try:
-            self.cache_expiry_seconds = int(self.cache_expiry_seconds)
-        except (ValueError, TypeError):
-            logger.warning(f"Invalid COMPANY_CACHE_EXPIRY_SECONDS. Using default: {DEFAULT_COMPANY_CACHE_EXPIRY_SECONDS}s")
-            self.cache_expiry_seconds = DEFAULT_COMPANY_CACHE_EXPIRY_SECONDS
+        self.cache_expiry_seconds = _get_cache_expiry_seconds(self.config)
+
+        # Constant part of every _make_serpapi_request call, copied per request instead of rebuilt
+        self._search_params_template = MappingProxyType({"engine": "google", "api_key": self.api_key})
+
+        # In-flight request coalescing: URL -> Event set once the owning thread finishes its fetch
+        self._inflight: Dict[str, threading.Event] = {}
+        self._inflight_lock = threading.Lock()
+
+    @classmethod
+    def shared(cls, config_manager: ConfigManager) -> "CompanyScraper":
+        """Returns the process-wide CompanyScraper, creating it from config_manager on first use."""
+        global _SHARED_SCRAPER
+        if _SHARED_SCRAPER is None:
+            with _SHARED_SCRAPER_LOCK:
+                if _SHARED_SCRAPER is None:
+                    _SHARED_SCRAPER = cls(config_manager)
+        return _SHARED_SCRAPER
 
     def get_company_info(self, company_name: str):
         """Fetches company information using SerpApi Google Search."""
@@ -72,18 +145,14 @@ class CompanyScraper:
         
         logger.info(f"Searching for company info for: {company_name}")
         # Parameters for a Google search focused on the company
-        params = {
-            "engine": "google",
-            "q": f'{company_name} company profile overview linkedin', # Query aiming for official site/LinkedIn/knowledge graph
-            "gl": "us",
-            "hl": "en",
-            # api_key is handled by the client instance now
-        }
+        # Query aiming for official site/LinkedIn/knowledge graph; api_key is handled by the client instance
+        params = {**COMPANY_INFO_PARAMS_TEMPLATE, "q": f'{company_name} company profile overview linkedin'}
         
         try:
             # Use the client instance to perform the search
             results = self.client.search(params) 
-            logger.debug(f"SerpApi raw results for {company_name}: {json.dumps(results, indent=2)}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("SerpApi raw results for %s: %s", company_name, _dump_results(results))
             # TODO: Parse the results dictionary (knowledge graph, organic results) 
             # to extract relevant company details (website, description, industry, size, location)
             # This parsing logic needs to be implemented based on SerpApi's response structure.
@@ -135,11 +204,16 @@ class CompanyScraper:
         logger.info(f"Parsed company info: {company_info}")                
         return company_info if company_info.get('name') else None # Return None if essential info (like name) couldn't be parsed
 
-    def _is_cache_valid(self, cache_entry: Dict[str, Any]) -> bool:
-        """Checks if a cache entry is still valid based on its timestamp."""
+    def _is_cache_valid(self, cache_entry: Dict[str, Any], now: Optional[float] = None) -> bool:
+        """
+        Checks if a cache entry is still valid based on its timestamp.
+        Timestamps are time.monotonic() readings; callers that already hold one can pass it as `now`.
+        """
         if "timestamp" not in cache_entry or "data" not in cache_entry:
             return False
-        return (time.time() - cache_entry["timestamp"]) < self.cache_expiry_seconds
+        if now is None:
+            now = time.monotonic()
+        return (now - cache_entry["timestamp"]) < self.cache_expiry_seconds
 
     def clear_cache(self):
         """Clears the in-memory cache."""
@@ -152,15 +226,10 @@ class CompanyScraper:
             logger.error("SerpApi key not available. Cannot make request.")
             return None
         
-        params = {
-            "engine": "google",
-            "q": query,
-            "api_key": self.api_key,
-            "num": str(num_results), # Number of results to return
-        }
+        params = {**self._search_params_template, "q": query, "num": str(num_results)} # num = results to return
         try:
-            search = serpapi.Client(api_key=self.api_key)
-            results = search.search(params)
+            # Reuse the instance client so its HTTP session keeps connections alive between searches
+            results = self.client.search(params)
             
             if results.get("error"):
                 logger.error(f"SerpApi Error: {results.get('error')}")
@@ -174,50 +243,91 @@ class CompanyScraper:
             logger.exception(f"Exception during SerpApi request for query '{query}': {e}")
             return None
 
-    def find_company_linkedin_url(self, company_name: str) -> Optional[str]:
+    def get_company_bundle(self, company_name: str) -> Optional[Dict[str, Any]]:
         """
-        Tries to find the LinkedIn company page URL for a given company name.
-        Uses Google search with site:linkedin.com/company.
+        Resolves a company's LinkedIn page URL and profile details from a single SerpApi query.
+        Returns the same shape as extract_company_data_from_url (with 'linkedin_url' possibly None),
+        and seeds the URL cache so a follow-up extract_company_data_from_url call needs no request.
         """
-        query = f'{company_name} site:linkedin.com/company'
-        logger.info(f"Searching for LinkedIn company page for: {company_name} with query: '{query}'")
-        
-        results_data = self._make_serpapi_request(query, num_results=3)
-        
-        if not results_data or "organic_results" not in results_data:
-            logger.warning(f"No results from SerpApi for company LinkedIn URL search: {company_name}")
+        cache_key = f"{BUNDLE_CACHE_PREFIX}{company_name.lower()}"
+        if cache_key in self.cache and self._is_cache_valid(self.cache[cache_key]):
+            logger.info(f"Returning cached company bundle for {company_name}")
+            return self.cache[cache_key]["data"]
+
+        query = f'{company_name} site:linkedin.com/company OR company profile'
+        logger.info(f"Searching for company bundle for: {company_name} with query: '{query}'")
+
+        results_data = self._make_serpapi_request(query, num_results=5)
+        if not results_data:
+            logger.warning(f"No results from SerpApi for company bundle search: {company_name}")
             return None
 
-        for result in results_data["organic_results"]:
-            link = result.get("link", "").lower()
-            title = result.get("title", "").lower()
-            # Basic check to ensure it looks like a LinkedIn company page and matches the company name
-            if "linkedin.com/company/" in link and company_name.lower() in title:
-                logger.info(f"Found potential LinkedIn URL for {company_name}: {result.get('link')}")
-                return result.get("link") # Return the original link with case preserved
-        
-        logger.warning(f"Could not confidently identify LinkedIn company URL for: {company_name} from search results.")
-        return None
+        name_lc = company_name.lower()
+        # First result that really points at a LinkedIn company page and whose title matches the company name
+        linkedin_result = next(
+            (result for result in results_data.get("organic_results", ())
+             if _is_linkedin_company_url(result.get("link", "")) and name_lc in result.get("title", "").lower()),
+            None,
+        )
+
+        linkedin_url = linkedin_result.get("link") if linkedin_result else None # Original link with case preserved
+        if linkedin_url:
+            logger.info(f"Found potential LinkedIn URL for {company_name}: {linkedin_url}")
+        else:
+            logger.warning(f"Could not confidently identify LinkedIn company URL for: {company_name} from search results.")
+
+        bundle = self._parse_company_profile(results_data, linkedin_url, linkedin_result)
+
+        timestamp = time.monotonic()
+        self.cache[cache_key] = {"timestamp": timestamp, "data": bundle}
+        if linkedin_url:
+            self.cache[linkedin_url] = {"timestamp": timestamp, "data": bundle}
+        return bundle
+
+    def find_company_linkedin_url(self, company_name: str) -> Optional[str]:
+        """
+        Tries to find the LinkedIn company page URL for a given company name.
+        Thin wrapper over get_company_bundle, which also caches the company details.
+        """
+        bundle = self.get_company_bundle(company_name)
+        return bundle.get("linkedin_url") if bundle else None
 
     def extract_company_data_from_url(self, company_linkedin_url: str) -> Optional[Dict[str, Any]]:
         """Extracts data from a given LinkedIn company page URL using Google Search on that URL."""
         logger.info(f"Attempting to extract company data for LinkedIn URL: {company_linkedin_url}")
+        now = time.monotonic()
 
         # Check cache first
-        if company_linkedin_url in self.cache and self._is_cache_valid(self.cache[company_linkedin_url]):
+        if company_linkedin_url in self.cache and self._is_cache_valid(self.cache[company_linkedin_url], now):
             logger.info(f"Returning cached data for {company_linkedin_url}")
             return self.cache[company_linkedin_url]["data"]
-        
-        # Use the company_linkedin_url as the query for Google Search
-        # This might yield a knowledge graph or rich snippets with company info
-        results_data = self._make_serpapi_request(query=company_linkedin_url, num_results=1)
-        
-        if not results_data:
-            logger.warning(f"No SerpApi results for query: {company_linkedin_url}")
+
+        # Coalesce concurrent lookups: only one thread fetches a given URL, the others wait for its result
+        with self._inflight_lock:
+            pending = self._inflight.get(company_linkedin_url)
+            if pending is None:
+                self._inflight[company_linkedin_url] = threading.Event()
+
+        if pending is not None:
+            logger.debug(f"Waiting on in-flight request for {company_linkedin_url}")
+            pending.wait(timeout=INFLIGHT_WAIT_TIMEOUT_SECONDS)
+            cache_entry = self.cache.get(company_linkedin_url)
+            if cache_entry and self._is_cache_valid(cache_entry, now):
+                return cache_entry["data"]
+            logger.warning(f"In-flight request for {company_linkedin_url} produced no cached data.")
             return None
 
+        try:
+            return self._fetch_company_data(company_linkedin_url, now)
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(company_linkedin_url).set()
+
+    def _parse_company_profile(self, results_data: Dict[str, Any], linkedin_url: Optional[str],
+                               profile_result: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Builds the company details dict from a SerpApi response's knowledge graph and profile result."""
         extracted_info = {
-            "linkedin_url": company_linkedin_url,
+            "linkedin_url": linkedin_url,
             "name": None,
             "description": None,
             "industry": None,
@@ -229,7 +339,7 @@ class CompanyScraper:
         # Attempt to parse knowledge graph first, as it's often structured
         if "knowledge_graph" in results_data:
             kg = results_data["knowledge_graph"]
-            logger.debug(f"Knowledge graph found for {company_linkedin_url}: {kg}")
+            logger.debug(f"Knowledge graph found for {linkedin_url}: {kg}")
             extracted_info["name"] = kg.get("title")
             extracted_info["description"] = kg.get("description")
             
@@ -249,16 +359,14 @@ class CompanyScraper:
             #     extracted_info["location"] = attributes.get("Headquarters")
             #     extracted_info["size"] = attributes.get("Employees")
 
-        # If KG didn't provide enough, or no KG, check organic results snippets
-        # (especially the first one, which should be the LinkedIn page itself)
-        if not extracted_info["name"] and "organic_results" in results_data and results_data["organic_results"]:
-            first_result = results_data["organic_results"][0]
-            extracted_info["name"] = first_result.get("title") # Often includes company name
+        # If KG didn't provide enough, or no KG, fall back to the organic result for the LinkedIn page itself
+        if not extracted_info["name"] and profile_result:
+            extracted_info["name"] = profile_result.get("title") # Often includes company name
             if not extracted_info["description"]:
-                extracted_info["description"] = first_result.get("snippet")
-            # Website might also be in the displayed_link or link of the first result if it is the company site itself
-            if not extracted_info["website"] and "linkedin.com" not in first_result.get("link", ""):
-                 extracted_info["website"] = first_result.get("link")
+                extracted_info["description"] = profile_result.get("snippet")
+            # Website might also be in the displayed_link or link of the result if it is the company site itself
+            if not extracted_info["website"] and "linkedin.com" not in profile_result.get("link", ""):
+                 extracted_info["website"] = profile_result.get("link")
         
         # Basic normalization/cleaning (can be expanded)
         if extracted_info["name"] and " - LinkedIn" in extracted_info["name"]:
@@ -276,12 +384,27 @@ class CompanyScraper:
         #     if match:
         #         extracted_info["size"] = match.group(1)
 
+        return extracted_info
+
+    def _fetch_company_data(self, company_linkedin_url: str, now: float) -> Optional[Dict[str, Any]]:
+        """Queries SerpApi for a LinkedIn company URL and caches the parsed result, stamped with `now`."""
+        # Use the company_linkedin_url as the query for Google Search
+        # This might yield a knowledge graph or rich snippets with company info
+        results_data = self._make_serpapi_request(query=company_linkedin_url, num_results=1)
+        
+        if not results_data:
+            logger.warning(f"No SerpApi results for query: {company_linkedin_url}")
+            return None
+
+        first_result = (results_data.get("organic_results") or [None])[0]
+        extracted_info = self._parse_company_profile(results_data, company_linkedin_url, first_result)
+
         logger.info(f"Extracted company info for {company_linkedin_url}: {extracted_info}")
         
         # Store in cache
         if extracted_info: # Only cache if we got some data
             self.cache[company_linkedin_url] = {
-                "timestamp": time.time(),
+                "timestamp": now,
                 "data": extracted_info
             }
             logger.debug(f"Stored data in cache for {company_linkedin_url}")
@@ -1,53 +1,67 @@
+import functools
 import os
-import time
-import random
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
-from bs4 import BeautifulSoup
 import logging
 import requests
-from core.exceptions import ApiAuthError, ApiLimitError, DataAcquisitionError
+from requests.adapters import HTTPAdapter
 import datetime
+from datetime import timedelta
+import json
+import re
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+try:
+    import orjson # Optional: faster decoding of SerpApi response bodies
+except ImportError:
+    orjson = None
+
+try:
+    import ahocorasick # Optional: linear-time alma mater matching for large target_schools lists
+except ImportError:
+    ahocorasick = None
 
 logger = logging.getLogger(__name__)
 
-# --- Start of robust import for ConfigManager ---
+# Default headers sent with every SerpApi request from the scraper's session
+DEFAULT_SESSION_HEADERS = {
+    "User-Agent": "networking-assistant/LinkedInScraper",
+    "Connection": "keep-alive",
+}
+# How long cached SerpApi responses stay valid when ENABLE_HTTP_CACHE is on
+HTTP_CACHE_EXPIRY = timedelta(hours=24)
+# Largest SerpApi response body (after decompression) the scraper will read into memory
+MAX_RESPONSE_BYTES = 4 * 1024 * 1024
+# Upper bound on concurrent SerpApi searches issued by the batch scrape methods
+MAX_CONCURRENT_SEARCHES = 8
+# Most organic results Google/SerpApi return per search; larger max_results are fetched as several pages
+SERPAPI_MAX_PAGE_SIZE = 100
+# URL path fragment every LinkedIn profile link contains; also the site: filter of the search queries
+LINKEDIN_PROFILE_PATH = "linkedin.com/in/"
+# Keep-alive connections the session keeps per host; batch fan-out never exceeds it
+SESSION_POOL_MAXSIZE = 32
+
+# --- Start of robust imports from src/ ---
 try:
     # This is the primary import path when src is on pythonpath (e.g., during pytest)
+    from core.exceptions import ApiAuthError, ApiLimitError, DataAcquisitionError
     from config.config_manager import ConfigManager
+    from core.retry_utils import retry_with_backoff, parse_retry_after, RateLimiter
 except ImportError:
-    # Fallback logic for other execution contexts (e.g., running the script directly)
+    # Fallback for other execution contexts (e.g., running the script directly): put src/ on the path once
     import sys
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    # Go up one level from data_acquisition to reach src/
-    src_path = os.path.abspath(os.path.join(current_dir, '..')) 
-    if src_path not in sys.path:
-        sys.path.insert(0, src_path)
+    _SRC_PATH = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+    if _SRC_PATH not in sys.path:
+        sys.path.insert(0, _SRC_PATH)
     try:
-        # Retry the import now that src/ should be on the path
+        # Retry the imports now that src/ should be on the path
+        from core.exceptions import ApiAuthError, ApiLimitError, DataAcquisitionError
         from config.config_manager import ConfigManager
     except ImportError as e_inner:
         # If it still fails, log and re-raise a more informative error or a custom one
-        logging.error(f"Critical: Could not import ConfigManager from {src_path} or directly. Error: {e_inner}")
+        logging.error(f"Critical: Could not import ConfigManager from {_SRC_PATH} or directly. Error: {e_inner}")
         raise RuntimeError(f"LinkedInScraper requires ConfigManager, which could not be imported: {e_inner}")
-# --- End of robust import for ConfigManager ---
-
-# --- Start of robust import for retry_utils ---
-try:
-    from core.retry_utils import retry_with_backoff
-except ImportError:
-    import sys # Already imported but good for clarity in block
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    src_path = os.path.abspath(os.path.join(current_dir, '..')) # Path to src/
-    if src_path not in sys.path:
-        sys.path.insert(0, src_path)
     try:
-        from core.retry_utils import retry_with_backoff
+        from core.retry_utils import retry_with_backoff, parse_retry_after, RateLimiter
     except ImportError as e_retry:
         logging.warning(f"Could not import retry_with_backoff for LinkedInScraper: {e_retry}. Retries will not be available.")
         # Define a dummy decorator if retry_with_backoff is critical or used extensively
@@ -55,35 +69,143 @@ except ImportError:
             def decorator(func):
                 return func
             return decorator
+
+        def parse_retry_after(value): # Dummy parser, Retry-After is ignored without retry_utils
+            return None
+
+        RateLimiter = None # SerpApi calls go out unthrottled without retry_utils
+# --- End of robust imports from src/ ---
+
+# Precompiled tokenizers for _parse_linkedin_results
+_AT_SEPARATOR_RE = re.compile(r" at ", re.IGNORECASE) # "Role at Company"
+_LOCATION_RE = re.compile(r"Location:(.*?)(?: · |\n|$)") # "Location: X" up to the next separator or line
+# Plausible bare location: under 50 chars, no "connection(s)" and no " at " (use with fullmatch)
+_LOCATION_SANITY_RE = re.compile(r"(?!.*(?:connection| at )).{0,49}", re.IGNORECASE | re.DOTALL)
+
+def _split_role_company(text):
+    """
+    Splits "Role at Company" on the first case-insensitive ' at ' into stripped (role, company), or None.
+    Slices on the match span rather than str.lower().find(), whose indices can drift for
+    characters that change length when lowercased (e.g. 'İ').
+    """
+    at_match = _AT_SEPARATOR_RE.search(text)
+    if not at_match:
+        return None
+    return text[:at_match.start()].strip(), text[at_match.end():].strip()
+
+@functools.lru_cache(maxsize=4096)
+def _extract_name_role_company(title, snippet):
+    """
+    Heuristically extracts (lead_name, current_role, company_name) from a result's title and snippet.
+    Pure and memoized: the same profiles come back across pages and overlapping queries.
+    """
+    # Name is often the first part of the title before ' - ' (preferred) or ' | '
+    lead_name, separator, title_remainder = title.partition(' - ')
+    if not separator:
+        lead_name, _, title_remainder = title.partition(' | ')
+    lead_name = lead_name.strip()
+    title_remainder = title_remainder.strip()
+
+    # Role and Company might be in the title remainder or snippet
+    # This requires more sophisticated parsing, making educated guesses here
+    current_role = ""
+    company_name = ""
+
+    # Try finding role/company in title remainder
+    role_company = _split_role_company(title_remainder)
+    if role_company:
+        current_role, company_name = role_company
+    elif " - " in title_remainder: # Try splitting by the last " - " if " at " not found
+        current_role, _, company_name = title_remainder.rpartition(' - ')
+        current_role = current_role.strip()
+        company_name = company_name.strip()
+    elif snippet:
+        # If not in title or only a role in title, maybe the first sentence of the snippet?
+        # This is highly heuristic and likely needs refinement
+        role_company = _split_role_company(snippet.partition('.')[0])
+        if role_company:
+            current_role, company_name = role_company
+        else:
+            # Last resort: use the unparsable title remainder as the role, company stays empty
+            current_role = title_remainder
+    return lead_name, current_role, company_name
+
+def _rich_snippet_fields(result):
+    """
+    Reads (role, company, location) from SerpApi's structured rich_snippet block, "" for
+    anything it does not carry. Returns None when the result has no rich_snippet at all.
+    """
+    rich_snippet = result.get("rich_snippet")
+    if not rich_snippet:
+        return None
+    top = rich_snippet.get("top") or {}
+    extensions = top.get("extensions") or (rich_snippet.get("bottom") or {}).get("extensions") or ()
+
+    current_role = company_name = ""
+    for extension in extensions:
+        role_company = _split_role_company(extension) if isinstance(extension, str) else None
+        if role_company:
+            current_role, company_name = role_company
+            break
+    location_val = (top.get("detected_extensions") or {}).get("location") or ""
+    return current_role, company_name, location_val.strip() if isinstance(location_val, str) else ""
+
+@functools.lru_cache(maxsize=1)
+def _default_config():
+    """
+    Loads the ConfigManager used when LinkedInScraper gets none, from the .env in the project root.
+    Cached so repeated scraper construction doesn't re-read .env; call _default_config.cache_clear() to reload.
+    """
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    project_root_env = os.path.abspath(os.path.join(current_dir, '..', '..'))
+    env_path = os.path.join(project_root_env, '.env')
+    if not os.path.exists(env_path):
+        logger.warning(f".env file not found at {env_path} for LinkedInScraper, using defaults or expecting env vars.")
+    return ConfigManager(env_file_path=env_path)
+
+def _decode_json(content):
+    """Decodes a JSON response body (bytes), using orjson when available. Raises ValueError on bad JSON."""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+def _is_word_char(char):
+    """Mirrors the regex word-character class (\\w) for a single character."""
+    return char.isalnum() or char == "_"
+
 class LinkedInScraper:
     def __init__(self, config_manager: ConfigManager = None):
         """
         Initializes the LinkedInScraper with a ConfigManager.
         If no ConfigManager is provided, it attempts to create one.
         """
-        if config_manager is None:
-            # Assuming .env is in the project root, and this script is in src/data_acquisition
-            # The path to .env needs to be relative to where ConfigManager is called from,
-            # or an absolute path. For simplicity, ConfigManager defaults to '.env' in CWD.
-            # If running this file directly for testing, CWD might be src/data_acquisition.
-            # If run from project root (e.g. main.py), CWD is project root.
-            # For robustness, one might pass an explicit path or ensure CWD.
-            # For now, relying on ConfigManager's default or hoping it's run from root.
-            # A better approach for module-level ConfigManager instantiation:
-            # project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
-            # env_path = os.path.join(project_root, '.env')
-            # self.config = ConfigManager(env_file_path=env_path)
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            project_root_env = os.path.abspath(os.path.join(current_dir, '..', '..')) 
-            env_path = os.path.join(project_root_env, '.env')
-            if not os.path.exists(env_path):
-                logger.warning(f".env file not found at {env_path} for LinkedInScraper, using defaults or expecting env vars.")
-            self.config = ConfigManager(env_file_path=env_path)
-        else:
-            self.config = config_manager
+        # Without an explicit ConfigManager, share one loaded from the project-root .env
+        self.config = config_manager if config_manager is not None else _default_config()
             
         self.api_key = self.config.scraping_api_key
         self.base_url = "https://serpapi.com/search.json" # SerpApi endpoint
+
+        # One session per scraper so consecutive searches reuse keep-alive connections to serpapi.com.
+        # Retries stay with retry_with_backoff, so the adapter itself never retries.
+        self._session = self._create_session()
+        self._session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=SESSION_POOL_MAXSIZE, max_retries=0))
+        self._session.headers.update(DEFAULT_SESSION_HEADERS)
+
+        # Client-side cap on SerpApi requests per second, shared by all threads using this scraper
+        self._rate_limiter = self._create_rate_limiter()
+
+        # API key SerpApi rejected (401/403); requests fail fast until the key changes or reset_auth() is called
+        self._failed_api_key = None
+
+        # Pending SerpApi requests keyed by their params (minus api_key), so identical concurrent queries share one call
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
+
+        # Marks _scrape_many worker threads, which fetch later result pages sequentially to stay within the pool
+        self._batch_worker = threading.local()
+
+        # (target_schools tuple, matcher, [(case-folded, original) school]) built on first parse; rebuilt if target_schools changes
+        self._school_matching = None
         logger.info("LinkedInScraper initialized.")
 
         if not self.api_key:
@@ -91,20 +213,177 @@ class LinkedInScraper:
             # Consider raising an error if API key is absolutely essential for the class to function
             # raise ValueError("SCRAPING_API_KEY is required for LinkedInScraper")
 
-    @retry_with_backoff(retries=3, initial_delay=2, backoff_factor=2)
+    def _create_session(self):
+        """Returns a plain requests.Session, or a CachedSession when ENABLE_HTTP_CACHE is set."""
+        if getattr(self.config, 'enable_http_cache', False) is not True:
+            return requests.Session()
+        try:
+            # Imported here, not at module level: requests-cache is optional and slow to import
+            from requests_cache import CachedSession
+        except ImportError:
+            logger.warning("ENABLE_HTTP_CACHE is set but requests-cache is not installed; SerpApi responses won't be cached.")
+            return requests.Session()
+        cache_name = getattr(self.config, 'http_cache_path', None) or '.serpapi_cache'
+        logger.info(f"Caching SerpApi responses in '{cache_name}' for {HTTP_CACHE_EXPIRY}.")
+        # api_key is left out of the cache key so rotating keys doesn't invalidate cached searches
+        return CachedSession(cache_name=cache_name, backend="sqlite", expire_after=HTTP_CACHE_EXPIRY,
+                             allowable_methods=("GET",), match_headers=False, ignored_parameters=["api_key"])
+
+    def _create_rate_limiter(self):
+        """Returns a RateLimiter for config.serpapi_max_qps, or None when throttling is off (unset or <= 0)."""
+        max_qps = getattr(self.config, 'serpapi_max_qps', None)
+        if RateLimiter is None or not isinstance(max_qps, (int, float)) or max_qps <= 0:
+            return None
+        return RateLimiter(max_qps)
+
+    @staticmethod
+    def _build_school_pattern(schools_lc):
+        """Compiles one alternation regex over the case-folded school names (longest first), or None if empty."""
+        alternatives = sorted({re.escape(school) for school in schools_lc if school}, key=len, reverse=True)
+        if not alternatives:
+            return None
+        # Lookarounds rather than \b so names ending in punctuation (e.g. "St. John's U.") still match whole-word
+        return re.compile(r"(?<!\w)(?:" + "|".join(alternatives) + r")(?!\w)")
+
+    @staticmethod
+    def _build_school_automaton(schools_lc):
+        """Builds an Aho-Corasick automaton over the case-folded school names, or None if empty."""
+        automaton = ahocorasick.Automaton()
+        for school in set(schools_lc):
+            if school:
+                automaton.add_word(school, school)
+        if len(automaton) == 0:
+            return None
+        automaton.make_automaton()
+        return automaton
+
+    @classmethod
+    def _build_school_matcher(cls, schools_lc):
+        """
+        Returns a function mapping case-folded text to the set of whole-word school names it contains,
+        or None if there are no schools. Uses Aho-Corasick when pyahocorasick is installed, else one regex.
+        """
+        schools_lc = list(schools_lc)
+        if ahocorasick is not None:
+            automaton = cls._build_school_automaton(schools_lc)
+            if automaton is None:
+                return None
+
+            def match_automaton(text):
+                found = set()
+                for end, school in automaton.iter(text):
+                    start = end - len(school) + 1
+                    # Same whole-word rule as the regex lookarounds
+                    if start > 0 and _is_word_char(text[start - 1]):
+                        continue
+                    if end + 1 < len(text) and _is_word_char(text[end + 1]):
+                        continue
+                    found.add(school)
+                return found
+            return match_automaton
+
+        pattern = cls._build_school_pattern(schools_lc)
+        if pattern is None:
+            return None
+        return lambda text: set(pattern.findall(text))
+
+    def _match_target_schools(self, search_text):
+        """Returns the configured schools mentioned in the case-folded search_text, in config order."""
+        schools = tuple(self.config.target_schools)
+        school_matching = self._school_matching
+        if school_matching is None or school_matching[0] != schools:
+            # Swapped in as one tuple, so concurrent parses never pair a matcher with another school list;
+            # building twice under a race is harmless
+            school_matching = (
+                schools,
+                self._build_school_matcher(school.casefold() for school in schools),
+                [(school.casefold(), school) for school in schools],
+            )
+            self._school_matching = school_matching
+        _, school_matcher, target_schools = school_matching
+        if school_matcher is None:
+            return []
+        found = school_matcher(search_text)
+        return [school for school_lc, school in target_schools if school_lc in found]
+
+    def reset_auth(self):
+        """Clears a remembered authentication failure so the next request goes to SerpApi again."""
+        self._failed_api_key = None
+
+    def close(self):
+        """Closes the underlying HTTP session and its pooled connections, pruning expired cache entries."""
+        if hasattr(self._session, 'cache'):
+            self._session.cache.delete(expired=True)
+        self._session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
     def _make_api_request(self, params: dict, request_description: str):
+        """
+        Makes a SerpApi request (with retries) and returns the decoded JSON.
+        Concurrent calls with the same params, ignoring api_key, wait for the first caller's result instead
+        of issuing their own request; its exception, if any, is raised to all of them.
+        Once SerpApi has rejected the current api_key, raises ApiAuthError without a request.
+        """
+        if self._failed_api_key is not None and self._failed_api_key == self.api_key:
+            raise ApiAuthError(f"Authentication previously failed; not sending {request_description}", source="SerpApi")
+
+        key = tuple(sorted((k, v) for k, v in params.items() if k != "api_key"))
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            is_owner = future is None
+            if is_owner:
+                future = self._inflight[key] = Future()
+
+        if not is_owner:
+            logger.debug(f"Joining in-flight request for {request_description}")
+            return future.result()
+
+        try:
+            result = self._fetch_api_response(params, request_description)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+
+    # Short base with full jitter keeps transient-error waits small and de-synchronizes clients sharing a key;
+    # a 429's Retry-After still sets the minimum wait
+    @retry_with_backoff(retries=3, initial_delay=0.2, backoff_factor=2, jitter="full", max_delay=30)
+    def _fetch_api_response(self, params: dict, request_description: str):
         """Makes the actual HTTP GET request to SerpApi and handles basic response codes."""
         logger.debug(f"Making API request for {request_description} with params: {params}")
         response = None # Initialize response here to make it available in ValueError's except block
+        body = None
         try:
-            response = requests.get(self.base_url, params=params, timeout=20)
-            
-            # Let raise_for_status() handle all HTTP error codes first.
-            # The specific error handling (ApiAuthError, ApiLimitError)
-            # will be done in the `except requests.exceptions.HTTPError` block.
-            response.raise_for_status() 
+            # Wait for a slot under SERPAPI_MAX_QPS rather than bursting into 429s (retries count too)
+            if self._rate_limiter is not None:
+                self._rate_limiter.acquire()
+            # Stream so the body can be read with a size cap instead of buffered whole
+            response = self._session.get(self.base_url, params=params, timeout=20, stream=True)
+            try:
+                # Let raise_for_status() handle all HTTP error codes first.
+                # The specific error handling (ApiAuthError, ApiLimitError)
+                # will be done in the `except requests.exceptions.HTTPError` block.
+                response.raise_for_status() 
+
+                body = response.raw.read(MAX_RESPONSE_BYTES + 1, decode_content=True)
+            finally:
+                response.close()
+            if len(body) > MAX_RESPONSE_BYTES:
+                logger.error(f"Response for {request_description} exceeds {MAX_RESPONSE_BYTES} bytes; discarding it.")
+                raise DataAcquisitionError(f"Response too large for {request_description}", source="SerpApi")
 
-            return response.json()
+            return _decode_json(body)
 
         # NEW BLOCK: Catch ApiAuthError *first* to prevent decorator retry
         except ApiAuthError as auth_err:
@@ -115,6 +394,9 @@ class LinkedInScraper:
             logger.error(f"Authentication error caught directly for {request_description}: {auth_err}")
             raise auth_err # Re-raise immediately
 
+        except DataAcquisitionError:
+            raise # Already classified above (e.g. oversized response), don't wrap it again
+
         except requests.exceptions.HTTPError as http_err:
             # Ensure response is available for logging, even if error occurred before response.json()
             current_response = http_err.response if http_err.response is not None else response
@@ -123,13 +405,16 @@ class LinkedInScraper:
             if status_code == 401 or status_code == 403:
                 # This path should now handle the initial raising based on status code
                 logger.error(f"Authentication error for {request_description}. Status: {status_code}. Check API Key.")
+                self._failed_api_key = self.api_key
                 # Raise ApiAuthError - the block above will *not* catch this specific instance
                 # because we are already inside an except block. It will propagate upwards.
                 raise ApiAuthError(f"Authentication failed for {request_description}", source="SerpApi", original_exception=http_err)
             elif status_code == 429:
-                 # Directly raise ApiLimitError. The decorator will catch and retry this.
-                 logger.error(f"API rate limit error encountered for {request_description} (Status: {status_code}). Will attempt retry.")
-                 raise ApiLimitError(f"API rate limit error for {request_description}", source="SerpApi", original_exception=http_err)
+                 # Directly raise ApiLimitError. The decorator will catch and retry this, waiting at least Retry-After.
+                 retry_after = parse_retry_after(current_response.headers.get("Retry-After"))
+                 logger.error(f"API rate limit error encountered for {request_description} (Status: {status_code}, Retry-After: {retry_after}). Will attempt retry.")
+                 raise ApiLimitError(f"API rate limit error for {request_description}", source="SerpApi",
+                                     original_exception=http_err, retry_after=retry_after)
 
             # For any other HTTPError (400, 500, etc.) - No longer need to check 401/403 here
             logger.error(f"HTTPError during {request_description} (Status: {status_code}): {http_err}")
@@ -139,15 +424,15 @@ class LinkedInScraper:
             logger.error(f"RequestException (network/timeout) during {request_description}: {req_err}")
             raise DataAcquisitionError(f"Network or request error during {request_description}", source="SerpApi", original_exception=req_err)
         
-        except ValueError as json_decode_err: 
-            # Ensure response is available for logging if json decoding fails
-            response_text_snippet = response.text[:200] if response and hasattr(response, 'text') else 'N/A'
+        except ValueError as json_decode_err: # json.JSONDecodeError and orjson.JSONDecodeError both subclass ValueError
+            # Ensure response is available for logging if json decoding fails; only decode the bytes we show
+            response_text_snippet = body[:200].decode("utf-8", errors="replace") if body is not None else 'N/A'
             logger.error(f"Failed to decode JSON response for {request_description}: {json_decode_err}. Response text: {response_text_snippet}")
             raise DataAcquisitionError(f"Invalid JSON response for {request_description}", source="SerpApi", original_exception=json_decode_err)
 
         except Exception as e: 
             # This is a catch-all for truly unexpected errors.
-            logger.exception(f"Unexpected error in _make_api_request for {request_description}: {e}")
+            logger.exception(f"Unexpected error in _fetch_api_response for {request_description}: {e}")
             raise DataAcquisitionError(f"Unexpected error in API request for {request_description}", source="SerpApi", original_exception=e)
 
     def test_api_connection(self, test_query="Product Manager New York"):
@@ -183,18 +468,18 @@ class LinkedInScraper:
             # raise ConfigError(msg) # Or raise ConfigError for stricter handling
             return []
         
-        query = f'"{school_name}" site:linkedin.com/in/'
+        query = f'"{school_name}" site:{LINKEDIN_PROFILE_PATH}'
         params = {
             "engine": "google", "q": query, "api_key": self.api_key,
-            "num": str(max_results) if max_results <= 100 else "100",
+            "num": str(min(max_results, SERPAPI_MAX_PAGE_SIZE)),
             "gl": "us", "hl": "en"
         }
         request_desc = f"alumni search for '{school_name}'"
         logger.info(f"Preparing for {request_desc}")
         try:
-            data = self._make_api_request(params, request_desc)
+            data = self._fetch_result_pages(params, max_results, request_desc)
             logger.info(f"Successfully received and parsed response for {request_desc}")
-            return self._parse_linkedin_results(data, source=f"Alumni Search: {school_name}")
+            return self._parse_linkedin_results(data, source=f"Alumni Search: {school_name}")[:max_results]
         except DataAcquisitionError as dae:
             logger.error(f"Data acquisition failed for {request_desc} after retries: {dae}")
             return []
@@ -211,18 +496,18 @@ class LinkedInScraper:
 
         if keywords is None: keywords = self.config.pm_keywords
         keyword_string = ' OR '.join([f'"{k}"' for k in keywords])
-        query = f'({keyword_string}) "{location}" site:linkedin.com/in/'
+        query = f'({keyword_string}) "{location}" site:{LINKEDIN_PROFILE_PATH}'
         params = {
             "engine": "google", "q": query, "api_key": self.api_key,
-            "num": str(max_results) if max_results <= 100 else "100",
+            "num": str(min(max_results, SERPAPI_MAX_PAGE_SIZE)),
             "gl": "us", "hl": "en"
         }
         request_desc = f"PM search in '{location}'"
         logger.info(f"Preparing for {request_desc}")
         try:
-            data = self._make_api_request(params, request_desc)
+            data = self._fetch_result_pages(params, max_results, request_desc)
             logger.info(f"Successfully received and parsed response for {request_desc}")
-            return self._parse_linkedin_results(data, source=f"PM Search: {location}")
+            return self._parse_linkedin_results(data, source=f"PM Search: {location}")[:max_results]
         except DataAcquisitionError as dae:
             logger.error(f"Data acquisition failed for {request_desc} after retries: {dae}")
             return []
@@ -230,12 +515,79 @@ class LinkedInScraper:
             logger.exception(f"Unexpected error processing {request_desc}: {e}")
             return []
 
+    def _fetch_result_pages(self, params, max_results, request_desc):
+        """
+        Fetches up to max_results organic results for params, SERPAPI_MAX_PAGE_SIZE per SerpApi call.
+        The first page is fetched on its own (an empty first page ends the search); any further pages are
+        fetched concurrently, or one after another inside a _scrape_many worker, whose pool already fills
+        the session's connections. Returns the first page's response with every page's organic_results concatenated.
+        Errors on the first page propagate; a failed later page is logged and skipped.
+        """
+        first_page = self._make_api_request(params, request_desc)
+        page_starts = range(SERPAPI_MAX_PAGE_SIZE, max_results, SERPAPI_MAX_PAGE_SIZE)
+        if not page_starts or not first_page.get("organic_results"):
+            return first_page
+
+        def fetch_page(start):
+            page_desc = f"{request_desc} (results from {start})"
+            try:
+                return self._make_api_request({**params, "start": str(start)}, page_desc)
+            except DataAcquisitionError as dae:
+                logger.warning(f"Skipping page for {page_desc}: {dae}")
+                return {}
+
+        if getattr(self._batch_worker, "active", False):
+            pages = [fetch_page(start) for start in page_starts]
+        else:
+            workers = max(1, min(len(page_starts), MAX_CONCURRENT_SEARCHES))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="serpapi-page") as executor:
+                pages = list(executor.map(fetch_page, page_starts))
+
+        organic_results = list(first_page["organic_results"])
+        for page in pages:
+            organic_results.extend(page.get("organic_results", []))
+        return {**first_page, "organic_results": organic_results}
+
+    def _scrape_many(self, scrape_func, items, max_workers):
+        """Runs scrape_func over items on a bounded thread pool, returning {item: leads} in input order."""
+        items = list(items)
+        if not items:
+            return {}
+        # Beyond the pool size urllib3 would open (and then discard) extra connections, each with a fresh TLS handshake
+        workers = max(1, min(max_workers, len(items), SESSION_POOL_MAXSIZE))
+
+        def run(item):
+            self._batch_worker.active = True # Pool threads only ever run batch items
+            return scrape_func(item)
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="linkedin-scrape") as executor:
+            # scrape_func already turns API failures into an empty list, so map() won't raise for them
+            return dict(zip(items, executor.map(run, items)))
+
+    def scrape_many_schools(self, schools, max_results=100, max_workers=MAX_CONCURRENT_SEARCHES):
+        """
+        Runs scrape_alumni_by_school for several schools concurrently over the shared session.
+        Returns a dict mapping each school name to its list of leads.
+        """
+        return self._scrape_many(
+            lambda school: self.scrape_alumni_by_school(school, max_results=max_results), schools, max_workers
+        )
+
+    def scrape_many_locations(self, locations, keywords=None, max_results=100, max_workers=MAX_CONCURRENT_SEARCHES):
+        """
+        Runs scrape_pms_by_location for several locations concurrently over the shared session.
+        Returns a dict mapping each location to its list of leads.
+        """
+        return self._scrape_many(
+            lambda location: self.scrape_pms_by_location(location=location, keywords=keywords, max_results=max_results),
+            locations, max_workers
+        )
+
     def _parse_linkedin_results(self, data, source):
         """
         Parses the organic_results from SerpApi Google Search JSON 
         to extract potential LinkedIn lead information.
         """
-        leads = []
         organic_results = data.get("organic_results", []) 
         
         if not organic_results:
@@ -244,89 +596,57 @@ class LinkedInScraper:
                  logger.error(f"SerpApi search error in metadata: {data['search_metadata'].get('error')}")
              elif data.get("search_information", {}).get("organic_results_state") == "Fully empty":
                  logger.info(f"SerpApi reported fully empty results for source: {source}")
-             return leads
+             return []
+
+        # One timezone-aware timestamp for the whole batch, so leads from one search share it
+        now_iso = datetime.datetime.now(datetime.timezone.utc).isoformat()
+
+        # Hot loop: pre-size the output and bind repeatedly used callables to locals
+        leads = [None] * len(organic_results)
+        lead_count = 0
+        match_target_schools = self._match_target_schools
+        extract_name_role_company = _extract_name_role_company
+        rich_snippet_fields = _rich_snippet_fields
 
         for result in organic_results:
-            title = result.get("title", "")
-            link = result.get("link", "")
-            snippet = result.get("snippet", "")
-            
-            # Basic check if it looks like a LinkedIn profile result
-            if not link or "linkedin.com/in/" not in link:
+            get = result.get
+            link = get("link", "")
+            # Basic check if it looks like a LinkedIn profile result; skip before reading anything else
+            if not link or LINKEDIN_PROFILE_PATH not in link:
                 continue 
+            title = get("title", "")
+            snippet = get("snippet", "")
 
             # --- Attempt to extract structured data --- 
-            # Name is often the first part of the title before '-' or '|'
-            if ' - ' in title:
-                name_parts = title.split(' - ', 1)
-            elif ' | ' in title:
-                name_parts = title.split(' | ', 1)
-            else:
-                name_parts = [title] # Assume entire title is the name if no clear separator
-            
-            lead_name = name_parts[0].strip()
-            title_remainder = name_parts[1].strip() if len(name_parts) > 1 else ""
-
-            # Role and Company might be in the title remainder or snippet
-            # This requires more sophisticated parsing, making educated guesses here
-            current_role = ""
-            company_name = ""
-            location_val = ""
-            
-            # Try finding role/company in title remainder
-            if " at " in title_remainder.lower():
-                role_company_parts = title_remainder.split(' at ', 1)
-                current_role = role_company_parts[0].strip()
-                company_name = role_company_parts[1].strip()
-            elif " - " in title_remainder: # Try splitting by " - " if " at " not found
-                role_company_parts = title_remainder.rsplit(' - ', 1) # Split by the last hyphen
-                current_role = role_company_parts[0].strip()
-                if len(role_company_parts) > 1:
-                    company_name = role_company_parts[1].strip()
-                else: # Only a role was found in title_remainder
-                    company_name = ""
+            lead_name, current_role, company_name = extract_name_role_company(title, snippet)
+
+            # Prefer SerpApi's structured rich_snippet fields over the title/snippet heuristics
+            structured = rich_snippet_fields(result)
+            if structured:
+                rich_role, rich_company, location_val = structured
+                if rich_role:
+                    current_role, company_name = rich_role, rich_company
             else:
-                 # If not in title or only a role in title, maybe the first part of the snippet?
-                 if snippet:
-                     # Simplistic: assume first sentence or part before a common delimiter might contain role/company
-                     # This is highly heuristic and likely needs refinement
-                     first_sentence = snippet.split('.')[0]
-                     if " at " in first_sentence.lower():
-                         role_company_parts = first_sentence.split(' at ', 1)
-                         current_role = role_company_parts[0].strip()
-                         company_name = role_company_parts[1].strip()
-                     else:
-                         # Last resort: if title_remainder had something but wasn't parsable above, use it as role
-                         # and company will remain empty unless found in snippet
-                        if not current_role: # Only if not already set from title_remainder variants
-                            current_role = title_remainder or ""
+                location_val = ""
 
             # Location might be mentioned in the snippet
-            location_val = "" # EXPLICITLY Reset location for each result item
-            if snippet:
-                if "Location:" in snippet:
-                     loc_parts = snippet.split("Location:", 1)
-                     if len(loc_parts) > 1:
-                         # Take first part after "Location:", trim potential extra details
-                         location_val = loc_parts[1].split('\n')[0].split(' · ')[0].strip()
+            if snippet and not location_val:
+                location_match = _LOCATION_RE.search(snippet)
+                if location_match:
+                    # First part after "Location:", up to the next line or ' · ' separator
+                    location_val = location_match.group(1).strip()
                 # IMPORTANT: Use 'elif' to ensure only ONE block sets the location
                 elif ' · ' in snippet:
                     # Assume location is before the first '·' if "Location:" isn't present
-                    potential_loc = snippet.split(' · ', 1)[0].strip()
+                    potential_loc = snippet.partition(' · ')[0].strip()
                     # Basic sanity check: does it look like a location?
                     # Avoid things like "500+ connections" or "Software Engineer at..."
-                    if 'connection' not in potential_loc.lower() and \
-                       ' at ' not in potential_loc.lower() and \
-                       len(potential_loc) < 50: # Arbitrary length limit
+                    if _LOCATION_SANITY_RE.fullmatch(potential_loc):
                         location_val = potential_loc
                     # If the sanity check fails, location_val remains ""
 
             # Alma mater match - requires comparing snippet/title against config.target_schools
-            alma_mater_match = []
-            search_text = (title + " " + snippet).lower()
-            for school in self.config.target_schools:
-                if school.lower() in search_text:
-                    alma_mater_match.append(school)
+            alma_mater_match = match_target_schools((title + " " + snippet).casefold())
             
             # Basic data validation (ensure name and link are present)
             if not lead_name or not link:
@@ -340,12 +660,14 @@ class LinkedInScraper:
                 "location": location_val,
                 "alma_mater_match": alma_mater_match, # List of matched schools
                 "source_of_lead": source,
-                "date_added": datetime.datetime.now().isoformat(),
+                "date_added": now_iso,
                 "raw_snippet": snippet # Keep raw snippet for potential reprocessing
             }
-            leads.append(lead)
+            leads[lead_count] = lead
+            lead_count += 1
             
-        logger.info(f"Parsed {len(leads)} potential leads from source: {source}")
+        del leads[lead_count:] # Drop the slots of skipped results
+        logger.info(f"Parsed {lead_count} potential leads from source: {source}")
         return leads
 
 # Removed __main__ block, testing should be done via test_linkedin_scraper.py 
\ No newline at end of file
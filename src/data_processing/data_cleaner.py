@@ -1,29 +1,29 @@
+import functools
 import logging
 import re
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterable, List
 
 logger = logging.getLogger(__name__)
 
-# Common company suffixes to remove for normalization
-COMPANY_SUFFIXES = [
-    r',?\s+inc\.?,?$', 
-    r',?\s+llc\.?,?$', 
-    r',?\s+ltd\.?,?$', 
-    r',?\s+corp\.?,?$', 
-    r',?\s+corporation,?$', 
-    r',?\s+limited,?$',
-    r',?\s+incorporated,?$'
-]
-# Compile regex for efficiency
-COMPANY_SUFFIX_REGEX = re.compile(r'(?i)(\b(?:{}))'.format('|'.join(suffix.replace(r',?\s+', '').replace(r'\.?,?$', '') for suffix in COMPANY_SUFFIXES)), re.IGNORECASE)
-COMPANY_SUFFIX_REMOVE_REGEX = re.compile(r'|'.join(COMPANY_SUFFIXES), re.IGNORECASE)
+# Trailing legal suffix stripped by normalize_company_name
+TRAILING_COMPANY_SUFFIX_REGEX = re.compile(r'\b(?:Inc|LLC|Ltd|Corp|Corporation|Limited|Incorporated)\.?\,?\s*$', re.IGNORECASE)
 
+# The normalizers are pure and see the same values over and over (e.g. popular company names),
+# so their results are memoized
+NORMALIZE_CACHE_SIZE = 8192
+
+@functools.lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
 def normalize_whitespace(text: Optional[str]) -> Optional[str]:
     """Removes leading/trailing whitespace and collapses multiple spaces."""
     if text is None:
         return None
-    return ' '.join(text.split()).strip()
+    # Fast path: already-clean text is returned as-is instead of being rebuilt. ' ' is the only
+    # whitespace str.isprintable() accepts, so tabs, newlines, NBSP etc. still take the slow path
+    if text.isprintable() and '  ' not in text and text[:1] != ' ' and text[-1:] != ' ':
+        return text
+    return ' '.join(text.split())
 
+@functools.lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
 def normalize_company_name(name: Optional[str]) -> Optional[str]:
     """Attempts to normalize a company name by removing common suffixes and cleaning whitespace."""
     if not name:
@@ -36,8 +36,7 @@ def normalize_company_name(name: Optional[str]) -> Optional[str]:
 
     # 2. Remove common suffixes (ensure regex handles optional preceding space/comma)
     # Simpler regex: just target the words at the end, case-insensitive
-    suffix_pattern = r'\b(?:Inc|LLC|Ltd|Corp|Corporation|Limited|Incorporated)\.?\,?\s*$'
-    normalized = re.sub(suffix_pattern, '', normalized, flags=re.IGNORECASE).strip()
+    normalized = TRAILING_COMPANY_SUFFIX_REGEX.sub('', normalized).strip()
 
     # 3. Remove any remaining trailing punctuation (like , or .)
     # Handle cases where suffixes were part of the name, e.g. "Corp. of Engineers"
@@ -54,6 +53,7 @@ def normalize_company_name(name: Optional[str]) -> Optional[str]:
     # logger.debug(f"Normalized '{name}' -> '{normalized}'")
     return normalized
 
+@functools.lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
 def normalize_location(location: Optional[str]) -> Optional[str]:
     """
     Basic location normalization. Cleans whitespace.
@@ -76,56 +76,78 @@ def normalize_location(location: Optional[str]) -> Optional[str]:
     
     return normalized
 
+def _normalize_email(email: Optional[str]) -> str:
+    """Lowercases an email address and cleans its whitespace (missing -> '')."""
+    return normalize_whitespace((email or '').lower())
+
+# Schema tables driving the clean_* functions: (field, normalizer) pairs applied to every record
+LEAD_FIELD_NORMALIZERS = (
+    ('name', normalize_whitespace),
+    ('email', _normalize_email),
+    ('phone', normalize_whitespace),
+    ('source', normalize_whitespace),
+    ('notes', normalize_whitespace),
+)
+# (source field, derived field, normalizer) triples, applied only when the source field is present
+LEAD_DERIVED_FIELDS = (
+    ('company_name', 'normalized_company_name', normalize_company_name),
+    ('location', 'normalized_location', normalize_location),
+)
+COMPANY_FIELD_NORMALIZERS = (
+    ('name', normalize_company_name),
+    ('website', normalize_whitespace),
+    ('industry', normalize_whitespace),
+    ('size', normalize_whitespace),
+    ('location', normalize_location),
+    ('description', normalize_whitespace),
+)
+JOB_POSTING_FIELD_NORMALIZERS = (
+    ('job_title', normalize_whitespace),
+    # company_name might come from the API client (e.g., board_token) or be parsed
+    ('company_name', normalize_company_name),
+    ('job_location', normalize_location),
+    ('job_url', normalize_whitespace),
+    ('job_description_snippet', normalize_whitespace),
+    ('source_api', normalize_whitespace),
+    ('commitment', normalize_whitespace),
+)
+
+def _clean_records(records: Iterable[Dict[str, Any]], schema, derived=()) -> List[Dict[str, Any]]:
+    """Builds a cleaned copy of each record by walking the schema table once per record."""
+    return [
+        {
+            **record,
+            **{field: normalize(record.get(field)) for field, normalize in schema},
+            **{target: normalize(record.get(field)) for field, target, normalize in derived if field in record},
+        }
+        for record in records
+    ]
+
+def clean_leads_bulk(records: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Cleans and normalizes a batch of lead data dictionaries."""
+    return _clean_records(records, LEAD_FIELD_NORMALIZERS, LEAD_DERIVED_FIELDS)
+
+def clean_companies_bulk(records: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Cleans and normalizes a batch of company data dictionaries."""
+    return _clean_records(records, COMPANY_FIELD_NORMALIZERS)
+
+def clean_job_postings_bulk(records: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Cleans and normalizes a batch of job posting data dictionaries."""
+    return _clean_records(records, JOB_POSTING_FIELD_NORMALIZERS)
+
 def clean_lead_data(lead_data: Dict[str, Any]) -> Dict[str, Any]:
     """Cleans and normalizes fields within a lead data dictionary."""
-    cleaned = lead_data.copy()
-    
-    cleaned['name'] = normalize_whitespace(cleaned.get('name'))
-    cleaned['email'] = normalize_whitespace(cleaned.get('email', '').lower()) # Lowercase email
-    cleaned['phone'] = normalize_whitespace(cleaned.get('phone'))
-    cleaned['source'] = normalize_whitespace(cleaned.get('source'))
-    cleaned['notes'] = normalize_whitespace(cleaned.get('notes'))
-    # Potentially normalize status if it's free text before converting to enum
-    
-    # Assuming company info might be directly on the lead initially
-    if 'company_name' in cleaned:
-         cleaned['normalized_company_name'] = normalize_company_name(cleaned.get('company_name'))
-    if 'location' in cleaned:
-         cleaned['normalized_location'] = normalize_location(cleaned.get('location'))
-         
-    # Remove keys with None values? Optional based on downstream usage.
-    # cleaned = {k: v for k, v in cleaned.items() if v is not None}
-    
-    return cleaned
+    # Company/location info might be directly on the lead initially; normalized copies are
+    # added alongside the originals when present
+    return clean_leads_bulk((lead_data,))[0]
 
 def clean_company_data(company_data: Dict[str, Any]) -> Dict[str, Any]:
     """Cleans and normalizes fields within a company data dictionary."""
-    cleaned = company_data.copy()
-    
-    cleaned['name'] = normalize_company_name(cleaned.get('name'))
-    cleaned['website'] = normalize_whitespace(cleaned.get('website'))
-    cleaned['industry'] = normalize_whitespace(cleaned.get('industry'))
-    cleaned['size'] = normalize_whitespace(cleaned.get('size'))
-    cleaned['location'] = normalize_location(cleaned.get('location'))
-    cleaned['description'] = normalize_whitespace(cleaned.get('description'))
-    
-    return cleaned
+    return clean_companies_bulk((company_data,))[0]
 
 def clean_job_posting_data(job_data: Dict[str, Any]) -> Dict[str, Any]:
     """Cleans and normalizes fields within a job posting data dictionary."""
-    cleaned = job_data.copy()
-    
-    cleaned['job_title'] = normalize_whitespace(cleaned.get('job_title'))
-    # company_name might come from the API client (e.g., board_token) or be parsed
-    cleaned['company_name'] = normalize_company_name(cleaned.get('company_name'))
-    cleaned['job_location'] = normalize_location(cleaned.get('job_location'))
-    cleaned['job_url'] = normalize_whitespace(cleaned.get('job_url'))
-    cleaned['job_description_snippet'] = normalize_whitespace(cleaned.get('job_description_snippet'))
-    cleaned['source_api'] = normalize_whitespace(cleaned.get('source_api'))
-    # Normalize commitment/job_type if needed
-    cleaned['commitment'] = normalize_whitespace(cleaned.get('commitment')) 
-    
-    return cleaned
+    return clean_job_postings_bulk((job_data,))[0]
 
 # Example Usage
 if __name__ == '__main__':
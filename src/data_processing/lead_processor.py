@@ -1,158 +1,289 @@
+import functools
 import os
 import sys
 import logging
 import re
-from typing import List, Dict, Any, Optional
-
-# --- Robust Imports --- 
-try:
-    from core.exceptions import DataProcessingError
-except ImportError:
-    import sys
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    src_path = os.path.abspath(os.path.join(current_dir, '..'))
-    if src_path not in sys.path: sys.path.insert(0, src_path)
-    try:
-        from core.exceptions import DataProcessingError
-    except ImportError as e:
-        logging.error(f"Failed to import DataProcessingError for LeadProcessor: {e}")
-        DataProcessingError = Exception # Fallback
-
-try:
-    from config.config_manager import ConfigManager
-except ImportError:
-    # Path should be adjusted by the first block if needed
-    try:
-        from config.config_manager import ConfigManager
-    except ImportError as e:
-        logging.critical(f"CRITICAL: Failed to import ConfigManager for LeadProcessor: {e}")
-        raise RuntimeError(f"LeadProcessor cannot function without ConfigManager: {e}")
-
-try:
-    # Assuming data_cleaner is in the same data_processing directory
-    from .data_cleaner import clean_lead_data, clean_company_data, normalize_location, normalize_whitespace, normalize_company_name
-except ImportError:
-    # Fallback if running script directly and relative import fails
-    try:
-        from data_processing.data_cleaner import clean_lead_data, clean_company_data, normalize_location, normalize_whitespace, normalize_company_name
-    except ImportError as e:
-         logging.error(f"Failed to import data_cleaner functions: {e}")
-         # Define dummy functions if necessary
-         def clean_lead_data(data): return data
-         def clean_company_data(data): return data
-
-try:
-    from data_acquisition.company_scraper import CompanyScraper
-except ImportError:
-    # Path should be adjusted by the first block if needed
-    try:
-        from data_acquisition.company_scraper import CompanyScraper
-    except ImportError as e:
-        logging.error(f"Failed to import CompanyScraper for LeadProcessor: {e}")
-        # Define dummy if needed
-        class CompanyScraper:
-            def __init__(self, *args, **kwargs): pass
-            def find_company_linkedin_url(self, name): return None
-            def extract_company_data_from_url(self, url): return None
-# --- End Robust Imports ---
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
+from typing import TYPE_CHECKING, Iterable, List, Dict, Any, Optional
+
+if TYPE_CHECKING:
+    from database.db_manager import DatabaseManager
+
+# Run directly as a script, src/ is not on sys.path yet; imported as a module it already is
+if __name__ == '__main__':
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')))
+
+from core.exceptions import DataProcessingError
+from config.config_manager import ConfigManager
+from data_processing.data_cleaner import clean_lead_data, clean_company_data, normalize_location, normalize_whitespace, normalize_company_name
+from data_acquisition.company_scraper import CompanyScraper
 
 logger = logging.getLogger(__name__)
 if not logger.handlers:
     logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 
+# How long a persisted company name -> LinkedIn URL lookup is trusted (COMPANY_URL_CACHE_TTL_SECONDS);
+# company page URLs rarely change, so this is much longer than the in-memory scraper cache
+DEFAULT_COMPANY_URL_CACHE_TTL_SECONDS = 3600 * 24 * 30 # 30 days
+
+# How long persisted, cleaned company details are trusted (COMPANY_DETAILS_CACHE_TTL_SECONDS)
+DEFAULT_COMPANY_DETAILS_CACHE_TTL_SECONDS = 3600 * 24 * 7 # 7 days
+
+# Default number of leads enriched concurrently (ENRICH_WORKERS); stays under CompanyScraper's SerpApi pool size
+DEFAULT_ENRICH_WORKERS = 8
+
+def _compile_any_of(phrases):
+    """
+    Compiles one alternation regex that finds any of the given (already lowercased) phrases as a
+    substring, so a single scan replaces one `phrase in text` check per phrase.
+    Returns None for an empty list (nothing can match).
+    """
+    phrases = [phrase for phrase in phrases if phrase]
+    if not phrases:
+        return None
+    return re.compile("|".join(map(re.escape, phrases)))
+
+def _compile_raw_gate(phrases):
+    """
+    Compiles a case-insensitive alternation of the given phrases that tolerates any run of
+    whitespace between their words, so it matches raw (uncleaned) text wherever the phrase
+    would match the lowercased, whitespace-normalized text. Returns None for an empty list.
+    """
+    phrases = [phrase for phrase in phrases if phrase]
+    if not phrases:
+        return None
+    return re.compile("|".join(r"\s+".join(map(re.escape, phrase.split())) for phrase in phrases), re.IGNORECASE)
+
+def _contains_any(pattern, text):
+    """True if the _compile_any_of() pattern finds a phrase in text."""
+    return pattern is not None and pattern.search(text) is not None
+
+def _parse_target_locations(raw_locations: str) -> tuple:
+    """
+    Parses TARGET_LOCATIONS into lowercased "city, st" strings.
+    Entries are separated by ';' ("New York, NY; London, UK; Remote"). Without any ';' the legacy
+    format is assumed: comma-separated City, ST pairs ("New York, NY, San Francisco, CA"), where
+    an unpaired trailing part is kept as a location of its own.
+    """
+    if ';' in raw_locations:
+        entries = [entry.split(',') for entry in raw_locations.split(';')]
+    else:
+        parts = raw_locations.split(',')
+        entries = [parts[i:i + 2] for i in range(0, len(parts), 2)]
+
+    locations = []
+    for entry in entries:
+        location = ", ".join(normalize_whitespace(part.lower()) for part in entry if part.strip())
+        if location and location not in locations:
+            locations.append(location)
+    return tuple(locations)
+
+# Lowercased, normalized forms of titles/locations matched against the criteria. Filtering and
+# scoring both need them; repeated values hit the normalizers' own caches in data_cleaner.
+def _title_match_form(raw_title: Optional[str]) -> str:
+    return normalize_whitespace(raw_title.lower()) if raw_title else ""
+
+def _location_match_form(raw_location: Optional[str]) -> str:
+    return normalize_location(raw_location.lower()) if raw_location else ""
+
 class LeadProcessor:
     """Processes raw lead data: cleans, filters, and enriches it."""
 
-    def __init__(self, config_manager: ConfigManager, company_scraper: Optional[CompanyScraper] = None):
+    def __init__(self, config_manager: ConfigManager, company_scraper: Optional[CompanyScraper] = None,
+                 db_manager: Optional["DatabaseManager"] = None):
         """
         Initializes the LeadProcessor.
         Args:
             config_manager: Configuration manager instance.
             company_scraper: Optional CompanyScraper instance for enrichment.
                              Can be initialized here or passed in.
+            db_manager: Optional DatabaseManager used to persist company lookups across runs.
         """
         self.config_manager = config_manager
+        self.db_manager = db_manager
         # Initialize scrapers/clients needed for enrichment, or expect them to be passed
-        self.company_scraper = company_scraper if company_scraper else CompanyScraper(config_manager)
+        self.company_scraper = company_scraper if company_scraper else CompanyScraper.shared(config_manager)
         # self.lever_client = LeverClient(config_manager)
         # self.greenhouse_client = GreenhouseClient(config_manager)
         
         # Filtering criteria (can be loaded from config)
-        # Improved parsing for locations like "City, ST"
-        raw_locations = self.config_manager.get_config("TARGET_LOCATIONS", "New York, NY").split(',')
-        self.target_locations = []
-        # Process in pairs (City, ST), stripping whitespace and lowercasing
-        for i in range(0, len(raw_locations), 2):
-            if i + 1 < len(raw_locations):
-                 city = raw_locations[i].strip().lower()
-                 state = raw_locations[i+1].strip().lower()
-                 self.target_locations.append(f"{city}, {state}")
-            else:
-                 # Handle potential odd number of elements (e.g., trailing comma)
-                 last_part = raw_locations[i].strip().lower()
-                 if last_part: # Avoid adding empty strings
-                      logger.warning(f"Found trailing location part '{last_part}' in TARGET_LOCATIONS config. Ignoring.")
-                      # Or potentially add it if single-word locations are valid? 
-                      # self.target_locations.append(last_part)
+        self.target_locations = _parse_target_locations(self.config_manager.get_config("TARGET_LOCATIONS", "New York, NY"))
         
-        self.target_keywords = [kw.strip().lower() for kw in self.config_manager.get_config("TARGET_KEYWORDS", "Product Manager, Program Manager").split(',')]
-        self.seniority_keywords = [kw.strip().lower() for kw in self.config_manager.get_config("SENIORITY_KEYWORDS", "Senior, Lead, Principal, Head of, Director").split(',')]
-        self.mid_level_keywords = [kw.strip().lower() for kw in self.config_manager.get_config("MID_LEVEL_KEYWORDS", "Product Manager, Program Manager").split(',')]
+        # Frozen as tuples: the criteria are fixed for the processor's lifetime
+        self.target_keywords = tuple(kw.strip().lower() for kw in self.config_manager.get_config("TARGET_KEYWORDS", "Product Manager, Program Manager").split(','))
+        self.seniority_keywords = tuple(kw.strip().lower() for kw in self.config_manager.get_config("SENIORITY_KEYWORDS", "Senior, Lead, Principal, Head of, Director").split(','))
+        self.mid_level_keywords = tuple(kw.strip().lower() for kw in self.config_manager.get_config("MID_LEVEL_KEYWORDS", "Product Manager, Program Manager").split(','))
         # Add other criteria as needed
 
+        # Each criterion list compiled into one alternation, searched once per title/location
+        self._location_re = _compile_any_of(self.target_locations)
+        self._target_keyword_re = _compile_any_of(self.target_keywords)
+        self._seniority_re = _compile_any_of(self.seniority_keywords)
+        self._mid_level_re = _compile_any_of(self.mid_level_keywords)
+        # Cheap first gate on the raw title/location: a lead needs a target keyword and a target
+        # location to pass, and most scraped leads have neither, so they are rejected by one scan
+        # each without being normalized or classified
+        self._raw_title_gate = _compile_raw_gate(self.target_keywords)
+        self._raw_location_gate = _compile_raw_gate(self.target_locations)
+        # Title classification depends only on the normalized title, which repeats across leads
+        self._classify_title = functools.lru_cache(maxsize=4096)(self._classify_title_uncached)
+
+        try:
+            self.enrich_workers = max(1, int(self.config_manager.get_config("ENRICH_WORKERS", DEFAULT_ENRICH_WORKERS)))
+        except (TypeError, ValueError):
+            logger.warning(f"Invalid ENRICH_WORKERS config, defaulting to {DEFAULT_ENRICH_WORKERS}.")
+            self.enrich_workers = DEFAULT_ENRICH_WORKERS
+
+        self.company_url_cache_ttl = self._get_seconds_config("COMPANY_URL_CACHE_TTL_SECONDS", DEFAULT_COMPANY_URL_CACHE_TTL_SECONDS)
+        self.company_details_cache_ttl = self._get_seconds_config("COMPANY_DETAILS_CACHE_TTL_SECONDS", DEFAULT_COMPANY_DETAILS_CACHE_TTL_SECONDS)
+
+    def _get_seconds_config(self, key: str, default: float) -> float:
+        """Reads a duration in seconds from config, falling back to default if it is invalid."""
+        try:
+            return float(self.config_manager.get_config(key, default))
+        except (TypeError, ValueError):
+            logger.warning(f"Invalid {key} config, defaulting to {default}s.")
+            return default
+
     # --- Filtering Methods (from previous tasks) ---
+    def _classify_title_uncached(self, title: str):
+        """
+        Returns (keyword_match, is_senior, is_mid_level) for a normalized title, where
+        is_mid_level means a mid-level keyword matched and no seniority keyword did.
+        Use the memoized self._classify_title.
+        """
+        keyword_match = _contains_any(self._target_keyword_re, title) # Uses TARGET_KEYWORDS
+        is_senior = _contains_any(self._seniority_re, title)
+        is_mid_level = not is_senior and _contains_any(self._mid_level_re, title) # Uses MID_LEVEL_KEYWORDS
+        return keyword_match, is_senior, is_mid_level
+
     def _is_pm_in_target_location(self, lead_data: Dict[str, Any]) -> bool:
         # ... (implementation from Task 12, assuming it cleans location first) ...
         raw_location = lead_data.get("location")
         raw_title = lead_data.get("current_role")
         
-        # Add None checks before calling lower() or normalize functions
-        location = normalize_location(raw_location.lower()) if raw_location else ""
-        title = normalize_whitespace(raw_title.lower()) if raw_title else ""
+        location = _location_match_form(raw_location)
+        title = _title_match_form(raw_title)
         
-        logger.debug(f"_is_pm_in_target_location Check: Input Title='{raw_title}', Input Location='{raw_location}' -> Normalized Title='{title}', Normalized Location='{location}'")
-        logger.debug(f"_is_pm_in_target_location: self.target_locations = {self.target_locations}") # Log target_locations
+        # Runs once per lead: only build the debug messages when they will be emitted
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
+        if debug_enabled:
+            logger.debug(f"_is_pm_in_target_location Check: Input Title='{raw_title}', Input Location='{raw_location}' -> Normalized Title='{title}', Normalized Location='{location}'")
+            logger.debug(f"_is_pm_in_target_location: self.target_locations = {self.target_locations}") # Log target_locations
 
         if not location or not title:
             logger.debug("--> FAIL (is_pm): Empty normalized title or location.")
             return False
         
-        # location_match = any(target_loc in location for target_loc in self.target_locations)
-        # Log individual comparisons for location_match
-        location_match_found = False
-        for i, target_loc in enumerate(self.target_locations):
-            is_match = target_loc in location
-            logger.debug(f"_is_pm_in_target_location: Location check {i}: '{target_loc}' in '{location}' -> {is_match}")
-            if is_match:
-                location_match_found = True
-                break 
-        location_match = location_match_found
-        
-        keyword_match = any(target_kw in title for target_kw in self.target_keywords) # Uses TARGET_KEYWORDS
+        location_match = _contains_any(self._location_re, location)
         
-        is_senior = any(senior_kw in title for senior_kw in self.seniority_keywords)
-        is_mid_level = any(mid_kw in title for mid_kw in self.mid_level_keywords) and not is_senior # Uses MID_LEVEL_KEYWORDS
+        keyword_match, is_senior, is_mid_level = self._classify_title(title)
         seniority_match = is_mid_level # Filter needs this to be true
 
-        logger.debug(f"--> Checks: location_match={location_match}, keyword_match={keyword_match}, is_senior={is_senior}, is_mid_level={is_mid_level}, seniority_match={seniority_match}")
-        
         result = location_match and keyword_match and seniority_match
-        logger.debug(f"--> Final Result: {result}")
+        if debug_enabled:
+            logger.debug(f"--> Checks: location_match={location_match}, keyword_match={keyword_match}, is_senior={is_senior}, is_mid_level={is_mid_level}, seniority_match={seniority_match}")
+            logger.debug(f"--> Final Result: {result}")
         return result
 
-    def filter_leads(self, leads: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Filters a list of leads based on predefined criteria."""
+    def _passes_raw_gate(self, lead_data: Dict[str, Any]) -> bool:
+        """
+        Necessary (not sufficient) condition for _is_pm_in_target_location: the raw title holds a
+        target keyword and the raw location a target location, in any case or spacing.
+        """
+        raw_title = lead_data.get("current_role")
+        raw_location = lead_data.get("location")
+        return (
+            bool(raw_title) and bool(raw_location)
+            and _contains_any(self._raw_title_gate, raw_title)
+            and _contains_any(self._raw_location_gate, raw_location)
+        )
+
+    def filter_leads(self, leads: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Filters leads based on predefined criteria, returning the passing ones as a list.
+        Expects leads already passed through clean_lead_data (as process_and_filter_leads does);
+        matching normalizes title and location itself, so passing leads are returned as given.
+        `leads` may be any iterable, e.g. a generator that cleans leads lazily; it is consumed once.
+        """
+        total = 0
         filtered_leads = []
         for lead in leads:
-            # Apply cleaning before filtering?
-            cleaned = clean_lead_data(lead) # Clean first
-            if self._is_pm_in_target_location(cleaned): # Filter based on cleaned data
-                filtered_leads.append(cleaned) # Store the cleaned version if it passes
-        logger.info(f"Filtered {len(leads)} leads down to {len(filtered_leads)} based on criteria.")
+            total += 1
+            if self._passes_raw_gate(lead) and self._is_pm_in_target_location(lead):
+                filtered_leads.append(lead)
+        logger.info(f"Filtered {total} leads down to {len(filtered_leads)} based on criteria.")
         return filtered_leads
 
     # --- Enrichment Methods (Subtask 8.3) ---
     
+    def _find_company_url(self, normalized_company_name: str) -> Optional[str]:
+        """
+        Resolves a company's LinkedIn page URL, consulting the persistent cache (when a
+        db_manager is configured) before falling back to the scraper's web search.
+        Cache errors are logged and treated as misses; they never fail enrichment.
+        """
+        if self.db_manager is not None:
+            try:
+                cached_url = self.db_manager.get_cached_company_url(normalized_company_name, self.company_url_cache_ttl)
+            except Exception as e:
+                logger.warning(f"Company URL cache lookup failed for '{normalized_company_name}': {e}")
+                cached_url = None
+            if cached_url:
+                logger.debug(f"Using persisted LinkedIn URL for {normalized_company_name}: {cached_url}")
+                return cached_url
+
+        company_url = self.company_scraper.find_company_linkedin_url(normalized_company_name)
+        if company_url and self.db_manager is not None:
+            try:
+                self.db_manager.cache_company_url(normalized_company_name, company_url)
+            except Exception as e:
+                logger.warning(f"Failed to persist LinkedIn URL for '{normalized_company_name}': {e}")
+        return company_url
+
+    def _fetch_company_details(self, normalized_company_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Looks up one company's LinkedIn page and returns its cleaned details,
+        or None if the page or its data could not be found.
+        """
+        # Find company LinkedIn URL
+        company_url = self._find_company_url(normalized_company_name)
+        
+        company_details = None
+        if company_url:
+            # Details persisted by an earlier run are already cleaned
+            cached_details = self._get_cached_company_details(company_url)
+            if cached_details:
+                return cached_details
+            # Extract company data from URL (uses cache internally)
+            company_details = self.company_scraper.extract_company_data_from_url(company_url)
+        else:
+            logger.warning(f"Could not find LinkedIn URL for company: {normalized_company_name}")
+            # Optional: Try searching without site:linkedin.com as fallback?
+        
+        if not company_details:
+            logger.warning(f"Failed to fetch or extract company details for: {normalized_company_name}")
+            return None
+        # Clean the extracted company data
+        cleaned_details = clean_company_data(company_details)
+        if cleaned_details and self.db_manager is not None:
+            try:
+                self.db_manager.cache_company_details(company_url, cleaned_details)
+            except Exception as e:
+                logger.warning(f"Failed to persist company details for {company_url}: {e}")
+        return cleaned_details
+
+    def _get_cached_company_details(self, company_url: str) -> Optional[Dict[str, Any]]:
+        """Returns cleaned details persisted for company_url, or None (also when no db_manager is set or the lookup fails)."""
+        if self.db_manager is None:
+            return None
+        try:
+            return self.db_manager.get_cached_company_details(company_url, self.company_details_cache_ttl)
+        except Exception as e:
+            logger.warning(f"Company details cache lookup failed for {company_url}: {e}")
+            return None
+
     def enrich_lead_with_company_data(self, lead_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Enriches a single lead dictionary with company information.
@@ -168,39 +299,37 @@ class LeadProcessor:
             return enriched_lead # Return original if no company name
 
         logger.info(f"Attempting to enrich lead '{lead_data.get('name')}' with company data for '{normalized_company_name}'")
-        
-        # Find company LinkedIn URL
-        company_url = self.company_scraper.find_company_linkedin_url(normalized_company_name)
-        
-        company_details = None
-        if company_url:
-            # Extract company data from URL (uses cache internally)
-            company_details = self.company_scraper.extract_company_data_from_url(company_url)
-        else:
-            logger.warning(f"Could not find LinkedIn URL for company: {normalized_company_name}")
-            # Optional: Try searching without site:linkedin.com as fallback?
-        
-        if company_details:
-            # Clean the extracted company data
-            cleaned_company_details = clean_company_data(company_details)
-            enriched_lead["company_details"] = cleaned_company_details
+        # None indicates that enrichment was attempted but failed
+        enriched_lead["company_details"] = self._fetch_company_details(normalized_company_name)
+        if enriched_lead["company_details"]:
             logger.info(f"Successfully enriched lead '{lead_data.get('name')}' with company data.")
-        else:
-            logger.warning(f"Failed to fetch or extract company details for: {normalized_company_name}")
-            enriched_lead["company_details"] = None # Indicate that enrichment was attempted but failed
-            
         return enriched_lead
 
     def enrich_leads(self, leads: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Enriches a list of leads with company information."""
+        """
+        Enriches a list of leads with company information, preserving their order.
+        Each distinct company is looked up once, however many leads work there. Lookups
+        are network-bound, so they run concurrently on up to `enrich_workers` threads.
+        """
+        normalized_names = [normalize_company_name(lead.get("company_name")) for lead in leads]
+        unique_names = list(dict.fromkeys(name for name in normalized_names if name))
+
+        workers = min(self.enrich_workers, len(unique_names))
+        if workers <= 1:
+            details_by_name = {name: self._fetch_company_details(name) for name in unique_names}
+        else:
+            logger.info(f"Looking up {len(unique_names)} companies for {len(leads)} leads with {workers} workers...")
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="enrich") as executor:
+                details_by_name = dict(zip(unique_names, executor.map(self._fetch_company_details, unique_names)))
+
         enriched_leads = []
-        total = len(leads)
-        for i, lead in enumerate(leads):
-            logger.info(f"Enriching lead {i+1}/{total}...")
-            enriched_lead = self.enrich_lead_with_company_data(lead)
+        for lead, normalized_company_name in zip(leads, normalized_names):
+            enriched_lead = lead.copy()
+            if normalized_company_name:
+                enriched_lead["company_details"] = details_by_name[normalized_company_name]
             enriched_leads.append(enriched_lead)
-            # Optional: Add a small delay between enrichment calls if needed
-            # time.sleep(0.1) 
+        enriched_count = sum(1 for lead in enriched_leads if lead.get("company_details"))
+        logger.info(f"Enriched {enriched_count}/{len(leads)} leads with company data.")
         return enriched_leads
 
     # --- Scoring Methods (Subtask 8.4) ---
@@ -215,27 +344,25 @@ class LeadProcessor:
         raw_location = lead_data.get("location")
         company_details = lead_data.get("company_details")
 
-        # Ensure title and location are strings before proceeding
-        title = raw_title.lower() if raw_title else ""
-        location = raw_location.lower() if raw_location else ""
+        # Same normalized forms the filter matched on (memoized, so no re-normalization here)
+        title = _title_match_form(raw_title)
+        location = _location_match_form(raw_location)
 
         # Score based on role match (using keywords defined in init)
         # Check if title is not empty before iterating
-        if title and any(target_kw in title for target_kw in (self.target_keywords or [])):
-            score += 5 # Base points for core role match
-            # Check again if title is not empty for nested checks
-            if title and any(mid_kw in title for mid_kw in (self.mid_level_keywords or [])):
-                 # Check if it's NOT senior to qualify for mid-level points
-                 # Check title again here!
-                 is_senior = any(senior_kw in title for senior_kw in (self.seniority_keywords or [])) if title else False
-                 if not is_senior:
-                     score += 3 # Additional points for desired mid-level (non-senior) match
+        if title:
+            keyword_match, _, is_mid_level = self._classify_title(title)
+            if keyword_match:
+                score += 5 # Base points for core role match
+                # Mid-level points only for a mid-level title that is NOT senior
+                if is_mid_level:
+                    score += 3 # Additional points for desired mid-level (non-senior) match
             # elif title and any(senior_kw in title for senior_kw in self.seniority_keywords):
                  # score += 1 # Optional: Small points even for senior roles?
                  
         # Score based on location match
         # Check if location is not empty before iterating
-        if location and any(target_loc in location for target_loc in (self.target_locations or [])):
+        if location and _contains_any(self._location_re, location):
             score += 4
 
         # Score based on successful company enrichment
@@ -264,37 +391,36 @@ class LeadProcessor:
     
     def process_and_filter_leads(self, raw_leads: List[Dict[str, Any]], sort_by_score: bool = True) -> List[Dict[str, Any]]:
         """
-        Applies cleaning, enrichment, and filtering to a list of raw leads.
+        Applies cleaning, filtering, enrichment, and scoring to a list of raw leads.
         """
         logger.info(f"Starting processing for {len(raw_leads)} raw leads.")
         
         # 1. Clean raw lead data (applies basic normalization)
         # Note: clean_lead_data currently also normalizes company_name if present
-        cleaned_leads = [clean_lead_data(lead) for lead in raw_leads]
-        logger.info("Step 1/4: Cleaning complete.")
+        # Cleaned lazily: filter_leads pulls each lead through as it goes and keeps only the
+        # passing ones, so the full cleaned batch is never held in memory
+        cleaned_leads = (clean_lead_data(lead) for lead in raw_leads)
 
-        # 2. Enrich leads with company data
-        enriched_leads = self.enrich_leads(cleaned_leads)
-        logger.info("Step 2/4: Enrichment complete.")
-        
-        # 3. Filter based on criteria (uses cleaned/enriched data)
-        # Note: _is_pm_in_target_location uses fields like 'location' and 'current_role' 
-        # which should exist in the enriched_lead dictionaries.
-        final_leads = self.filter_leads(enriched_leads) # filter_leads applies its own cleaning check currently
-        logger.info("Step 3/4: Filtering complete.")
-
-        # 4. Score the filtered leads
-        scored_leads = []
-        for lead in final_leads:
-            # Create a copy to avoid mutating the original dict
-            lead_copy = lead.copy() 
-            lead_copy['score'] = self.score_lead(lead_copy) # Score the copy
-            scored_leads.append(lead_copy) # Append the scored copy
+        # 2. Filter based on criteria before enriching, so only qualifying leads cost company lookups
+        # Note: _is_pm_in_target_location only uses 'location' and 'current_role', which are
+        # present before enrichment.
+        filtered_leads = self.filter_leads(cleaned_leads)
+        logger.info("Steps 1-2/4: Cleaning and filtering complete.")
+
+        # 3. Enrich the remaining leads with company data
+        final_leads = self.enrich_leads(filtered_leads)
+        logger.info("Step 3/4: Enrichment complete.")
+
+        # 4. Score the filtered, enriched leads
+        # enrich_leads already returned fresh copies, so the score is set on them in place
+        scored_leads = final_leads
+        for lead in scored_leads:
+            lead['score'] = self.score_lead(lead)
         logger.info("Step 4/4: Scoring complete.")
 
         # 5. Optionally sort by score (descending)
         if sort_by_score:
-            scored_leads.sort(key=lambda x: x.get('score', 0), reverse=True)
+            scored_leads.sort(key=itemgetter('score'), reverse=True) # Every lead was scored in step 4
             logger.info("Sorted leads by score (descending).")
             
         logger.info(f"Finished processing. Final lead count: {len(scored_leads)}")
@@ -1,18 +1,22 @@
 import logging
-from sqlalchemy import create_engine, inspect
+from sqlalchemy import create_engine, event, insert, inspect
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import StaticPool
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.exc import SQLAlchemyError
 import sys
 import os
 import contextlib
-from typing import Optional
+import json
+import time
+from typing import Any, Dict, List, Optional
 
 # Adjust path to import sibling modules
 # current_dir = os.path.dirname(os.path.abspath(__file__))
 # sys.path.append(os.path.abspath(os.path.join(current_dir, '..')))
 
 # Ensure Base is imported from the local models.py
-from .models import Base
+from .models import Base, CompanyDetailsCache, CompanyUrlCache
 
 try:
     # Assuming config_manager.py is in src/config/
@@ -36,6 +40,50 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Connection pool sizing for server databases (PostgreSQL/MySQL); enrichment and the API use several threads
+DB_POOL_SIZE = 10
+DB_MAX_OVERFLOW = 20
+DB_POOL_RECYCLE_SECONDS = 1800
+# Rows per executemany batch in DatabaseManager.bulk_insert
+BULK_INSERT_CHUNK_SIZE = 500
+# PostgreSQL executemany paging: rows per multi-row INSERT ... VALUES, and statements per psycopg2 execute_batch page
+PG_INSERTMANYVALUES_PAGE_SIZE = 1000
+PG_EXECUTEMANY_BATCH_PAGE_SIZE = 500
+
+def _is_sqlite_memory(url) -> bool:
+    return url.database in (None, "", ":memory:")
+
+def _engine_options(db_url: str) -> dict:
+    """Returns the create_engine() keyword arguments (pooling, thread access) suited to the database URL."""
+    url = make_url(db_url)
+    if url.get_backend_name() != "sqlite":
+        # Check connections before use and recycle them before server-side idle timeouts drop them
+        options = {"pool_size": DB_POOL_SIZE, "max_overflow": DB_MAX_OVERFLOW,
+                   "pool_pre_ping": True, "pool_recycle": DB_POOL_RECYCLE_SECONDS}
+        if url.get_backend_name() == "postgresql":
+            # Batch executemany INSERTs into multi-row VALUES statements (SQLite uses insertmanyvalues defaults)
+            options["insertmanyvalues_page_size"] = PG_INSERTMANYVALUES_PAGE_SIZE
+            if url.get_driver_name() == "psycopg2":
+                # Also page executemany UPDATEs/DELETEs through psycopg2's execute_batch
+                options["executemany_mode"] = "values_plus_batch"
+                options["executemany_batch_page_size"] = PG_EXECUTEMANY_BATCH_PAGE_SIZE
+        return options
+    # Sessions may be used from worker threads, so don't pin SQLite connections to their creating thread
+    options = {"connect_args": {"check_same_thread": False}}
+    if _is_sqlite_memory(url):
+        # Every new connection to :memory: is a fresh empty database; share a single one
+        options["poolclass"] = StaticPool
+    return options
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """WAL lets readers proceed alongside the writer; NORMAL sync is durable enough under WAL and much faster."""
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+    finally:
+        cursor.close()
+
 class DatabaseManager:
     """Manages database connection, sessions, and schema initialization."""
     
@@ -56,12 +104,15 @@ class DatabaseManager:
         try:
             db_url = self.config.db_path
             logger.info(f"Connecting to database: {db_url}")
-            # Add connect_args for SQLite write access across threads if needed later
-            # connect_args={'check_same_thread': False} # Use with caution!
-            self.engine = create_engine(db_url) 
+            self.engine = create_engine(db_url, **_engine_options(db_url))
+            url = make_url(db_url)
+            if url.get_backend_name() == "sqlite" and not _is_sqlite_memory(url) and getattr(self.config, 'sqlite_wal', False):
+                event.listen(self.engine, "connect", _set_sqlite_pragmas)
             # Test connection (optional, but good practice)
             with self.engine.connect() as connection:
                 logger.info("Database engine created and connection successful.")
+            logger.info(f"Dialect {self.engine.dialect.name}+{self.engine.dialect.driver}: "
+                        f"multi-row executemany INSERT {'enabled' if self.engine.dialect.use_insertmanyvalues else 'unavailable'}.")
             self.Session = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
             logger.info("Database sessionmaker configured.")
         except SQLAlchemyError as e: # Catch specific SQLAlchemy errors first
@@ -86,12 +137,22 @@ class DatabaseManager:
             logger.info("Initializing database schema (creating tables if they don't exist)...")
             # This command creates tables based on all classes inheriting from Base
             Base.metadata.create_all(self.engine)
+            self._create_missing_indexes()
             logger.info("Database schema initialization complete.")
         except SQLAlchemyError as e:
             logger.exception(f"Failed to initialize database schema: {e}")
         except Exception as e:
             logger.exception(f"An unexpected error occurred during schema initialization: {e}")
 
+    def _create_missing_indexes(self):
+        """
+        Creates indexes declared on the models but missing from the database. create_all skips
+        tables that already exist, so indexes added to a model later would otherwise never be built.
+        """
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(self.engine, checkfirst=True)
+
     def get_session(self) -> Optional[Session]:
         """Provides a database session."""
         if not self.Session:
@@ -120,6 +181,50 @@ class DatabaseManager:
         finally:
             session.close()
 
+    def bulk_insert(self, model, rows: List[Dict[str, Any]], chunk_size: int = BULK_INSERT_CHUNK_SIZE) -> int:
+        """
+        Inserts many rows (dicts of column values) into a model's table in one transaction.
+        Rows go out as batched executemany INSERTs of `chunk_size` rows instead of one
+        ORM add/flush round trip per object. Column defaults still apply; no ORM objects
+        (or generated ids) are returned. Returns the number of rows inserted.
+        Raises ValueError if chunk_size is less than 1.
+        """
+        if chunk_size < 1:
+            raise ValueError(f"chunk_size must be at least 1, got {chunk_size}")
+        if not rows:
+            return 0
+        with self.managed_session() as session:
+            for start in range(0, len(rows), chunk_size):
+                session.execute(insert(model), rows[start:start + chunk_size])
+        logger.info(f"Bulk inserted {len(rows)} {model.__name__} rows.")
+        return len(rows)
+
+    def get_cached_company_url(self, normalized_name: str, max_age_seconds: float) -> Optional[str]:
+        """Returns the LinkedIn URL persisted for a normalized company name, unless older than max_age_seconds."""
+        with self.managed_session() as session:
+            entry = session.get(CompanyUrlCache, normalized_name)
+            if entry and time.time() - entry.fetched_at < max_age_seconds:
+                return entry.linkedin_url
+        return None
+
+    def cache_company_url(self, normalized_name: str, linkedin_url: str) -> None:
+        """Persists (or refreshes) the LinkedIn URL found for a normalized company name."""
+        with self.managed_session() as session:
+            session.merge(CompanyUrlCache(normalized_name=normalized_name, linkedin_url=linkedin_url, fetched_at=time.time()))
+
+    def get_cached_company_details(self, url: str, max_age_seconds: float) -> Optional[Dict[str, Any]]:
+        """Returns the cleaned company details persisted for a LinkedIn URL, unless older than max_age_seconds."""
+        with self.managed_session() as session:
+            entry = session.get(CompanyDetailsCache, url)
+            if entry and time.time() - entry.fetched_at < max_age_seconds:
+                return json.loads(entry.cleaned_json)
+        return None
+
+    def cache_company_details(self, url: str, cleaned_details: Dict[str, Any]) -> None:
+        """Persists (or refreshes) the cleaned company details for a LinkedIn URL."""
+        with self.managed_session() as session:
+            session.merge(CompanyDetailsCache(url=url, cleaned_json=json.dumps(cleaned_details, default=str), fetched_at=time.time()))
+
 # Example usage (for direct testing of this file)
 if __name__ == '__main__':
     # Basic logging for testing
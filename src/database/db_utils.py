@@ -1,8 +1,14 @@
+import functools
+import itertools
 import logging
-from sqlalchemy.orm import Session
+from contextlib import contextmanager
+from sqlalchemy.orm import Session, contains_eager, load_only, raiseload, selectinload
+from sqlalchemy.engine import RowMapping
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError
-from typing import Type, TypeVar, List, Dict, Any, Optional
-from sqlalchemy import asc, desc # Import asc and desc for sorting
+from typing import Type, TypeVar, List, Dict, Any, Iterable, Iterator, Optional, Union
+from sqlalchemy import asc, delete, desc, exists, insert, select # Import asc and desc for sorting
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.dialects import postgresql, sqlite
 
 # Assuming models.py is in the same directory (src/database/)
 from src.database.models import Base, Lead, Company, JobPosting, job_applications
@@ -12,13 +18,78 @@ logger = logging.getLogger(__name__)
 
 ModelType = TypeVar('ModelType', bound=Base)
 
-def create_entity(db: Session, model: Type[ModelType], data: Dict[str, Any]) -> Optional[ModelType]:
-    """Generic function to create a new entity."""
+# Rows sent per executemany INSERT by bulk_create_entities
+BULK_CREATE_PAGE_SIZE = 1000
+# Rows buffered per fetch by get_entities_iter
+ENTITY_ITER_CHUNK_SIZE = 1000
+
+@contextmanager
+def _transaction(db: Session):
+    """
+    Commits the enclosed work once, or rolls it all back on error. Uses `with db.begin():` on an
+    idle session; a session that already autobegan a transaction is committed/rolled back directly.
+    """
+    if not db.in_transaction():
+        with db.begin():
+            yield
+        return
     try:
-        entity = model(**data)
-        db.add(entity)
+        yield
         db.commit()
-        db.refresh(entity)
+    except Exception:
+        db.rollback()
+        raise
+
+def _create_entity_core(db: Session, model: Type[ModelType], data: Dict[str, Any]) -> ModelType:
+    """Builds an entity from data and adds it to the session, without flushing or committing."""
+    entity = model(**data)
+    db.add(entity)
+    return entity
+
+def _update_entity_core(entity: ModelType, data: Dict[str, Any]) -> bool:
+    """Assigns the attributes in data that differ on entity, without committing. Returns whether any changed."""
+    changed = False
+    for key, value in data.items():
+        if hasattr(entity, key):
+            if getattr(entity, key) != value:
+                setattr(entity, key, value)
+                changed = True
+        else:
+            logger.warning(f"Attempted to update non-existent attribute '{key}' on {type(entity).__name__}")
+    return changed
+
+def create_entity_nc(db: Session, model: Type[ModelType], data: Dict[str, Any]) -> ModelType:
+    """
+    Like create_entity, but does not commit: the entity is only added to the session. For loops
+    (seeding, imports) wrap all the calls in one `with db.begin():` block, so the batch is
+    committed once (one fsync instead of one per row) and rolled back as a whole on error.
+    """
+    return _create_entity_core(db, model, data)
+
+def update_entity_nc(db: Session, model: Type[ModelType], entity_id: int, data: Dict[str, Any]) -> Optional[ModelType]:
+    """
+    Like update_entity, but does not commit; wrap loops in one `with db.begin():` block as with
+    create_entity_nc. Returns None if the entity does not exist.
+    """
+    entity = db.get(model, entity_id)
+    if entity is None:
+        logger.warning(f"{model.__name__} with ID {entity_id} not found for update.")
+        return None
+    _update_entity_core(entity, data)
+    return entity
+
+def create_entity(db: Session, model: Type[ModelType], data: Dict[str, Any], refresh: bool = False) -> Optional[ModelType]:
+    """
+    Generic function to create a new entity.
+    The commit expires the entity, so its columns are reloaded (one SELECT) on first attribute
+    access; callers that never touch the result skip that SELECT entirely. Pass refresh=True to
+    reload eagerly, e.g. before the session is closed or the entity is handed to another thread.
+    """
+    try:
+        entity = _create_entity_core(db, model, data)
+        db.commit()
+        if refresh:
+            db.refresh(entity)
         # logger.info(f"Successfully created {model.__name__} with ID {entity.id}")
         return entity
     except IntegrityError as e:
@@ -39,10 +110,70 @@ def create_entity(db: Session, model: Type[ModelType], data: Dict[str, Any]) ->
         raise DataProcessingError(f"Unexpected error creating {model.__name__}: {e}") from e 
     # return None # Removed, as exceptions are raised
 
+def bulk_create_entities(db: Session, model: Type[ModelType], rows: Iterable[Dict[str, Any]],
+                         page_size: int = BULK_CREATE_PAGE_SIZE) -> int:
+    """
+    Inserts many entities (dicts of column values) in a single transaction.
+    Rows are sent as Core executemany INSERTs of up to `page_size` rows each and committed once,
+    instead of one add/commit/refresh round trip per row as with create_entity. Column defaults
+    apply, but no ORM instances are returned. Returns the number of rows inserted.
+    """
+    rows_iter = iter(rows)
+    inserted = 0
+    try:
+        while True:
+            page = list(itertools.islice(rows_iter, page_size))
+            if not page:
+                break
+            db.execute(insert(model), page)
+            inserted += len(page)
+        if inserted:
+            db.commit()
+        logger.debug(f"Bulk inserted {inserted} {model.__name__} rows.")
+        return inserted
+    except IntegrityError as e:
+        db.rollback()
+        logger.error(f"Database integrity error bulk creating {model.__name__}: {e}")
+        raise DataProcessingError(f"Database integrity error bulk creating {model.__name__}: {e}") from e
+    except SQLAlchemyError as e:
+        db.rollback()
+        logger.error(f"Database error bulk creating {model.__name__}: {e}")
+        raise DataProcessingError(f"Database error bulk creating {model.__name__}: {e}") from e
+
+def bulk_upsert(db: Session, model: Type[ModelType], rows: Iterable[Dict[str, Any]]) -> List[ModelType]:
+    """
+    Creates or updates many entities in a single transaction with one commit.
+    Rows carrying the `id` of an existing entity update it (existing IDs are fetched in one IN
+    query); all other rows create new entities, added with session.add_all. On any error the
+    whole batch is rolled back. Returns the entities in row order.
+    """
+    rows = list(rows)
+    try:
+        with _transaction(db):
+            existing = get_entities_by_ids(db, model, (row['id'] for row in rows if row.get('id') is not None))
+            entities, new_entities = [], []
+            for row in rows:
+                entity = existing.get(row.get('id'))
+                if entity is not None:
+                    _update_entity_core(entity, row)
+                else:
+                    entity = model(**row)
+                    new_entities.append(entity)
+                entities.append(entity)
+            db.add_all(new_entities)
+        logger.debug(f"Upserted {len(entities)} {model.__name__} rows ({len(new_entities)} new).")
+        return entities
+    except IntegrityError as e:
+        logger.error(f"Database integrity error upserting {model.__name__}: {e}")
+        raise DataProcessingError(f"Database integrity error upserting {model.__name__}: {e}") from e
+    except SQLAlchemyError as e:
+        logger.error(f"Database error upserting {model.__name__}: {e}")
+        raise DataProcessingError(f"Database error upserting {model.__name__}: {e}") from e
+
 def get_entity(db: Session, model: Type[ModelType], entity_id: int) -> Optional[ModelType]:
     """Generic function to get an entity by its ID."""
     try:
-        entity = db.query(model).filter(model.id == entity_id).first()
+        entity = db.execute(select(model).where(model.id == entity_id)).scalar_one_or_none()
         if entity:
             logger.debug(f"Retrieved {model.__name__} with ID {entity_id}")
         else:
@@ -54,40 +185,118 @@ def get_entity(db: Session, model: Type[ModelType], entity_id: int) -> Optional[
         logger.error(f"Unexpected error retrieving {model.__name__} ID {entity_id}: {e}")
     return None
 
+def get_entities_by_ids(db: Session, model: Type[ModelType], ids: Iterable[int]) -> Dict[int, ModelType]:
+    """
+    Fetches the entities with the given IDs in one `WHERE id IN (...)` query, instead of one
+    get_entity call per ID. Returns {id: entity}; IDs that do not exist are simply absent.
+    """
+    ids = set(ids)
+    if not ids:
+        return {}
+    try:
+        entities = db.execute(select(model).where(model.id.in_(ids))).scalars()
+        return {entity.id: entity for entity in entities}
+    except SQLAlchemyError as e:
+        logger.error(f"SQLAlchemy error retrieving {model.__name__} IDs {sorted(ids)}: {e}")
+    return {}
+
+def _existing_ids(db: Session, model: Type[ModelType], ids: Iterable[int]) -> set:
+    """Returns the subset of ids that exist for model, selecting only the id column in one IN query."""
+    ids = set(ids)
+    if not ids:
+        return set()
+    return set(db.execute(select(model.id).where(model.id.in_(ids))).scalars())
+
+@functools.lru_cache(maxsize=None)
+def _sortable_columns(model: Type[ModelType]) -> Dict[str, Any]:
+    """A model's column attributes by name: the only names get_entities will sort on."""
+    return {attr.key: getattr(model, attr.key) for attr in sa_inspect(model).column_attrs}
+
+def _selected_columns(model: Type[ModelType], names: Iterable[str]) -> List[Any]:
+    """The model's primary key column followed by its columns named in names; unknown names are logged and skipped."""
+    column_map = _sortable_columns(model)
+    selected = [model.id]
+    for name in names:
+        column = column_map.get(name)
+        if column is None:
+            logger.warning(f"Ignoring unknown column '{name}' for model {model.__name__}")
+        elif name != 'id':
+            selected.append(column)
+    return selected
+
+def _apply_filters(stmt, model: Type[ModelType], filters: Optional[Dict[str, Any]]):
+    """Adds a WHERE clause per filter: `key == value`, or `key ILIKE value` for `key__ilike`. None values are skipped."""
+    if not filters:
+        return stmt
+    for key, value in filters.items():
+        if value is None: continue # Skip None values in filters
+        
+        # Handle special filter types (like ilike)
+        if key.endswith('__ilike'):
+            actual_key = key[:-7]
+            if hasattr(model, actual_key):
+                stmt = stmt.where(getattr(model, actual_key).ilike(value))
+        elif hasattr(model, key):
+            stmt = stmt.where(getattr(model, key) == value)
+        else:
+            logger.warning(f"Attempted to filter on non-existent attribute '{key}' for model {model.__name__}")
+            # Optionally raise an error or just ignore
+    return stmt
+
 def get_entities(db: Session, model: Type[ModelType], 
                    skip: int = 0, limit: int = 100, 
                    filters: Optional[Dict[str, Any]] = None,
-                   order_by_column: Optional[Any] = None, # Accept SQLAlchemy column object
-                   sort_direction: str = 'asc') -> List[ModelType]:
-    """Generic function to retrieve a list of entities with filtering, sorting, and pagination."""
+                   order_by_column: Optional[Any] = None, # Column name, or SQLAlchemy column object
+                   sort_direction: str = 'asc',
+                   strict: bool = False,
+                   as_dict: bool = False,
+                   columns: Optional[List[str]] = None) -> Union[List[ModelType], List[RowMapping]]:
+    """
+    Generic function to retrieve a list of entities with filtering, sorting, and pagination.
+    order_by_column may be a column name (e.g. straight from a `sort_by` query parameter); names
+    that are not columns of the model, such as relationships, are ignored with a warning.
+    With strict=True every relationship is set to raiseload, so touching e.g. lead.company on a
+    returned entity raises instead of silently issuing one lazy SELECT per row (an N+1). Use it
+    for list endpoints and load what they need explicitly (selectinload) in a dedicated query.
+    With as_dict=True the model's table is selected instead and plain column mappings (RowMapping)
+    are returned, skipping ORM instance construction and the identity map; meant for callers that
+    only serialize the rows (e.g. to JSON), since relationships are not available on them.
+    columns restricts the columns fetched (the primary key is always included): with as_dict the
+    mappings hold only those keys, otherwise the rest are deferred with load_only and loaded on
+    first access. Leaving out wide Text columns (notes, description, requirements) is what pays
+    off in list views. Names that are not columns of the model are ignored with a warning.
+    """
     try:
-        query = db.query(model)
+        selected_columns = _selected_columns(model, columns) if columns else None
+        if as_dict:
+            stmt = select(*selected_columns) if selected_columns else select(model.__table__)
+        else:
+            stmt = select(model)
+            if selected_columns:
+                stmt = stmt.options(load_only(*selected_columns))
+        if strict and not as_dict:
+            stmt = stmt.options(raiseload('*'))
         
         # Apply filters
-        if filters:
-            for key, value in filters.items():
-                if value is None: continue # Skip None values in filters
-                
-                # Handle special filter types (like ilike)
-                if key.endswith('__ilike'):
-                    actual_key = key[:-7]
-                    if hasattr(model, actual_key):
-                        query = query.filter(getattr(model, actual_key).ilike(value))
-                elif hasattr(model, key):
-                    query = query.filter(getattr(model, key) == value)
-                else:
-                    logger.warning(f"Attempted to filter on non-existent attribute '{key}' for model {model.__name__}")
-                    # Optionally raise an error or just ignore
+        stmt = _apply_filters(stmt, model, filters)
 
         # Apply sorting
+        if isinstance(order_by_column, str):
+            order_by_name = order_by_column
+            order_by_column = _sortable_columns(model).get(order_by_name)
+            if order_by_column is None:
+                logger.warning(f"Ignoring sort on unknown column '{order_by_name}' for model {model.__name__}")
         if order_by_column is not None:
             if sort_direction == 'desc':
-                query = query.order_by(desc(order_by_column))
+                stmt = stmt.order_by(desc(order_by_column))
             else:
-                query = query.order_by(asc(order_by_column))
+                stmt = stmt.order_by(asc(order_by_column))
         
         # Apply pagination
-        entities = query.offset(skip).limit(limit).all()
+        result = db.execute(stmt.offset(skip).limit(limit))
+        if as_dict:
+            return result.mappings().all()
+        entities = result.scalars().all()
         # logger.debug(f"Retrieved {len(entities)} entities for model {model.__name__} with skip={skip}, limit={limit}, filters={filters}")
         return entities
     except SQLAlchemyError as e:
@@ -97,22 +306,42 @@ def get_entities(db: Session, model: Type[ModelType],
         logger.error(f"Unexpected error retrieving entities for {model.__name__}: {e}")
         return []
 
-def update_entity(db: Session, model: Type[ModelType], entity_id: int, data: Dict[str, Any]) -> Optional[ModelType]:
-    """Generic function to update an existing entity."""
+def get_entities_iter(db: Session, model: Type[ModelType],
+                      filters: Optional[Dict[str, Any]] = None,
+                      chunk_size: int = ENTITY_ITER_CHUNK_SIZE) -> Iterator[ModelType]:
+    """
+    Yields every entity matching filters (same syntax as get_entities), in primary key order.
+    Rows are fetched with yield_per(chunk_size), so memory stays bounded by one chunk however
+    many rows match, and consumers such as export_leads_to_txt_stream can start on the first chunk.
+    Relationships cannot be eager-loaded with yield_per; avoid touching them per row.
+    Database errors are logged and end the iteration.
+    """
+    stmt = _apply_filters(select(model), model, filters).order_by(model.id)
     try:
-        entity = db.query(model).get(entity_id)
+        yield from db.execute(stmt.execution_options(yield_per=chunk_size)).scalars()
+    except SQLAlchemyError as e:
+        logger.error(f"Database error streaming entities for {model.__name__}: {e}")
+
+def update_entity(db: Session, model: Type[ModelType], entity_id: int, data: Dict[str, Any], refresh: bool = False) -> Optional[ModelType]:
+    """
+    Generic function to update an existing entity.
+    The entity is looked up with Session.get, which needs no SELECT when it is already in the
+    session's identity map. If no attribute actually changes, nothing is flushed or committed.
+    As with create_entity, the committed entity is reloaded lazily unless refresh=True.
+    """
+    try:
+        entity = db.get(model, entity_id)
         if entity is None:
             logger.warning(f"{model.__name__} with ID {entity_id} not found for update.")
             return None
         
-        for key, value in data.items():
-            if hasattr(entity, key):
-                setattr(entity, key, value)
-            else:
-                logger.warning(f"Attempted to update non-existent attribute '{key}' on {model.__name__}")
+        if not _update_entity_core(entity, data):
+            logger.debug(f"No changes for {model.__name__} ID {entity_id}; skipping commit.")
+            return entity
                 
         db.commit()
-        db.refresh(entity)
+        if refresh:
+            db.refresh(entity)
         # logger.info(f"Successfully updated {model.__name__} with ID {entity.id}")
         return entity
     except IntegrityError as e:
@@ -128,9 +357,13 @@ def update_entity(db: Session, model: Type[ModelType], entity_id: int, data: Dic
     return None
 
 def delete_entity(db: Session, model: Type[ModelType], entity_id: int) -> bool:
-    """Generic function to delete an entity by its ID."""
+    """
+    Generic function to delete an entity by its ID.
+    Deletes through the ORM (not a bulk DELETE statement) so relationship cascades and
+    association-row cleanup still run.
+    """
     try:
-        entity = db.query(model).filter(model.id == entity_id).first()
+        entity = db.execute(select(model).where(model.id == entity_id)).scalar_one_or_none()
         if entity:
             db.delete(entity)
             db.commit()
@@ -149,42 +382,59 @@ def delete_entity(db: Session, model: Type[ModelType], entity_id: int) -> bool:
 
 # --- Specific functions for job_applications (Many-to-Many relationship) ---
 
+# Dialect INSERT constructs supporting ON CONFLICT DO NOTHING; other backends fall back to a plain INSERT
+_CONFLICT_IGNORING_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+def _insert_job_applications(db: Session):
+    """INSERT into job_applications that skips (lead_id, job_posting_id) pairs already linked, where the dialect allows."""
+    dialect_insert = _CONFLICT_IGNORING_INSERTS.get(db.get_bind().dialect.name)
+    if dialect_insert is None:
+        return insert(job_applications)
+    return dialect_insert(job_applications).on_conflict_do_nothing(index_elements=['lead_id', 'job_posting_id'])
+
+def _linked_pairs(db: Session, lead_ids: set, job_ids: set) -> set:
+    """Returns the (lead_id, job_posting_id) pairs already in job_applications among the given IDs, in one query."""
+    if not lead_ids or not job_ids:
+        return set()
+    stmt = select(job_applications.c.lead_id, job_applications.c.job_posting_id).where(
+        job_applications.c.lead_id.in_(lead_ids),
+        job_applications.c.job_posting_id.in_(job_ids),
+    )
+    return {tuple(row) for row in db.execute(stmt)}
+
 def add_lead_to_job_posting(db: Session, lead_id: int, job_posting_id: int, application_status: Optional[str] = "Applied") -> bool:
-    """Associates a lead with a job posting."""
+    """
+    Associates a lead with a job posting, recording application_status on the association row.
+    One query checks that both IDs exist and whether the pair is already linked (EXISTS probes,
+    no ORM objects or collections are loaded); only a new pair costs an INSERT and a commit.
+    Linking an already associated pair is a no-op that returns True.
+    """
     try:
-        # Check if lead and job posting exist
-        lead = get_entity(db, Lead, lead_id)
-        job = get_entity(db, JobPosting, job_posting_id)
+        lead_exists, job_exists, already_linked = db.execute(
+            select(
+                exists().where(Lead.id == lead_id),
+                exists().where(JobPosting.id == job_posting_id),
+                exists().where(job_applications.c.lead_id == lead_id, job_applications.c.job_posting_id == job_posting_id),
+            )
+        ).one()
 
-        if not lead:
+        if not lead_exists:
             logger.error(f"Lead with ID {lead_id} not found. Cannot associate with job posting.")
             return False
-        if not job:
+        if not job_exists:
             logger.error(f"JobPosting with ID {job_posting_id} not found. Cannot associate lead.")
             return False
-            
-        # Check if association already exists to prevent IntegrityError if primary keys are only (lead_id, job_posting_id)
-        # This check might be redundant if your SQLAlchemy relationship handles this or if you want to allow re-application with different status.
-        # For simplicity, we'll assume a simple add. If you want to update status of an existing application, use a dedicated function.
-        
-        # stmt = job_applications.insert().values(lead_id=lead_id, job_posting_id=job_posting_id, status=application_status)
-        # db.execute(stmt)
-        # db.commit()
-        
-        # Alternative using ORM relationships if preferred (might be more intuitive but less direct for many-to-many through table inserts)
-        # Requires 'applicants' and 'applied_jobs' relationships to be correctly set up in models.py
-        if job not in lead.applied_jobs: # Avoid duplicates if relationship is already there
-            lead.applied_jobs.append(job)
-            # You might want to update the status on the association object if you had direct access to it
-            # This part is tricky with simple append, might need to create an actual JobApplication object if it was a model
-            db.commit()
+        if already_linked:
+            logger.info(f"Lead ID {lead_id} is already associated with JobPosting ID {job_posting_id}.")
+            return True
+
+        # ON CONFLICT DO NOTHING still covers a concurrent link made since the check
+        result = db.execute(
+            _insert_job_applications(db).values(lead_id=lead_id, job_posting_id=job_posting_id, status=application_status)
+        )
+        db.commit()
+        if result.rowcount:
             logger.info(f"Successfully associated Lead ID {lead_id} with JobPosting ID {job_posting_id}.")
-            # How to set the status on the association?
-            # After commit, the association should exist. We can query for it and update.
-            # This is getting complex for a simple 'add'.
-            # For now, this approach just creates the link. Status on association is not set via this method.
-            # TODO: Revisit how to set 'status' on the job_applications association table when using relationship.append()
-            # A more explicit way for association tables with extra data is often to define an Association Object (e.g. JobApplication class)
         else:
             logger.info(f"Lead ID {lead_id} is already associated with JobPosting ID {job_posting_id}.")
         return True
@@ -197,24 +447,68 @@ def add_lead_to_job_posting(db: Session, lead_id: int, job_posting_id: int, appl
         logger.error(f"Unexpected error associating lead {lead_id} with job {job_posting_id}: {e}")
     return False
 
-def remove_lead_from_job_posting(db: Session, lead_id: int, job_posting_id: int) -> bool:
-    """Removes the association between a lead and a job posting."""
+def add_leads_to_job_postings(db: Session, pairs: Iterable[tuple], application_status: Optional[str] = "Applied") -> bool:
+    """
+    Associates many (lead_id, job_posting_id) pairs in one executemany INSERT and one commit.
+    The IDs are validated with one IN query per table (not two queries per pair); pairs naming
+    a missing lead or job posting are skipped with a warning. Pairs already linked are skipped
+    too: by ON CONFLICT DO NOTHING on PostgreSQL and SQLite, and by one extra SELECT of the
+    existing pairs on other backends, whose plain INSERT would otherwise fail the whole batch.
+    """
+    pairs = list(pairs)
+    if not pairs:
+        return True
     try:
-        lead = get_entity(db, Lead, lead_id)
-        job = get_entity(db, JobPosting, job_posting_id)
-
-        if not lead or not job:
-            logger.error(f"Lead ID {lead_id} or JobPosting ID {job_posting_id} not found for disassociation.")
-            return False
+        lead_ids = _existing_ids(db, Lead, (lead_id for lead_id, _ in pairs))
+        job_ids = _existing_ids(db, JobPosting, (job_posting_id for _, job_posting_id in pairs))
+        valid_pairs = [
+            (lead_id, job_posting_id)
+            for lead_id, job_posting_id in pairs
+            if lead_id in lead_ids and job_posting_id in job_ids
+        ]
+        if len(valid_pairs) < len(pairs):
+            logger.warning(f"Skipping {len(pairs) - len(valid_pairs)} pairs referring to missing leads or job postings.")
+        if db.get_bind().dialect.name not in _CONFLICT_IGNORING_INSERTS:
+            skipped = _linked_pairs(db, lead_ids, job_ids)
+            # dict.fromkeys drops duplicates within the batch as well, keeping input order
+            valid_pairs = [pair for pair in dict.fromkeys(valid_pairs) if pair not in skipped]
+        rows = [
+            {"lead_id": lead_id, "job_posting_id": job_posting_id, "status": application_status}
+            for lead_id, job_posting_id in valid_pairs
+        ]
+        if not rows:
+            return True
+        db.execute(_insert_job_applications(db), rows)
+        db.commit()
+        logger.info(f"Associated {len(rows)} lead/job posting pairs.")
+        return True
+    except SQLAlchemyError as e:
+        db.rollback()
+        logger.error(f"SQLAlchemy error associating {len(pairs)} lead/job posting pairs: {e}")
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Unexpected error associating {len(pairs)} lead/job posting pairs: {e}")
+    return False
 
-        if job in lead.applied_jobs:
-            lead.applied_jobs.remove(job)
-            db.commit()
+def remove_lead_from_job_posting(db: Session, lead_id: int, job_posting_id: int) -> bool:
+    """
+    Removes the association between a lead and a job posting with a single DELETE on
+    job_applications; neither entity nor the lead's applied_jobs collection is loaded.
+    Returns False if the pair was not associated (including when either ID does not exist).
+    """
+    try:
+        result = db.execute(
+            delete(job_applications).where(
+                job_applications.c.lead_id == lead_id,
+                job_applications.c.job_posting_id == job_posting_id,
+            )
+        )
+        db.commit()
+        if result.rowcount:
             logger.info(f"Successfully disassociated Lead ID {lead_id} from JobPosting ID {job_posting_id}.")
             return True
-        else:
-            logger.info(f"Lead ID {lead_id} was not associated with JobPosting ID {job_posting_id}.")
-            return False
+        logger.info(f"Lead ID {lead_id} was not associated with JobPosting ID {job_posting_id}.")
+        return False
             
     except SQLAlchemyError as e:
         db.rollback()
@@ -225,18 +519,58 @@ def remove_lead_from_job_posting(db: Session, lead_id: int, job_posting_id: int)
     return False
 
 def get_lead_applications(db: Session, lead_id: int) -> List[JobPosting]:
-    """Gets all job postings a lead has applied to."""
-    lead = get_entity(db, Lead, lead_id)
+    """
+    Gets all job postings a lead has applied to.
+    The postings and their companies are eager-loaded with selectinload (one IN query per
+    relationship), so iterating the result and touching job.company fires no per-row SELECT.
+    """
+    try:
+        lead = db.execute(
+            select(Lead)
+            .options(selectinload(Lead.applied_jobs).selectinload(JobPosting.company))
+            .where(Lead.id == lead_id)
+        ).scalar_one_or_none()
+    except SQLAlchemyError as e:
+        logger.error(f"SQLAlchemy error retrieving applications for lead {lead_id}: {e}")
+        return []
     if lead:
         return lead.applied_jobs
     return []
 
 def get_job_applicants(db: Session, job_posting_id: int) -> List[Lead]:
-    """Gets all leads who have applied to a specific job posting."""
-    job = get_entity(db, JobPosting, job_posting_id)
+    """
+    Gets all leads who have applied to a specific job posting.
+    The applicants and their companies are eager-loaded with selectinload, as in get_lead_applications.
+    """
+    try:
+        job = db.execute(
+            select(JobPosting)
+            .options(selectinload(JobPosting.applicants).selectinload(Lead.company))
+            .where(JobPosting.id == job_posting_id)
+        ).scalar_one_or_none()
+    except SQLAlchemyError as e:
+        logger.error(f"SQLAlchemy error retrieving applicants for job posting {job_posting_id}: {e}")
+        return []
     if job:
         return job.applicants
     return []
 
+def query_leads_with_applications(db: Session, job_status: Optional[str] = "Open") -> List[Lead]:
+    """
+    Gets the leads that applied to job postings with job_status (any status if None), each with
+    applied_jobs holding just those postings.
+    One SELECT joins leads to job postings through job_applications and fills applied_jobs from
+    that same join with contains_eager. Adding joinedload(Lead.applied_jobs) instead would join
+    the tables a second time, multiplying the rows returned; keep it to the one join.
+    """
+    stmt = select(Lead).join(Lead.applied_jobs).options(contains_eager(Lead.applied_jobs)).order_by(Lead.id)
+    if job_status is not None:
+        stmt = stmt.where(JobPosting.status == job_status)
+    try:
+        return db.execute(stmt).unique().scalars().all()
+    except SQLAlchemyError as e:
+        logger.error(f"SQLAlchemy error retrieving leads with applications: {e}")
+    return []
+
 # TODO: Add functions for filtering, pagination, bulk operations, and advanced search as per subtask 3.4 full scope.
 # For now, these basic CRUD and association helpers should suffice as a starting point. 
\ No newline at end of file
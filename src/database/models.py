@@ -18,7 +18,9 @@ job_applications = sqlalchemy.Table('job_applications',
     sqlalchemy.Column('lead_id', sqlalchemy.Integer, sqlalchemy.ForeignKey('leads.id', ondelete='CASCADE'), primary_key=True),
     sqlalchemy.Column('job_posting_id', sqlalchemy.Integer, sqlalchemy.ForeignKey('job_postings.id', ondelete='CASCADE'), primary_key=True),
     sqlalchemy.Column('application_date', sqlalchemy.DateTime, default=lambda: datetime.datetime.now(datetime.UTC), nullable=False),
-    sqlalchemy.Column('status', sqlalchemy.String, nullable=True) # e.g., Applied, Interviewing, Offer, Rejected
+    sqlalchemy.Column('status', sqlalchemy.String, nullable=True), # e.g., Applied, Interviewing, Offer, Rejected
+    # The primary key (lead_id, job_posting_id) only serves lookups by lead; this serves JobPosting.applicants
+    sqlalchemy.Index('ix_job_applications_job_lead', 'job_posting_id', 'lead_id')
 )
 
 # Enum for Lead Status
@@ -110,6 +112,28 @@ class JobPosting(Base):
     def __repr__(self):
         return f"<JobPosting(id={self.id}, title='{self.title}', status='{self.status}')>"
 
+class CompanyUrlCache(Base):
+    """Persisted company name -> LinkedIn company URL lookups, so later runs skip the web search."""
+    __tablename__ = 'company_url_cache'
+
+    normalized_name = Column(String, primary_key=True) # As returned by normalize_company_name
+    linkedin_url = Column(String, nullable=False)
+    fetched_at = Column(Float, nullable=False) # Unix timestamp of the lookup
+
+    def __repr__(self):
+        return f"<CompanyUrlCache(normalized_name='{self.normalized_name}', linkedin_url='{self.linkedin_url}')>"
+
+class CompanyDetailsCache(Base):
+    """Persisted, already-cleaned company details per LinkedIn URL, so later runs skip scraping and cleaning."""
+    __tablename__ = 'company_cache'
+
+    url = Column(String, primary_key=True)
+    cleaned_json = Column(Text, nullable=False) # JSON-encoded output of clean_company_data
+    fetched_at = Column(Float, nullable=False) # Unix timestamp of the lookup
+
+    def __repr__(self):
+        return f"<CompanyDetailsCache(url='{self.url}')>"
+
 # Association table for a many-to-many relationship between Leads and JobPostings
 # To be implemented/confirmed in Subtask 3.2 if this is the desired relationship.
 # class JobApplication(Base):
@@ -1,7 +1,9 @@
 import os
 import sys
 import datetime
+import itertools
 import logging
+from collections import defaultdict
 
 # Adjust path to import custom exceptions relative to src
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -28,14 +30,48 @@ logger = logging.getLogger(__name__)
 if not logger.handlers:
     logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 
+# Write buffer for export files (1 MiB), so per-lead writes rarely reach the OS
+EXPORT_WRITE_BUFFER_SIZE = 1 << 20
+# Formatted lead records joined into each f.write call
+EXPORT_WRITE_BATCH_SIZE = 1000
+
+# One exported lead record, filled with str.format_map; fields missing from the lead render as N/A
+_LEAD_TEMPLATE = (
+    "Lead #{i}\n"
+    + "-"*20 + "\n"
+    "Name:       {lead_name}\n"
+    "Profile:    {linkedin_profile_url}\n"
+    "Role:       {current_role}\n"
+    "Company:    {company_name}\n"
+    "Location:   {location}\n"
+    "Schools:    {alma_mater_match}\n"
+    "Source:     {source_of_lead}\n"
+    "Added:      {date_added}\n"
+    "Snippet:    {raw_snippet}\n"
+    "\n" + "="*40 + "\n\n"
+)
+
+def _not_available():
+    return 'N/A'
+
+# Output directories already created/confirmed in this process; later exporters for them skip os.makedirs
+_ENSURED_DIRS = set()
+
+# Marks an empty iterable in export_leads_to_txt_stream (None could be a lead to skip)
+_NO_LEAD = object()
+
 class TextFileExporter:
     def __init__(self, output_dir="output"):
         """
         Initializes the TextFileExporter, ensuring the output directory exists.
+        Each directory is only created/checked once per process.
         """
         self.output_dir = output_dir
+        if output_dir in _ENSURED_DIRS:
+            return
         try:
             os.makedirs(output_dir, exist_ok=True)
+            _ENSURED_DIRS.add(output_dir)
             logger.info(f"Ensured output directory exists: {self.output_dir}")
         except OSError as e:
             logger.error(f"Could not create output directory {self.output_dir}: {e}")
@@ -59,45 +95,47 @@ class TextFileExporter:
         if not leads:
             logger.info("No leads provided to export. Skipping file creation.")
             return ""
-            
+
+        return self._export(leads, filename, total=len(leads))
+
+    def export_leads_to_txt_stream(self, leads_iter, filename: str = None) -> str:
+        """
+        Export leads from any iterable (e.g. a generator over get_entities_iter) to a text file.
+        Leads are written as they arrive, so memory use does not grow with the export and writing
+        starts with the first lead. As the total is not known up front, it is written at the end.
+        Returns the path to the created file, or "" if the iterable is empty.
+        Raises OutputGenerationError on failure.
+        """
+        leads_iter = iter(leads_iter)
+        first_lead = next(leads_iter, _NO_LEAD)
+        if first_lead is _NO_LEAD:
+            logger.info("No leads provided to export. Skipping file creation.")
+            return ""
+
+        return self._export(itertools.chain((first_lead,), leads_iter), filename)
+
+    def _export(self, leads, filename: str = None, total: int = None) -> str:
+        """Writes leads to filename (timestamped if not given), with the total in the header if known, else at the end."""
         if not filename:
             timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"leads_{timestamp}.txt"
             
         file_path = os.path.join(self.output_dir, filename)
         
-        logger.info(f"Exporting {len(leads)} leads to text file: {file_path}")
+        if total is None:
+            logger.info(f"Streaming leads to text file: {file_path}")
+        else:
+            logger.info(f"Exporting {total} leads to text file: {file_path}")
         
         try:
-            with open(file_path, 'w', encoding='utf-8') as f:
+            with open(file_path, 'w', encoding='utf-8', buffering=EXPORT_WRITE_BUFFER_SIZE) as f:
                 f.write(f"Lead Export - {datetime.datetime.now().strftime('%Y-%m-%d %H:%M')}\n")
-                f.write(f"Total Leads: {len(leads)}\n")
+                if total is not None:
+                    f.write(f"Total Leads: {total}\n")
                 f.write("="*40 + "\n\n")
-                for i, lead in enumerate(leads):
-                    if not isinstance(lead, dict):
-                        logger.warning(f"Skipping invalid item at index {i} in leads list (not a dict): {lead}")
-                        continue
-                    f.write(f"Lead #{i+1}\n")
-                    f.write("-"*20 + "\n")
-                    f.write(f"Name:       {lead.get('lead_name', 'N/A')}\n")
-                    f.write(f"Profile:    {lead.get('linkedin_profile_url', 'N/A')}\n")
-                    f.write(f"Role:       {lead.get('current_role', 'N/A')}\n")
-                    f.write(f"Company:    {lead.get('company_name', 'N/A')}\n")
-                    f.write(f"Location:   {lead.get('location', 'N/A')}\n")
-                    
-                    schools = lead.get('alma_mater_match', [])
-                    if isinstance(schools, list):
-                        f.write(f"Schools:    {', '.join(schools) if schools else 'N/A'}\n")
-                    else: # Handle unexpected type
-                        f.write(f"Schools:    {str(schools)}\n") 
-                        
-                    f.write(f"Source:     {lead.get('source_of_lead', 'N/A')}\n")
-                    # Format datetime object to string if it exists
-                    date_added = lead.get('date_added')
-                    date_str = date_added.strftime("%Y-%m-%d %H:%M:%S") if isinstance(date_added, datetime.datetime) else str(date_added or 'N/A')
-                    f.write(f"Added:      {date_str}\n")
-                    f.write(f"Snippet:    {lead.get('raw_snippet', 'N/A')}\n") # Optional: Include raw snippet
-                    f.write("\n" + "="*40 + "\n\n")
+                count = self._write_leads(f, leads)
+                if total is None:
+                    f.write(f"Total Leads: {count}\n")
                     
             logger.info(f"Successfully exported leads to {file_path}")
             return file_path
@@ -111,6 +149,34 @@ class TextFileExporter:
             # Wrap other unexpected errors
             raise OutputGenerationError(f"Unexpected error during text export", output_path=file_path, original_exception=e) from e
 
+    def _write_leads(self, f, leads) -> int:
+        """
+        Writes one record per lead dict to f, skipping (and logging) anything else. Returns the number of items seen.
+        Records are formatted with _LEAD_TEMPLATE and written EXPORT_WRITE_BATCH_SIZE at a time in one f.write.
+        """
+        count = 0
+        batch = []
+        for i, lead in enumerate(leads):
+            count = i + 1
+            if not isinstance(lead, dict):
+                logger.warning(f"Skipping invalid item at index {i} in leads list (not a dict): {lead}")
+                continue
+            record = defaultdict(_not_available, lead)
+            record['i'] = i + 1
+            schools = lead.get('alma_mater_match', [])
+            if isinstance(schools, list):
+                record['alma_mater_match'] = ', '.join(schools) or 'N/A'
+            # Format datetime object to string if it exists
+            date_added = lead.get('date_added')
+            record['date_added'] = date_added.strftime("%Y-%m-%d %H:%M:%S") if isinstance(date_added, datetime.datetime) else str(date_added or 'N/A')
+            batch.append(_LEAD_TEMPLATE.format_map(record))
+            if len(batch) >= EXPORT_WRITE_BATCH_SIZE:
+                f.write(''.join(batch))
+                batch.clear()
+        if batch:
+            f.write(''.join(batch))
+        return count
+
 # Example usage
 if __name__ == '__main__':
     print("Testing TextFileExporter...")
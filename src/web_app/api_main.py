@@ -140,19 +140,35 @@ async def sqlalchemy_exception_handler(request: Request, exc: SQLAlchemyError):
 #     return JSONResponse(status_code=400, content={"detail": str(exc)})
 
 # --- Request Logging Middleware ---
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    idem = str(uuid.uuid4()) # Generate a unique ID for each request
-    logger.info(f"rid={idem} start request path={request.url.path}")
-    start_time = time.time()
-    
-    response = await call_next(request)
-    
-    process_time = (time.time() - start_time) * 1000
-    formatted_process_time = '{0:.2f}'.format(process_time)
-    logger.info(f"rid={idem} completed_in={formatted_process_time}ms status_code={response.status_code}")
-    
-    return response
+class RequestLoggingMiddleware:
+    """
+    Logs the start of each HTTP request and its status code and latency once the response starts.
+    Plain ASGI middleware: unlike @app.middleware("http") (BaseHTTPMiddleware) it builds no
+    Request/Response objects and runs no extra task per request; it only watches the
+    http.response.start message on its way out. Non-HTTP scopes (lifespan, websockets) pass through.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        rid = uuid.uuid4().hex # Unique ID for each request
+        logger.info("rid=%s start request path=%s", rid, scope["path"])
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                logger.info("rid=%s completed_in=%.2fms status_code=%s",
+                            rid, (time.perf_counter() - start) * 1000, message["status"])
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+app.add_middleware(RequestLoggingMiddleware)
 
 # --- API Routes (Routers will be added in later subtasks) ---
 
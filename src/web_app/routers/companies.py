@@ -42,7 +42,7 @@ def read_companies(skip: int = 0, limit: int = 100, name: Optional[str] = None,
         # Using exact match for now
         filters['name'] = name 
     
-    companies = db_utils.get_entities(db, models.Company, skip=skip, limit=limit, filters=filters)
+    companies = db_utils.get_entities(db, models.Company, skip=skip, limit=limit, filters=filters, as_dict=True)
     return companies
 
 @router.get("/{company_id}", response_model=schemas.CompanyRead)
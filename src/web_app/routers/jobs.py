@@ -45,7 +45,7 @@ def read_job_postings(skip: int = 0, limit: int = 100, company_id: Optional[int]
     if status:
         filters['status'] = status
     
-    jobs = db_utils.get_entities(db, models.JobPosting, skip=skip, limit=limit, filters=filters)
+    jobs = db_utils.get_entities(db, models.JobPosting, skip=skip, limit=limit, filters=filters, as_dict=True)
     return jobs
 
 @router.get("/{job_id}", response_model=schemas.JobPostingRead)
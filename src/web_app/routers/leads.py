@@ -56,13 +56,6 @@ def read_leads(skip: int = 0, limit: int = 100,
     if company_id:
         filters['company_id'] = company_id
         
-    order_by_column = None
-    if sort_by:
-        if hasattr(models.Lead, sort_by):
-            order_by_column = getattr(models.Lead, sort_by)
-        else:
-            pass
-            
     sort_direction = sort_order.lower()
     if sort_direction not in ['asc', 'desc']:
         sort_direction = 'asc'
@@ -70,7 +63,7 @@ def read_leads(skip: int = 0, limit: int = 100,
     leads = db_utils.get_entities(
         db, models.Lead, 
         skip=skip, limit=limit, filters=filters,
-        order_by_column=order_by_column,
+        order_by_column=sort_by, # Resolved (and validated) against Lead's columns by db_utils
         sort_direction=sort_direction
     )
     return leads
@@ -157,6 +157,20 @@ class TestConfigManager:
         assert manager.db_path == 'sqlite:///leads.db' 
         assert manager.greenhouse_tokens_json_path is None
         assert manager.greenhouse_board_tokens == {}
+        assert manager.serpapi_max_qps == 5.0
+        assert manager.sqlite_wal is False
+
+    def test_get_float_config_helper(self, mocker):
+        """Test the _get_float_config helper method."""
+        with patch.object(ConfigManager, '_load_greenhouse_tokens', return_value={}), \
+             patch('os.path.exists', return_value=False), \
+             patch.dict(os.environ, {'SERPAPI_MAX_QPS': '2.5'}, clear=True):
+            manager = ConfigManager(env_file_path='.dummy.env')
+        assert manager.serpapi_max_qps == 2.5
+        mocker.patch.dict(os.environ, {'TEST_FLOAT': 'fast'}, clear=True)
+        assert manager._get_float_config('TEST_FLOAT', 1.0) == 1.0
+        mocker.patch.dict(os.environ, {'TEST_FLOAT': ' '}, clear=True)
+        assert manager._get_float_config('TEST_FLOAT', 1.0) == 1.0
 
     def test_get_list_config_helper(self, mocker):
         """Test the _get_list_config helper method."""
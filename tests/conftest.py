@@ -5,4 +5,18 @@
 #
 # @pytest.fixture
 # def example_fixture():
-#     return 42 
\ No newline at end of file
+#     return 42 
+
+import os
+
+# src.web_app.api_main builds its DatabaseManager at import time from DB_PATH. Import it once here,
+# against an in-memory database, so the web_app tests never open (or create) the repo's leads.db.
+_saved_db_path = os.environ.get('DB_PATH')
+os.environ['DB_PATH'] = 'sqlite:///:memory:'
+try:
+    import src.web_app.api_main  # noqa: F401
+finally:
+    if _saved_db_path is None:
+        del os.environ['DB_PATH']
+    else:
+        os.environ['DB_PATH'] = _saved_db_path
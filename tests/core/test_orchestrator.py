@@ -62,9 +62,9 @@ class TestOrchestrator:
         mock_components['CompanyScraper'].assert_called_once_with(config_manager=mock_config_instance)
         mock_components['LeverClient'].assert_called_once_with(config_manager=mock_config_instance)
         mock_components['GreenhouseClient'].assert_called_once_with(config_manager=mock_config_instance)
-        # LeadProcessor needs config and company_scraper instance
+        # LeadProcessor needs config, company_scraper and db_manager (persistent company URL cache) instances
         mock_cs_instance = mock_components['CompanyScraper'].return_value
-        mock_components['LeadProcessor'].assert_called_once_with(config_manager=mock_config_instance, company_scraper=mock_cs_instance)
+        mock_components['LeadProcessor'].assert_called_once_with(config_manager=mock_config_instance, company_scraper=mock_cs_instance, db_manager=mock_db_instance)
         
         # Check instances are stored on the orchestrator object
         assert orchestrator.config_manager is mock_config_instance
@@ -96,6 +96,18 @@ class TestOrchestrator:
         assert excinfo.value is test_exception # Ensure the original exception is re-raised
 
     # --- TODO: Add tests for run_linkedin_workflow --- 
+
+    @patch('src.core.orchestrator.time.sleep')
+    def test_run_linkedin_workflow_does_not_sleep_between_searches(self, mock_sleep, mock_components):
+        """SerpApi pacing is left to the scraper's rate limiter; the loop itself does not sleep."""
+        orchestrator = Orchestrator(config_path="dummy/path/.env")
+        mock_linkedin_scraper = mock_components['LinkedInScraper'].return_value
+        mock_linkedin_scraper.scrape_pms_by_location.return_value = []
+
+        orchestrator.run_linkedin_workflow(search_queries=[{'keywords': 'PM', 'location': 'A'}, {'keywords': 'PM', 'location': 'B'}])
+
+        assert mock_linkedin_scraper.scrape_pms_by_location.call_count == 2
+        mock_sleep.assert_not_called()
     
     def test_run_linkedin_workflow_no_scrape_results(self, mock_components):
         """Test workflow skips processing/DB if LinkedIn scraping yields no results."""
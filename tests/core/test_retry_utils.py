@@ -12,7 +12,7 @@ project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
-from src.core.retry_utils import retry_with_backoff
+from src.core.retry_utils import retry_with_backoff, parse_retry_after, RateLimiter
 from src.core.exceptions import ApiLimitError # Example custom exception
 
 # --- Mock Response Class (similar to example) --- 
@@ -232,4 +232,78 @@ def test_retry_with_custom_exception(mocker):
     result = decorated_func()
     assert result == "Success"
     assert mock_func.call_count == 2
-    assert mock_sleep.call_count == 1 
\ No newline at end of file
+    assert mock_sleep.call_count == 1 
+
+def test_retry_honours_retry_after(mocker):
+    """Test that a retry_after on the exception sets a floor on the backoff delay."""
+    mock_sleep = mocker.patch('time.sleep')
+    mock_func = MagicMock()
+    mock_func.side_effect = [ApiLimitError("Limited", retry_after=7.0), ApiLimitError("Limited", retry_after=0.0), "Success"]
+
+    @retry_with_backoff(retries=2, initial_delay=1, backoff_factor=2, jitter=False, retry_on_exceptions=(ApiLimitError,))
+    def decorated_func():
+        return mock_func()
+
+    assert decorated_func() == "Success"
+    # Server asked for longer than the backoff on the first retry; backoff wins on the second
+    assert mock_sleep.call_args_list == [call(pytest.approx(7.0)), call(pytest.approx(2.0))]
+
+def test_retry_gives_up_when_retry_after_exceeds_max_delay(mocker):
+    """Test that a server wait longer than max_delay re-raises instead of blocking for it."""
+    mock_sleep = mocker.patch('time.sleep')
+    error = ApiLimitError("Limited", retry_after=3600.0)
+    mock_func = MagicMock(side_effect=[error, "Success"])
+
+    @retry_with_backoff(retries=2, initial_delay=1, jitter=False, max_delay=30, retry_on_exceptions=(ApiLimitError,))
+    def decorated_func():
+        return mock_func()
+
+    with pytest.raises(ApiLimitError) as exc_info:
+        decorated_func()
+    assert exc_info.value is error
+    assert mock_func.call_count == 1
+    mock_sleep.assert_not_called()
+
+def test_parse_retry_after_seconds_and_date(mocker):
+    """Test parsing Retry-After as delay-seconds and as an HTTP-date."""
+    assert parse_retry_after("120") == 120.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("not a date") is None
+    assert parse_retry_after("inf") is None # Non-finite values would make time.sleep raise
+    assert parse_retry_after("nan") is None
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0 # In the past
+
+def test_full_jitter_with_max_delay(mocker):
+    """Test that full jitter sleeps uniform(0, delay) and that max_delay caps the delay."""
+    mock_sleep = mocker.patch('time.sleep')
+    mock_uniform = mocker.patch('random.uniform', side_effect=lambda low, high: high / 2)
+    mock_func = MagicMock(side_effect=[ValueError("1"), ValueError("2"), ValueError("3"), "Success"])
+
+    @retry_with_backoff(retries=3, initial_delay=2, backoff_factor=4, jitter="full", max_delay=10,
+                        retry_on_exceptions=(ValueError,))
+    def decorated_func():
+        return mock_func()
+
+    assert decorated_func() == "Success"
+    # Delays 2, 8, 32 -> capped to 2, 8, 10, then halved by the mocked uniform(0, delay)
+    assert mock_uniform.call_args_list == [call(0, 2), call(0, 8), call(0, 10)]
+    assert mock_sleep.call_args_list == [call(pytest.approx(1.0)), call(pytest.approx(4.0)), call(pytest.approx(5.0))]
+
+# --- RateLimiter ---
+
+def test_rate_limiter_allows_burst_then_spaces_calls(mocker):
+    """Calls within the burst go through immediately; later ones wait 1/rate seconds each."""
+    clock = mocker.patch('src.core.retry_utils.time.monotonic', return_value=100.0)
+    mock_sleep = mocker.patch('src.core.retry_utils.time.sleep')
+    limiter = RateLimiter(rate=2, burst=2)
+
+    assert [limiter.acquire() for _ in range(4)] == [0.0, 0.0, pytest.approx(0.5), pytest.approx(1.0)]
+    assert mock_sleep.call_args_list == [call(pytest.approx(0.5)), call(pytest.approx(1.0))]
+
+    # After the reserved tokens are paid back and another second passes, two calls fit again
+    clock.return_value = 102.0
+    assert limiter.acquire() == 0.0
+
+def test_rate_limiter_rejects_non_positive_rate():
+    with pytest.raises(ValueError):
+        RateLimiter(rate=0)
@@ -11,7 +11,7 @@ if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
 # Corrected import for CompanyScraper
-from src.data_acquisition.company_scraper import CompanyScraper 
+from src.data_acquisition.company_scraper import CompanyScraper, DEFAULT_COMPANY_CACHE_EXPIRY_SECONDS
 from src.config.config_manager import ConfigManager # For spec
 
 # --- Fixtures --- 
@@ -36,7 +36,7 @@ def mock_config_manager_no_key():
 def mock_serpapi_client(mocker):
     # Patch the serpapi.Client class within the correct module context
     mock_client_instance = MagicMock()
-    mocker.patch('src.data_acquisition.company_scraper.serpapi.Client', return_value=mock_client_instance)
+    mocker.patch('serpapi.Client', return_value=mock_client_instance)
     return mock_client_instance
 
 # --- Test Class --- 
@@ -44,7 +44,7 @@ def mock_serpapi_client(mocker):
 class TestCompanyScraperInitialization:
     def test_init_with_api_key(self, mock_config_manager_with_key, mocker):
         # Patch the client creation during init within correct module
-        mock_client_constructor = mocker.patch('src.data_acquisition.company_scraper.serpapi.Client')
+        mock_client_constructor = mocker.patch('serpapi.Client')
         
         scraper = CompanyScraper(config_manager=mock_config_manager_with_key)
         
@@ -52,9 +52,46 @@ class TestCompanyScraperInitialization:
         mock_client_constructor.assert_called_once_with(api_key="test_api_key")
         assert scraper.client is mock_client_constructor.return_value
 
+    def test_init_mounts_retrying_adapter(self, mock_config_manager_with_key):
+        scraper = CompanyScraper(config_manager=mock_config_manager_with_key)
+
+        adapter = scraper.client.session.get_adapter("https://serpapi.com/search")
+        assert adapter.max_retries.total == 5
+        assert 429 in adapter.max_retries.status_forcelist
+        assert adapter.max_retries.respect_retry_after_header is True
+
+    def test_retrying_adapter_gives_up_on_long_retry_after(self, mock_config_manager_with_key):
+        import requests
+        import threading
+        from http.server import BaseHTTPRequestHandler, HTTPServer
+
+        class TooManyRequests(BaseHTTPRequestHandler):
+            def do_GET(self):
+                self.send_response(429)
+                self.send_header("Retry-After", "3600")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        server = HTTPServer(("127.0.0.1", 0), TooManyRequests)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        scraper = CompanyScraper(config_manager=mock_config_manager_with_key)
+        session = requests.Session()
+        session.mount("http://", scraper.client.session.get_adapter("https://serpapi.com/search"))
+        try:
+            start = time.monotonic()
+            with pytest.raises(requests.exceptions.RetryError):
+                session.get(f"http://127.0.0.1:{server.server_port}/search", timeout=5)
+            assert time.monotonic() - start < 5
+        finally:
+            server.shutdown()
+            server.server_close()
+
     def test_init_without_api_key(self, mock_config_manager_no_key, mocker):
         # Patch the client creation during init within correct module
-        mock_client_constructor = mocker.patch('src.data_acquisition.company_scraper.serpapi.Client')
+        mock_client_constructor = mocker.patch('serpapi.Client')
 
         scraper = CompanyScraper(config_manager=mock_config_manager_no_key)
         
@@ -62,6 +99,33 @@ class TestCompanyScraperInitialization:
         mock_client_constructor.assert_not_called()
         assert scraper.client is None
 
+    def test_cache_expiry_resolved_once_per_config(self, mock_config_manager_no_key):
+        mock_config_manager_no_key.get_config = MagicMock(return_value="120")
+
+        first = CompanyScraper(config_manager=mock_config_manager_no_key)
+        second = CompanyScraper(config_manager=mock_config_manager_no_key)
+
+        assert first.cache_expiry_seconds == 120
+        assert second.cache_expiry_seconds == 120
+        mock_config_manager_no_key.get_config.assert_called_once_with("COMPANY_CACHE_EXPIRY_SECONDS", DEFAULT_COMPANY_CACHE_EXPIRY_SECONDS)
+
+    def test_shared_returns_single_instance(self, mock_config_manager_with_key, mocker):
+        mocker.patch('serpapi.Client')
+        mocker.patch('src.data_acquisition.company_scraper._SHARED_SCRAPER', None)
+
+        first = CompanyScraper.shared(mock_config_manager_with_key)
+        second = CompanyScraper.shared(mock_config_manager_with_key)
+
+        assert first is second
+        assert isinstance(first, CompanyScraper)
+
+    def test_invalid_cache_expiry_uses_default(self, mock_config_manager_no_key):
+        mock_config_manager_no_key.get_config = MagicMock(return_value="not-a-number")
+
+        scraper = CompanyScraper(config_manager=mock_config_manager_no_key)
+
+        assert scraper.cache_expiry_seconds == DEFAULT_COMPANY_CACHE_EXPIRY_SECONDS
+
 class TestCompanyScraperGetCompanyInfo:
 
     def test_get_company_info_no_api_key(self, mock_config_manager_no_key):
@@ -155,8 +219,8 @@ class TestCompanyScraperParseCompanyResults:
 # --- TODO: Tests for _make_serpapi_request --- 
 class TestCompanyScraperMakeSerpApiRequest:
     @pytest.fixture
-    def scraper(self, mock_config_manager_with_key):
-        # Need API key for this method
+    def scraper(self, mock_config_manager_with_key, mock_serpapi_client):
+        # Need API key for this method; the client is created in __init__, so mock it first
         return CompanyScraper(config_manager=mock_config_manager_with_key)
 
     def test_make_request_success(self, scraper, mock_serpapi_client):
@@ -219,7 +283,7 @@ class TestCompanyScraperFindCompanyLinkedinUrl:
         
         url = scraper.find_company_linkedin_url(company_name)
         
-        scraper._make_serpapi_request.assert_called_once_with(f'{company_name} site:linkedin.com/company', num_results=3)
+        scraper._make_serpapi_request.assert_called_once_with(f'{company_name} site:linkedin.com/company OR company profile', num_results=5)
         assert url == expected_url
 
     def test_find_linkedin_no_match(self, scraper, mocker):
@@ -240,6 +304,69 @@ class TestCompanyScraperFindCompanyLinkedinUrl:
         url = scraper.find_company_linkedin_url(company_name)
         assert url is None
 
+class TestCompanyScraperGetCompanyBundle:
+    @pytest.fixture
+    def scraper(self, mock_config_manager_with_key):
+        return CompanyScraper(config_manager=mock_config_manager_with_key)
+
+    def test_bundle_combines_url_and_kg_details(self, scraper, mocker):
+        company_name = "Acme Corp"
+        linkedin_url = "https://www.linkedin.com/company/acmecorp"
+        mock_results = {
+            "knowledge_graph": {"title": "Acme Corp", "description": "Makes anvils.", "website": "acme.com"},
+            "organic_results": [
+                {"title": "Acme Corp - Official Site", "link": "https://acme.com"},
+                {"title": "Acme Corp | LinkedIn", "link": linkedin_url},
+            ]
+        }
+        mocker.patch.object(scraper, '_make_serpapi_request', return_value=mock_results)
+
+        bundle = scraper.get_company_bundle(company_name)
+
+        assert bundle['linkedin_url'] == linkedin_url
+        assert bundle['name'] == "Acme Corp"
+        assert bundle['description'] == "Makes anvils."
+        assert bundle['website'] == "acme.com"
+
+    def test_bundle_seeds_url_cache_so_extract_needs_no_request(self, scraper, mocker):
+        company_name = "Acme Corp"
+        linkedin_url = "https://www.linkedin.com/company/acmecorp"
+        mock_results = {"organic_results": [{"title": "Acme Corp | LinkedIn", "link": linkedin_url, "snippet": "Acme on LinkedIn"}]}
+        mock_make_request = mocker.patch.object(scraper, '_make_serpapi_request', return_value=mock_results)
+
+        url = scraper.find_company_linkedin_url(company_name)
+        details = scraper.extract_company_data_from_url(url)
+
+        mock_make_request.assert_called_once()
+        assert url == linkedin_url
+        assert details['name'] == "Acme Corp"
+        assert details['description'] == "Acme on LinkedIn"
+
+    def test_bundle_cached_by_name(self, scraper, mocker):
+        mock_results = {"organic_results": [{"title": "Acme Corp | LinkedIn", "link": "https://linkedin.com/company/acme"}]}
+        mock_make_request = mocker.patch.object(scraper, '_make_serpapi_request', return_value=mock_results)
+
+        first = scraper.get_company_bundle("Acme Corp")
+        second = scraper.get_company_bundle("ACME CORP")
+
+        mock_make_request.assert_called_once()
+        assert first is second
+
+    def test_bundle_api_error(self, scraper, mocker):
+        mocker.patch.object(scraper, '_make_serpapi_request', return_value=None)
+        assert scraper.get_company_bundle("API Error Co") is None
+
+    def test_bundle_ignores_linkedin_path_outside_host(self, scraper, mocker):
+        mock_results = {"organic_results": [
+            {"title": "Acme Corp | LinkedIn", "link": "https://evil.example.com/?next=linkedin.com/company/acme"},
+            {"title": "Acme Corp | LinkedIn", "link": "https://www.linkedin.com/company/acme"},
+        ]}
+        mocker.patch.object(scraper, '_make_serpapi_request', return_value=mock_results)
+
+        bundle = scraper.get_company_bundle("Acme Corp")
+
+        assert bundle["linkedin_url"] == "https://www.linkedin.com/company/acme"
+
 # --- TODO: Tests for extract_company_data_from_url (including cache) --- 
 class TestCompanyScraperExtractCompanyData:
     @pytest.fixture
@@ -251,8 +378,7 @@ class TestCompanyScraperExtractCompanyData:
     def test_extract_data_cache_hit(self, scraper, mocker):
         url = "https://linkedin.com/company/cachedco"
         cached_data = {"name": "Cached Co", "linkedin_url": url}
-        # Corrected: Use time.time()
-        scraper.cache[url] = {"timestamp": time.time() - 10, "data": cached_data} 
+        scraper.cache[url] = {"timestamp": time.monotonic() - 10, "data": cached_data} 
         mock_make_request = mocker.patch.object(scraper, '_make_serpapi_request')
 
         result = scraper.extract_company_data_from_url(url)
@@ -264,8 +390,7 @@ class TestCompanyScraperExtractCompanyData:
         url = "https://linkedin.com/company/expiredco"
         cached_data = {"name": "Expired Co", "linkedin_url": url}
         scraper.cache_expiry_seconds = 1 # Short expiry
-        # Corrected: Use time.time()
-        scraper.cache[url] = {"timestamp": time.time() - 10, "data": cached_data} 
+        scraper.cache[url] = {"timestamp": time.monotonic() - 10, "data": cached_data} 
         
         mock_api_result = {"knowledge_graph": {"title": "Expired Co Fresh"}} # New data from API
         mock_make_request = mocker.patch.object(scraper, '_make_serpapi_request', return_value=mock_api_result)
@@ -317,3 +442,46 @@ class TestCompanyScraperExtractCompanyData:
         
         result = scraper.extract_company_data_from_url(url)
         assert result is None
+
+    def test_extract_data_coalesces_concurrent_requests(self, scraper, mocker):
+        import threading
+        url = "https://linkedin.com/company/concurrentco"
+        release = threading.Event()
+        mock_api_result = {"knowledge_graph": {"title": "Concurrent Co"}}
+
+        def slow_request(*args, **kwargs):
+            release.wait(timeout=5)
+            return mock_api_result
+
+        mock_make_request = mocker.patch.object(scraper, '_make_serpapi_request', side_effect=slow_request)
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(scraper.extract_company_data_from_url(url))) for _ in range(3)]
+        for t in threads:
+            t.start()
+        time.sleep(0.1) # Let all threads reach the fetch/wait point
+        release.set()
+        for t in threads:
+            t.join(timeout=5)
+
+        mock_make_request.assert_called_once_with(query=url, num_results=1)
+        assert len(results) == 3
+        assert all(r['name'] == "Concurrent Co" for r in results)
+        assert scraper._inflight == {}
+
+class TestCompanyScraperDebugDump:
+    def test_dump_results_handles_userdict(self):
+        from collections import UserDict
+        from src.data_acquisition.company_scraper import _dump_results
+        dumped = _dump_results(UserDict({"knowledge_graph": {"title": "Dump Co"}}))
+        assert '"title": "Dump Co"' in dumped
+
+    def test_get_company_info_skips_dump_when_debug_disabled(self, mock_config_manager_with_key, mock_serpapi_client, mocker):
+        scraper = CompanyScraper(config_manager=mock_config_manager_with_key)
+        mock_serpapi_client.search.return_value = {"organic_results": []}
+        mock_dump = mocker.patch('src.data_acquisition.company_scraper._dump_results')
+        mocker.patch('src.data_acquisition.company_scraper.logger.isEnabledFor', return_value=False)
+
+        scraper.get_company_info("Quiet Co")
+
+        mock_dump.assert_not_called()
@@ -3,6 +3,7 @@ import requests
 from unittest.mock import MagicMock, patch, call
 import requests
 import re # Import re
+from concurrent.futures import ThreadPoolExecutor
 
 # Path adjustment
 import sys
@@ -11,7 +12,7 @@ project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
-from src.data_acquisition.linkedin_scraper import LinkedInScraper
+from src.data_acquisition.linkedin_scraper import LinkedInScraper, _default_config, _extract_name_role_company
 from src.config.config_manager import ConfigManager # For spec
 # Use module import for exceptions
 import core.exceptions 
@@ -37,8 +38,8 @@ def mock_config_manager_no_key():
 
 @pytest.fixture
 def mock_requests_get(mocker):
-    # Patch requests.get within the linkedin_scraper module context
-    return mocker.patch('src.data_acquisition.linkedin_scraper.requests.get')
+    # The scraper issues requests through its own requests.Session, so patch Session.get
+    return mocker.patch('src.data_acquisition.linkedin_scraper.requests.Session.get')
 
 # --- Test Class --- 
 
@@ -53,7 +54,13 @@ class TestLinkedInScraperInitialization:
         assert scraper.api_key is None
         # Optionally check logger warning
 
-    def test_init_creates_config_if_none_provided(self, mocker):
+    @pytest.fixture
+    def fresh_default_config(self):
+        _default_config.cache_clear()
+        yield
+        _default_config.cache_clear()
+
+    def test_init_creates_config_if_none_provided(self, mocker, fresh_default_config):
         # Mock the ConfigManager constructor called within __init__
         mock_cm_constructor = mocker.patch('src.data_acquisition.linkedin_scraper.ConfigManager')
         mock_cm_instance = MagicMock(spec=ConfigManager)
@@ -71,6 +78,45 @@ class TestLinkedInScraperInitialization:
         assert scraper.config is mock_cm_instance
         assert scraper.api_key == "key_created_internally"
 
+    def test_default_config_loaded_once(self, mocker, fresh_default_config):
+        mock_cm_constructor = mocker.patch('src.data_acquisition.linkedin_scraper.ConfigManager')
+        mock_cm_constructor.return_value.scraping_api_key = "shared_key"
+
+        first = LinkedInScraper(config_manager=None)
+        second = LinkedInScraper(config_manager=None)
+
+        mock_cm_constructor.assert_called_once()
+        assert first.config is second.config
+
+    def test_init_creates_pooled_session(self, mock_config_manager_with_key):
+        scraper = LinkedInScraper(config_manager=mock_config_manager_with_key)
+        adapter = scraper._session.get_adapter(scraper.base_url)
+        assert adapter.max_retries.total == 0
+        assert scraper._session.headers["Connection"] == "keep-alive"
+
+    def test_context_manager_closes_session(self, mock_config_manager_with_key, mocker):
+        with LinkedInScraper(config_manager=mock_config_manager_with_key) as scraper:
+            mock_close = mocker.patch.object(scraper._session, 'close')
+        mock_close.assert_called_once()
+
+    def test_init_uses_cached_session_when_enabled(self, mock_config_manager_with_key, tmp_path):
+        requests_cache = pytest.importorskip("requests_cache")
+        mock_config_manager_with_key.enable_http_cache = True
+        mock_config_manager_with_key.http_cache_path = str(tmp_path / "serpapi_cache")
+
+        with LinkedInScraper(config_manager=mock_config_manager_with_key) as scraper:
+            assert isinstance(scraper._session, requests_cache.CachedSession)
+            assert "api_key" in scraper._session.settings.ignored_parameters
+            assert scraper._session.get_adapter(scraper.base_url).max_retries.total == 0
+
+    def test_module_import_skips_heavy_optional_dependencies(self):
+        import subprocess
+        src_dir = os.path.join(project_root, 'src')
+        code = ("import sys, data_acquisition.linkedin_scraper; "
+                "print(sorted(m for m in ('selenium', 'bs4', 'requests_cache') if m in sys.modules))")
+        out = subprocess.run([sys.executable, "-c", code], cwd=src_dir, capture_output=True, text=True, check=True)
+        assert out.stdout.strip() == "[]"
+
 class TestLinkedInScraperMakeApiRequest:
     @pytest.fixture
     def scraper(self, mock_config_manager_with_key):
@@ -79,7 +125,7 @@ class TestLinkedInScraperMakeApiRequest:
     def test_make_request_success(self, scraper, mock_requests_get):
         mock_response = MagicMock()
         expected_json = {"search_metadata": {"status": "success"}}
-        mock_response.json.return_value = expected_json
+        mock_response.raw.read.return_value = b'{"search_metadata": {"status": "success"}}'
         mock_response.status_code = 200
         mock_response.raise_for_status = MagicMock() # Mock this so it doesn't raise
         mock_requests_get.return_value = mock_response
@@ -87,8 +133,41 @@ class TestLinkedInScraperMakeApiRequest:
         params = {"q": "test", "api_key": scraper.api_key}
         result = scraper._make_api_request(params, "test success")
         
-        mock_requests_get.assert_called_once_with(scraper.base_url, params=params, timeout=20)
+        mock_requests_get.assert_called_once_with(scraper.base_url, params=params, timeout=20, stream=True)
         assert result == expected_json
+        mock_response.close.assert_called_once()
+
+    def test_make_request_waits_on_rate_limiter(self, mock_config_manager_with_key, mock_requests_get):
+        mock_config_manager_with_key.serpapi_max_qps = 5
+        scraper = LinkedInScraper(config_manager=mock_config_manager_with_key)
+        assert scraper._rate_limiter.rate == 5.0
+        scraper._rate_limiter = MagicMock()
+        mock_response = MagicMock(status_code=200)
+        mock_response.raw.read.return_value = b'{}'
+        mock_requests_get.return_value = mock_response
+
+        scraper._make_api_request({"q": "limited", "api_key": scraper.api_key}, "rate limited")
+
+        scraper._rate_limiter.acquire.assert_called_once()
+
+    def test_rate_limiter_disabled_when_max_qps_is_zero(self, mock_config_manager_with_key):
+        mock_config_manager_with_key.serpapi_max_qps = 0
+        assert LinkedInScraper(config_manager=mock_config_manager_with_key)._rate_limiter is None
+
+    @patch('src.core.retry_utils.time.sleep', return_value=None)
+    def test_make_request_response_too_large(self, mock_sleep, scraper, mock_requests_get, mocker):
+        mocker.patch('src.data_acquisition.linkedin_scraper.MAX_RESPONSE_BYTES', 10)
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.raw.read.return_value = b'{"organic_results": []}'
+        mock_requests_get.return_value = mock_response
+        params = {"q": "test", "api_key": scraper.api_key}
+
+        with pytest.raises(core.exceptions.DataAcquisitionError, match="Response too large"):
+            scraper._make_api_request(params, "test too large")
+
+        mock_response.raw.read.assert_called_with(11, decode_content=True)
+        assert mock_response.close.call_count == mock_requests_get.call_count
 
     def test_make_request_auth_error_401(self, caplog, scraper, mock_requests_get):
         mock_response = MagicMock()
@@ -106,6 +185,29 @@ class TestLinkedInScraperMakeApiRequest:
             assert mock_requests_get.call_count == 1 
             assert "Not retrying authentication errors." in caplog.text
             
+    def test_auth_failure_short_circuits_later_requests(self, scraper, mock_requests_get):
+        mock_response = MagicMock()
+        mock_response.status_code = 401
+        mock_response.raise_for_status.side_effect = requests.exceptions.HTTPError(response=mock_response)
+        mock_requests_get.return_value = mock_response
+        params = {"q": "test", "api_key": scraper.api_key}
+
+        with pytest.raises(core.exceptions.ApiAuthError):
+            scraper._make_api_request(params, "first")
+        with pytest.raises(core.exceptions.ApiAuthError, match="previously failed"):
+            scraper._make_api_request(params, "second")
+        assert mock_requests_get.call_count == 1
+
+        # A new key (or reset_auth) lets requests through again
+        scraper.api_key = "rotated_key"
+        with pytest.raises(core.exceptions.ApiAuthError):
+            scraper._make_api_request({"q": "test", "api_key": scraper.api_key}, "third")
+        assert mock_requests_get.call_count == 2
+        scraper.reset_auth()
+        with pytest.raises(core.exceptions.ApiAuthError):
+            scraper._make_api_request({"q": "test", "api_key": scraper.api_key}, "fourth")
+        assert mock_requests_get.call_count == 3
+
     def test_make_request_auth_error_403(self, caplog, scraper, mock_requests_get):
         mock_response = MagicMock()
         mock_response.status_code = 403
@@ -139,6 +241,21 @@ class TestLinkedInScraperMakeApiRequest:
             assert mock_requests_get.call_count == 4 
             assert "Max retries (3) reached" in caplog.text
 
+    @patch('src.core.retry_utils.time.sleep', return_value=None)
+    def test_make_request_429_carries_retry_after(self, mock_sleep, scraper, mock_requests_get):
+        mock_response = MagicMock()
+        mock_response.status_code = 429
+        mock_response.headers = {"Retry-After": "30"}
+        mock_response.raise_for_status.side_effect = requests.exceptions.HTTPError(response=mock_response)
+        mock_requests_get.return_value = mock_response
+        params = {"q": "test", "api_key": scraper.api_key}
+
+        with pytest.raises(core.exceptions.ApiLimitError) as exc_info:
+            scraper._make_api_request(params, "test 429 retry-after")
+
+        assert exc_info.value.retry_after == 30.0
+        assert all(c.args[0] >= 30.0 for c in mock_sleep.call_args_list)
+
     @patch('src.core.retry_utils.time.sleep', return_value=None)
     def test_make_request_rate_limit_error_429_final(self, mock_sleep, caplog, scraper, mock_requests_get):
         mock_response = MagicMock()
@@ -192,9 +309,7 @@ class TestLinkedInScraperMakeApiRequest:
         mock_response = MagicMock()
         mock_response.status_code = 200
         mock_response.raise_for_status = MagicMock()
-        json_decode_exception = ValueError("Invalid JSON")
-        mock_response.json.side_effect = json_decode_exception
-        mock_response.text = "<html><body>Error</body></html>"
+        mock_response.raw.read.return_value = b"<html><body>Error</body></html>"
         mock_requests_get.return_value = mock_response
         params = {"q": "test", "api_key": scraper.api_key}
         try:
@@ -205,8 +320,60 @@ class TestLinkedInScraperMakeApiRequest:
             assert isinstance(e.original_exception, ValueError)
             # Correct Assertion: Expect 4 calls due to retries
             assert mock_requests_get.call_count == 4 # 1 initial + 3 retries
-            assert mock_response.json.call_count == 4 # 1 initial + 3 retries
             assert "Max retries (3) reached" in caplog.text
+            assert "<html><body>Error</body></html>" in caplog.text
+
+class TestLinkedInScraperRequestCoalescing:
+    @pytest.fixture
+    def scraper(self, mock_config_manager_with_key):
+        return LinkedInScraper(config_manager=mock_config_manager_with_key)
+
+    def test_identical_concurrent_requests_share_one_call(self, scraper, mocker):
+        import threading
+        release = threading.Event()
+        started = threading.Event()
+
+        def slow_fetch(params, request_description):
+            started.set()
+            release.wait(timeout=5)
+            return {"organic_results": []}
+
+        mock_fetch = mocker.patch.object(scraper, '_fetch_api_response', side_effect=slow_fetch)
+        results = []
+        first = threading.Thread(target=lambda: results.append(scraper._make_api_request({"q": "x", "api_key": "k1"}, "first")))
+        first.start()
+        assert started.wait(timeout=5)
+
+        # Note when the second caller starts waiting on the in-flight future
+        joined = threading.Event()
+        pending = next(iter(scraper._inflight.values()))
+        original_result = pending.result
+        def tracking_result(*args, **kwargs):
+            joined.set()
+            return original_result(*args, **kwargs)
+        pending.result = tracking_result
+
+        # Same query with a different api_key joins the in-flight call
+        second = threading.Thread(target=lambda: results.append(scraper._make_api_request({"q": "x", "api_key": "k2"}, "second")))
+        second.start()
+        assert joined.wait(timeout=5)
+        release.set()
+        first.join(timeout=5)
+        second.join(timeout=5)
+
+        assert mock_fetch.call_count == 1
+        assert results == [{"organic_results": []}, {"organic_results": []}]
+        assert scraper._inflight == {}
+
+    def test_failed_request_is_not_remembered(self, scraper, mocker):
+        mock_fetch = mocker.patch.object(scraper, '_fetch_api_response',
+                                         side_effect=[core.exceptions.DataAcquisitionError("boom"), {"ok": True}])
+        params = {"q": "x", "api_key": scraper.api_key}
+
+        with pytest.raises(core.exceptions.DataAcquisitionError):
+            scraper._make_api_request(params, "fails")
+        assert scraper._make_api_request(params, "retry") == {"ok": True}
+        assert mock_fetch.call_count == 2
 
 # --- TODO: Tests for test_api_connection ---
 class TestLinkedInScraperTestApiConnection:
@@ -317,6 +484,32 @@ class TestLinkedInScraperScrapeAlumni:
         call_args = mock_make_request.call_args[0][0] # Get the params dict from the call
         assert call_args['num'] == "100" # Should be capped at 100
 
+    def test_scrape_alumni_pages_beyond_100_results(self, scraper, mocker):
+        def fake_request(params, request_description):
+            start = int(params.get("start", 0))
+            return {"organic_results": [{"n": start + i} for i in range(100)]}
+        mock_make_request = mocker.patch.object(scraper, '_make_api_request', side_effect=fake_request)
+        mock_parse_results = mocker.patch.object(scraper, '_parse_linkedin_results',
+                                                 side_effect=lambda data, source: data["organic_results"])
+
+        result = scraper.scrape_alumni_by_school("Big Uni", max_results=250)
+
+        starts = sorted(c.args[0].get("start", "0") for c in mock_make_request.call_args_list)
+        assert starts == ["0", "100", "200"]
+        assert all(c.args[0]["num"] == "100" for c in mock_make_request.call_args_list)
+        # Pages are merged in order and trimmed to max_results
+        assert [r["n"] for r in result] == list(range(250))
+
+    def test_scrape_alumni_failed_later_page_keeps_first(self, scraper, mocker):
+        first_page = {"organic_results": [{"n": 0}]}
+        mocker.patch.object(scraper, '_make_api_request', side_effect=[
+            first_page, core.exceptions.DataAcquisitionError("page 2 failed")])
+        mocker.patch.object(scraper, '_parse_linkedin_results', side_effect=lambda data, source: data["organic_results"])
+
+        result = scraper.scrape_alumni_by_school("Big Uni", max_results=200)
+
+        assert result == [{"n": 0}]
+
     def test_scrape_alumni_api_error(self, scraper, mocker):
         school_name = "Error University"
         mock_make_request = mocker.patch.object(scraper, '_make_api_request')
@@ -438,6 +631,61 @@ class TestLinkedInScraperScrapePMs:
         mock_parse_results.assert_called_once() 
 
 
+class TestLinkedInScraperBatchScrape:
+    @pytest.fixture
+    def scraper(self, mock_config_manager_with_key):
+        return LinkedInScraper(config_manager=mock_config_manager_with_key)
+
+    def test_scrape_many_schools_preserves_order(self, scraper, mocker):
+        mock_scrape = mocker.patch.object(scraper, 'scrape_alumni_by_school',
+                                          side_effect=lambda school, max_results: [{"lead_name": school}])
+
+        result = scraper.scrape_many_schools(["School A", "School B", "School C"], max_results=10)
+
+        assert list(result) == ["School A", "School B", "School C"]
+        assert result["School B"] == [{"lead_name": "School B"}]
+        assert mock_scrape.call_count == 3
+        mock_scrape.assert_any_call("School A", max_results=10)
+
+    def test_scrape_many_locations_passes_keywords(self, scraper, mocker):
+        mock_scrape = mocker.patch.object(scraper, 'scrape_pms_by_location', return_value=[])
+
+        result = scraper.scrape_many_locations(["NYC", "Boston"], keywords=["PM"])
+
+        assert result == {"NYC": [], "Boston": []}
+        mock_scrape.assert_any_call(location="Boston", keywords=["PM"], max_results=100)
+
+    def test_scrape_many_caps_workers_at_pool_size(self, scraper, mocker):
+        mocker.patch('src.data_acquisition.linkedin_scraper.SESSION_POOL_MAXSIZE', 2)
+        mock_executor = mocker.patch('src.data_acquisition.linkedin_scraper.ThreadPoolExecutor')
+        mock_executor.return_value.__enter__.return_value.map.return_value = [[], [], []]
+
+        scraper.scrape_many_schools(["A", "B", "C"], max_workers=16)
+
+        assert mock_executor.call_args.kwargs["max_workers"] == 2
+
+    def test_scrape_many_fetches_later_pages_sequentially(self, scraper, mocker):
+        mocker.patch.object(scraper, '_make_api_request', side_effect=lambda params, request_description: {
+            "organic_results": [{"school": params["q"], "start": params.get("start", "0")}]})
+        mocker.patch.object(scraper, '_parse_linkedin_results', side_effect=lambda data, source: data["organic_results"])
+        executor_names = []
+        real_executor = ThreadPoolExecutor
+        def tracking_executor(*args, **kwargs):
+            executor_names.append(kwargs.get("thread_name_prefix"))
+            return real_executor(*args, **kwargs)
+        mocker.patch('src.data_acquisition.linkedin_scraper.ThreadPoolExecutor', side_effect=tracking_executor)
+
+        result = scraper.scrape_many_schools(["A", "B"], max_results=300)
+
+        assert executor_names == ["linkedin-scrape"] # No per-search page pool inside batch workers
+        assert [r["start"] for r in result["B"]] == ["0", "100", "200"]
+
+    def test_scrape_many_empty_input(self, scraper, mocker):
+        mock_scrape = mocker.patch.object(scraper, 'scrape_alumni_by_school')
+        assert scraper.scrape_many_schools([]) == {}
+        mock_scrape.assert_not_called()
+
+
 # --- TODO: Tests for _parse_linkedin_results --- 
 from datetime import datetime # Need datetime for date_added assertion
 
@@ -497,6 +745,15 @@ class TestLinkedInScraperParseResults:
         assert len(lead["date_added"]) > 10 
         assert lead["raw_snippet"] == data["organic_results"][0]["snippet"]
 
+    def test_parse_results_share_utc_timestamp(self, scraper):
+        data = {"organic_results": [
+            {"title": "Kim One", "link": "linkedin.com/in/kim", "snippet": ""},
+            {"title": "Lee Two", "link": "linkedin.com/in/lee", "snippet": ""}
+        ]}
+        result = scraper._parse_linkedin_results(data, source="Test Timestamp")
+        assert result[0]["date_added"] == result[1]["date_added"]
+        assert datetime.fromisoformat(result[0]["date_added"]).utcoffset().total_seconds() == 0
+
     def test_parse_results_different_title_formats(self, scraper):
         data = {"organic_results": [
             {"title": "Bob Simple | LinkedIn", "link": "linkedin.com/in/bob", "snippet": "Lead Dev at Startup Inc. Location: SF"},
@@ -533,6 +790,59 @@ class TestLinkedInScraperParseResults:
         assert lead["location"] == "Remote"
         assert "Test University" in lead["alma_mater_match"]
 
+    def test_parse_results_uppercase_at_separator(self, scraper):
+        data = {"organic_results": [
+            {"title": "Jack Caps - Founder AT Loud Co", "link": "linkedin.com/in/jack", "snippet": ""}
+        ]}
+        result = scraper._parse_linkedin_results(data, source="Test Caps")
+        assert result[0]["current_role"] == "Founder"
+        assert result[0]["company_name"] == "Loud Co"
+
+    def test_parse_results_role_company_with_non_ascii_title(self, scraper):
+        data = {"organic_results": [
+            {"title": "Ayşe Kaya - İnşaat Engineer at Acme", "link": "linkedin.com/in/ayse", "snippet": ""}
+        ]}
+        result = scraper._parse_linkedin_results(data, source="Test Unicode")
+        # 'İ' lowercases to two code points, which would shift indices found on a lowered copy
+        assert result[0]["current_role"] == "İnşaat Engineer"
+        assert result[0]["company_name"] == "Acme"
+
+    def test_parse_results_memoizes_title_heuristics(self, scraper):
+        _extract_name_role_company.cache_clear()
+        result = {"title": "Ivy Repeat - Analyst at Firm", "link": "linkedin.com/in/ivy", "snippet": ""}
+        # The same profile showing up on two result pages is only parsed once
+        leads = scraper._parse_linkedin_results({"organic_results": [result, dict(result)]}, source="Test Memo")
+        assert [lead["company_name"] for lead in leads] == ["Firm", "Firm"]
+        info = _extract_name_role_company.cache_info()
+        assert (info.hits, info.misses) == (1, 1)
+
+    def test_parse_results_prefers_rich_snippet_fields(self, scraper):
+        data = {"organic_results": [{
+            "title": "Gina Rich - Something Vague",
+            "link": "linkedin.com/in/gina",
+            "snippet": "Boston, MA · Engineer at Wrong Co",
+            "rich_snippet": {"top": {
+                "extensions": ["San Francisco Bay Area", "Product Manager at Acme", "500+ connections"],
+                "detected_extensions": {"location": "San Francisco Bay Area"},
+            }},
+        }]}
+        result = scraper._parse_linkedin_results(data, source="Test Rich Snippet")
+        assert result[0]["current_role"] == "Product Manager"
+        assert result[0]["company_name"] == "Acme"
+        assert result[0]["location"] == "San Francisco Bay Area"
+
+    def test_parse_results_rich_snippet_without_role_falls_back(self, scraper):
+        data = {"organic_results": [{
+            "title": "Hal Partial - Designer at Studio",
+            "link": "linkedin.com/in/hal",
+            "snippet": "",
+            "rich_snippet": {"top": {"detected_extensions": {"location": "Berlin"}}},
+        }]}
+        result = scraper._parse_linkedin_results(data, source="Test Partial Rich Snippet")
+        assert result[0]["current_role"] == "Designer"
+        assert result[0]["company_name"] == "Studio"
+        assert result[0]["location"] == "Berlin"
+
     def test_parse_results_no_location_in_snippet(self, scraper):
          data = {"organic_results": [
             {"title": "Eve NoLoc - Freelancer", "link": "linkedin.com/in/eve", "snippet": "Doing cool things."}
@@ -551,6 +861,47 @@ class TestLinkedInScraperParseResults:
          assert "Tech Institute" in result[0]["alma_mater_match"]
          assert len(result[0]["alma_mater_match"]) == 2
 
+    def test_parse_school_match_is_whole_word(self, mock_config_manager_no_key):
+        mock_config_manager_no_key.target_schools = ["MIT", "St. John's U."]
+        scraper = LinkedInScraper(config_manager=mock_config_manager_no_key)
+        data = {"organic_results": [
+            {"title": "Hank - Committee Member", "link": "linkedin.com/in/hank", "snippet": "Studied at St. John's U. in Queens"}
+        ]}
+        result = scraper._parse_linkedin_results(data, source="Test Whole Word")
+        # "MIT" inside "Committee" must not count as a match
+        assert result[0]["alma_mater_match"] == ["St. John's U."]
+
+    def test_parse_school_match_regex_fallback(self, mock_config_manager_no_key, mocker):
+        # Same whole-word semantics when pyahocorasick isn't installed
+        mocker.patch('src.data_acquisition.linkedin_scraper.ahocorasick', None)
+        mock_config_manager_no_key.target_schools = ["MIT", "Test University", "Tech Institute"]
+        scraper = LinkedInScraper(config_manager=mock_config_manager_no_key)
+        data = {"organic_results": [
+            {"title": "Ivy - Committee Chair", "link": "linkedin.com/in/ivy", "snippet": "Tech Institute and Test University alum"}
+        ]}
+        result = scraper._parse_linkedin_results(data, source="Test Regex Fallback")
+        assert result[0]["alma_mater_match"] == ["Test University", "Tech Institute"]
+
+    def test_parse_school_match_follows_target_school_changes(self, mock_config_manager_no_key):
+        mock_config_manager_no_key.target_schools = ["MIT"]
+        scraper = LinkedInScraper(config_manager=mock_config_manager_no_key)
+        data = {"organic_results": [
+            {"title": "Kim - Engineer", "link": "linkedin.com/in/kim", "snippet": "MIT and Tech Institute alum"}
+        ]}
+        assert scraper._parse_linkedin_results(data, source="Before")[0]["alma_mater_match"] == ["MIT"]
+
+        mock_config_manager_no_key.target_schools = ["Tech Institute"]
+        assert scraper._parse_linkedin_results(data, source="After")[0]["alma_mater_match"] == ["Tech Institute"]
+
+    def test_parse_school_match_is_case_folded(self, mock_config_manager_no_key):
+        mock_config_manager_no_key.target_schools = ["Universität Straße"]
+        scraper = LinkedInScraper(config_manager=mock_config_manager_no_key)
+        data = {"organic_results": [
+            {"title": "Jo Berg - Analyst", "link": "linkedin.com/in/jo", "snippet": "Alumna of UNIVERSITÄT STRASSE"}
+        ]}
+        result = scraper._parse_linkedin_results(data, source="Test Casefold")
+        assert result[0]["alma_mater_match"] == ["Universität Straße"]
+
     def test_parse_no_school_match(self, scraper):
         data = {"organic_results": [
             {"title": "Grace NoSchool", "link": "linkedin.com/in/grace", "snippet": "Went to Other University"}
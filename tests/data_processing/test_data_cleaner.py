@@ -7,7 +7,8 @@ from src.data_processing.data_cleaner import (
     normalize_location,
     clean_lead_data,
     clean_company_data,
-    clean_job_posting_data
+    clean_job_posting_data,
+    clean_leads_bulk,
 )
 
 # Tests for normalize_whitespace
@@ -21,10 +22,17 @@ from src.data_processing.data_cleaner import (
     (" leading", "leading"),
     ("trailing ", "trailing"),
     ("many    spaces    between", "many spaces between"),
+    ("tab\tseparated", "tab separated"),
+    ("line\nbreak", "line break"),
+    ("non\u00a0breaking", "non breaking"),
 ])
 def test_normalize_whitespace(input_text, expected_output):
     assert normalize_whitespace(input_text) == expected_output
 
+def test_normalize_whitespace_returns_clean_text_unchanged():
+    clean = "".join(["Already", " clean ", "text"]) # Built at runtime so it isn't an interned constant
+    assert normalize_whitespace.__wrapped__(clean) is clean
+
 # Tests for normalize_company_name
 @pytest.mark.parametrize("input_name, expected_output", [
     ("Example Corp.", "Example"),
@@ -65,6 +73,13 @@ def test_normalize_whitespace(input_text, expected_output):
 def test_normalize_company_name(input_name, expected_output):
     assert normalize_company_name(input_name) == expected_output
 
+def test_normalize_company_name_is_memoized():
+    normalize_company_name.cache_clear()
+    assert normalize_company_name("Memo Corp.") == "Memo"
+    assert normalize_company_name("Memo Corp.") == "Memo"
+    info = normalize_company_name.cache_info()
+    assert (info.hits, info.misses) == (1, 1)
+
 # Test case where removing suffix results in empty string, should return original cleaned name
 # @pytest.mark.parametrize("input_name, expected_output", [
 #     ("Inc.", "Inc."), # Should return original cleaned if suffix only makes it empty
@@ -128,6 +143,17 @@ def test_clean_lead_data(input_data, expected_output):
     for key in cleaned:
         assert key in expected_output
 
+def test_clean_leads_bulk_matches_single_record_cleaning():
+    leads = [
+        {"name": "  John Doe  ", "email": " JOHN.DOE@example.com  ", "company_name": "Example, Inc. "},
+        {"name": "Jane Smith", "email": None, "location": " Paris "},
+        {},
+    ]
+    cleaned = clean_leads_bulk(leads)
+    assert cleaned == [clean_lead_data(lead) for lead in leads]
+    assert cleaned[1]["email"] == ""
+    assert leads[0]["name"] == "  John Doe  " # Inputs are not mutated
+
 # Tests for clean_company_data
 @pytest.mark.parametrize("input_data, expected_output", [
     (
@@ -5,7 +5,7 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.exc import SQLAlchemyError
 
-from src.database.db_manager import DatabaseManager
+from src.database.db_manager import DatabaseManager, _engine_options
 # Assuming ConfigManager is in src.config.config_manager
 # For testing, we create a mock ConfigManager directly
 
@@ -26,7 +26,7 @@ class TestDatabaseManagerInitialization:
 
         db_manager = DatabaseManager(config=mock_config)
 
-        mock_create_engine.assert_called_once_with(mock_config.db_path)
+        mock_create_engine.assert_called_once_with(mock_config.db_path, **_engine_options(mock_config.db_path))
         assert db_manager.engine is mock_engine_instance
         mock_sessionmaker.assert_called_once_with(autocommit=False, autoflush=False, bind=mock_engine_instance)
         assert db_manager.Session is mock_session_factory_instance
@@ -39,7 +39,7 @@ class TestDatabaseManagerInitialization:
             db_manager = DatabaseManager(config=mock_config) 
         
         # Assertions after the expected exception
-        mock_create_engine_fails.assert_called_once_with(mock_config.db_path)
+        mock_create_engine_fails.assert_called_once_with(mock_config.db_path, **_engine_options(mock_config.db_path))
         # db_manager instance might not be fully assigned if __init__ raised early
         # Can't reliably check db_manager.engine is None here.
 
@@ -52,10 +52,68 @@ class TestDatabaseManagerInitialization:
         with pytest.raises(ConnectionError, match="Unexpected database initialization error: Sessionmaker failed"):
             DatabaseManager(config=mock_config)
 
-        mock_create_engine_success.assert_called_once_with(mock_config.db_path)
+        mock_create_engine_success.assert_called_once_with(mock_config.db_path, **_engine_options(mock_config.db_path))
         mock_sessionmaker_fails.assert_called_once_with(autocommit=False, autoflush=False, bind=mock_engine_instance)
         # db_manager instance won't be fully initialized, so can't check db_manager.engine / .Session here
 
+    def test_engine_options_for_server_databases_tune_pool(self):
+        options = _engine_options("postgresql://user:pw@localhost/leads")
+        assert options["pool_pre_ping"] is True
+        assert options["pool_size"] > 5
+        assert "connect_args" not in options
+
+    @pytest.mark.parametrize("db_url, batch_mode", [
+        ("postgresql+psycopg2://user:pw@localhost/leads", True),
+        ("postgresql+psycopg://user:pw@localhost/leads", False), # psycopg 3 has no executemany_mode
+    ])
+    def test_engine_options_for_postgresql_batch_executemany(self, db_url, batch_mode):
+        options = _engine_options(db_url)
+        assert options["insertmanyvalues_page_size"] == 1000
+        assert (options.get("executemany_mode") == "values_plus_batch") is batch_mode
+
+    def test_engine_options_for_sqlite_keep_executemany_defaults(self):
+        options = _engine_options("sqlite:///leads.db")
+        assert "insertmanyvalues_page_size" not in options
+        assert "executemany_mode" not in options
+
+    def test_memory_sqlite_is_shared_across_threads(self, mock_config):
+        import threading
+        from sqlalchemy import text
+        db_manager = DatabaseManager(config=mock_config)
+        with db_manager.engine.begin() as conn:
+            conn.execute(text("CREATE TABLE t (x INTEGER)"))
+            conn.execute(text("INSERT INTO t VALUES (1)"))
+
+        rows = []
+        def read_from_other_thread():
+            with db_manager.engine.connect() as conn:
+                rows.extend(conn.execute(text("SELECT x FROM t")).scalars())
+        worker = threading.Thread(target=read_from_other_thread)
+        worker.start()
+        worker.join()
+        assert rows == [1]
+
+    def test_file_sqlite_uses_wal_journal(self, tmp_path):
+        from sqlalchemy import text
+        config = MagicMock()
+        config.db_path = f"sqlite:///{tmp_path / 'leads.db'}"
+        config.sqlite_wal = True
+        db_manager = DatabaseManager(config=config)
+        with db_manager.engine.connect() as conn:
+            assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        db_manager.engine.dispose()
+
+    def test_file_sqlite_keeps_default_journal_unless_wal_enabled(self, tmp_path):
+        from sqlalchemy import text
+        config = MagicMock()
+        config.db_path = f"sqlite:///{tmp_path / 'leads.db'}"
+        config.sqlite_wal = False
+        db_manager = DatabaseManager(config=config)
+        with db_manager.engine.connect() as conn:
+            assert conn.execute(text("PRAGMA journal_mode")).scalar() == "delete"
+        db_manager.engine.dispose()
+        assert not (tmp_path / 'leads.db-wal').exists()
+
 # Tests for initialize_database
 class TestInitializeDatabase:
     @patch('src.database.db_manager.Base.metadata.create_all')
@@ -68,6 +126,21 @@ class TestInitializeDatabase:
         
         mock_create_all.assert_called_once_with(db_manager.engine)
 
+    def test_initialize_database_adds_missing_indexes(self, tmp_path):
+        from sqlalchemy import inspect, text
+        config = MagicMock()
+        config.db_path = f"sqlite:///{tmp_path / 'leads.db'}"
+        db_manager = DatabaseManager(config=config)
+        db_manager.initialize_database()
+        with db_manager.engine.begin() as conn: # Simulate a database created before the index existed
+            conn.execute(text("DROP INDEX ix_job_applications_job_lead"))
+
+        db_manager.initialize_database()
+
+        index_names = [index['name'] for index in inspect(db_manager.engine).get_indexes('job_applications')]
+        assert 'ix_job_applications_job_lead' in index_names
+        db_manager.engine.dispose()
+
     def test_initialize_database_no_engine(self, mock_config):
         db_manager = DatabaseManager(config=mock_config)
         db_manager.engine = None # Explicitly set engine to None
@@ -247,6 +320,80 @@ class TestManagedSession:
         mock_get_session_method.assert_called_once()
         # commit, rollback, close on the session instance should not be called as session was never obtained.
 
+# Tests for bulk_insert
+class TestBulkInsert:
+    def test_bulk_insert_rows_in_chunks(self, mock_config):
+        from src.database.models import Lead, LeadStatus
+        db_manager = DatabaseManager(config=mock_config)
+        db_manager.initialize_database()
+        rows = [{"name": f"Lead {i}", "email": f"lead{i}@example.com", "status": LeadStatus.NEW} for i in range(5)]
+
+        with patch.object(db_manager, 'get_session', wraps=db_manager.get_session) as mock_get_session, \
+             patch('src.database.db_manager.insert', wraps=__import__('sqlalchemy').insert) as mock_insert:
+            assert db_manager.bulk_insert(Lead, rows, chunk_size=2) == 5
+
+        mock_get_session.assert_called_once() # One transaction
+        assert mock_insert.call_count == 3 # 2 + 2 + 1 rows
+        with db_manager.managed_session() as session:
+            stored = session.query(Lead).order_by(Lead.id).all()
+            assert [lead.name for lead in stored] == [row["name"] for row in rows]
+            assert all(lead.created_at is not None for lead in stored) # Column defaults applied
+
+    def test_bulk_insert_empty_rows_skips_session(self, mock_config):
+        db_manager = DatabaseManager(config=mock_config)
+        with patch.object(db_manager, 'managed_session') as mock_managed_session:
+            assert db_manager.bulk_insert(MagicMock(), []) == 0
+        mock_managed_session.assert_not_called()
+
+    @pytest.mark.parametrize("chunk_size", [0, -1])
+    def test_bulk_insert_rejects_invalid_chunk_size(self, mock_config, chunk_size):
+        db_manager = DatabaseManager(config=mock_config)
+        with patch.object(db_manager, 'managed_session') as mock_managed_session:
+            with pytest.raises(ValueError, match="chunk_size"):
+                db_manager.bulk_insert(MagicMock(), [{"name": "A"}], chunk_size=chunk_size)
+        mock_managed_session.assert_not_called()
+
+# Tests for the persistent company URL cache
+class TestCompanyUrlCache:
+    def test_cache_roundtrip_and_refresh(self, mock_config):
+        db_manager = DatabaseManager(config=mock_config)
+        db_manager.initialize_database()
+        assert db_manager.get_cached_company_url("acme", max_age_seconds=60) is None
+
+        db_manager.cache_company_url("acme", "https://linkedin.com/company/acme")
+        db_manager.cache_company_url("acme", "https://linkedin.com/company/acme-corp") # Upsert, not a duplicate key
+        assert db_manager.get_cached_company_url("acme", max_age_seconds=60) == "https://linkedin.com/company/acme-corp"
+
+    def test_expired_entry_is_a_miss(self, mock_config):
+        db_manager = DatabaseManager(config=mock_config)
+        db_manager.initialize_database()
+        with patch('src.database.db_manager.time.time', return_value=1000.0):
+            db_manager.cache_company_url("acme", "https://linkedin.com/company/acme")
+        with patch('src.database.db_manager.time.time', return_value=1100.0):
+            assert db_manager.get_cached_company_url("acme", max_age_seconds=200) == "https://linkedin.com/company/acme"
+            assert db_manager.get_cached_company_url("acme", max_age_seconds=50) is None
+
+# Tests for the persistent company details cache
+class TestCompanyDetailsCache:
+    def test_cache_roundtrip_and_refresh(self, mock_config):
+        db_manager = DatabaseManager(config=mock_config)
+        db_manager.initialize_database()
+        url = "https://linkedin.com/company/acme"
+        assert db_manager.get_cached_company_details(url, max_age_seconds=60) is None
+
+        db_manager.cache_company_details(url, {"name": "Acme", "size": "11-50"})
+        db_manager.cache_company_details(url, {"name": "Acme", "size": "51-200"}) # Replaces the row
+        assert db_manager.get_cached_company_details(url, max_age_seconds=60) == {"name": "Acme", "size": "51-200"}
+
+    def test_expired_entry_is_a_miss(self, mock_config):
+        db_manager = DatabaseManager(config=mock_config)
+        db_manager.initialize_database()
+        url = "https://linkedin.com/company/acme"
+        with patch('src.database.db_manager.time.time', return_value=1000.0):
+            db_manager.cache_company_details(url, {"name": "Acme"})
+        with patch('src.database.db_manager.time.time', return_value=1100.0):
+            assert db_manager.get_cached_company_details(url, max_age_seconds=50) is None
+
 # TODO: Add tests for managed_session
 
 # TODO: Add test cases for DatabaseManager 
\ No newline at end of file
@@ -1,16 +1,18 @@
 # Initial test file for db_utils.py
 import pytest
 from unittest.mock import MagicMock, patch
-from sqlalchemy.exc import IntegrityError, SQLAlchemyError
-from sqlalchemy import asc, desc # Required for tests involving order_by
+from sqlalchemy.exc import IntegrityError, InvalidRequestError, SQLAlchemyError
+from sqlalchemy import asc, desc, create_engine, event, select # asc/desc required for tests involving order_by
+from sqlalchemy.orm import sessionmaker
+import contextlib
 import datetime # Import datetime
 
 from src.database.db_utils import (
-    create_entity, get_entity, get_entities, update_entity, delete_entity,
-    add_lead_to_job_posting, remove_lead_from_job_posting, 
-    get_lead_applications, get_job_applicants
+    create_entity, create_entity_nc, update_entity_nc, bulk_upsert, bulk_create_entities, get_entity, get_entities, get_entities_by_ids, get_entities_iter, update_entity, delete_entity,
+    add_lead_to_job_posting, add_leads_to_job_postings, remove_lead_from_job_posting, 
+    get_lead_applications, get_job_applicants, query_leads_with_applications
 )
-from src.database.models import Lead, Company, JobPosting, LeadStatus # Using actual models for type hints and structure
+from src.database.models import Base, Lead, Company, JobPosting, LeadStatus, job_applications # Using actual models for type hints and structure
 from src.core.exceptions import DataProcessingError
 
 # Mock for a generic SQLAlchemy model instance for testing
@@ -49,12 +51,22 @@ class TestCreateEntity:
         
         mock_db_session.add.assert_called_once() # Check that add was called with an instance of Lead
         mock_db_session.commit.assert_called_once()
-        mock_db_session.refresh.assert_called_once_with(mock_db_session.add.call_args[0][0])
+        mock_db_session.refresh.assert_not_called() # Reloaded lazily on access unless refresh=True
         
         assert created_lead is not None
         assert created_lead.name == lead_data["name"]
         # For this test, we assume db_utils.create_entity handles instantiation correctly
 
+    def test_create_entity_refresh_opt_in(self, mock_db_session):
+        created_company = create_entity(mock_db_session, Company, {"name": "Test Co"}, refresh=True)
+        mock_db_session.refresh.assert_called_once_with(created_company)
+
+    def test_create_entity_sqlite_lazy_reload(self, sqlite_session):
+        company = create_entity(sqlite_session, Company, {"name": "Test Co"})
+        with count_selects(sqlite_session) as selects:
+            assert company.id is not None and company.created_at is not None
+        assert len(selects) == 1 # The expired entity reloads on first access
+
     @patch('src.database.db_utils.logger')
     def test_create_entity_integrity_error(self, mock_logger, mock_db_session):
         lead_data = {"name": "Fail Lead"}
@@ -81,57 +93,71 @@ class TestCreateEntity:
         assert "Unexpected error creating Lead: unexpected db error" in str(exc_info.value)
         mock_logger.error.assert_called_once()
 
+# Tests for bulk_create_entities
+class TestBulkCreateEntities:
+    def test_bulk_create_entities_pages_rows_and_commits_once(self, mock_db_session):
+        rows = ({"name": f"Lead {i}", "status": LeadStatus.NEW} for i in range(5)) # Any iterable
+
+        assert bulk_create_entities(mock_db_session, Lead, rows, page_size=2) == 5
+
+        assert [len(call.args[1]) for call in mock_db_session.execute.call_args_list] == [2, 2, 1]
+        mock_db_session.commit.assert_called_once()
+        mock_db_session.add.assert_not_called() # No per-row ORM adds
+        mock_db_session.refresh.assert_not_called()
+
+    def test_bulk_create_entities_empty(self, mock_db_session):
+        assert bulk_create_entities(mock_db_session, Lead, []) == 0
+        mock_db_session.execute.assert_not_called()
+        mock_db_session.commit.assert_not_called()
+
+    def test_bulk_create_entities_integrity_error(self, mock_db_session):
+        mock_db_session.execute.side_effect = IntegrityError("mocked error", params=None, orig=None)
+
+        with pytest.raises(DataProcessingError, match="Database integrity error bulk creating Lead"):
+            bulk_create_entities(mock_db_session, Lead, [{"name": "Dup"}])
+        mock_db_session.rollback.assert_called_once()
+        mock_db_session.commit.assert_not_called()
+
+def executed_statement(mock_db_session):
+    """The statement passed to the (single) mock session.execute call."""
+    mock_db_session.execute.assert_called_once()
+    return mock_db_session.execute.call_args[0][0]
+
 # Tests for get_entity
 class TestGetEntity:
     def test_get_entity_found(self, mock_db_session):
         entity_id = 1
         mock_entity_instance = MockBaseModel(id=entity_id, name="Found Entity")
-        
-        # Configure the mock query chain
-        mock_query = mock_db_session.query.return_value
-        mock_filter = mock_query.filter.return_value
-        mock_filter.first.return_value = mock_entity_instance
+        mock_db_session.execute.return_value.scalar_one_or_none.return_value = mock_entity_instance
         
         # Using Company as a concrete model type for the test, could be any model
         retrieved_entity = get_entity(mock_db_session, Company, entity_id)
         
-        mock_db_session.query.assert_called_once_with(Company)
-        # Check that filter was called with an expression comparing Company.id to entity_id
-        # This is a bit tricky to assert perfectly without inspecting the SQL expression object.
-        # A common way is to check that filter was called, and trust SQLAlchemy if the construction was right.
-        mock_query.filter.assert_called_once()
-        # We can check the `model.id == entity_id` part more indirectly by ensuring `first` was called on the result of `filter`
-        mock_filter.first.assert_called_once()
+        assert executed_statement(mock_db_session).compare(select(Company).where(Company.id == entity_id))
         assert retrieved_entity is mock_entity_instance
 
     def test_get_entity_not_found(self, mock_db_session):
         entity_id = 2
-        mock_query = mock_db_session.query.return_value
-        mock_filter = mock_query.filter.return_value
-        mock_filter.first.return_value = None # Simulate not found
+        mock_db_session.execute.return_value.scalar_one_or_none.return_value = None # Simulate not found
         
         retrieved_entity = get_entity(mock_db_session, Company, entity_id)
         
-        mock_db_session.query.assert_called_once_with(Company)
-        mock_query.filter.assert_called_once()
-        mock_filter.first.assert_called_once()
+        assert executed_statement(mock_db_session).compare(select(Company).where(Company.id == entity_id))
         assert retrieved_entity is None
 
     def test_get_entity_sqlalchemy_error(self, mock_db_session):
         entity_id = 3
-        mock_db_session.query.side_effect = SQLAlchemyError("DB error during query")
+        mock_db_session.execute.side_effect = SQLAlchemyError("DB error during query")
         
         retrieved_entity = get_entity(mock_db_session, Company, entity_id)
         
-        mock_db_session.query.assert_called_once_with(Company)
+        mock_db_session.execute.assert_called_once()
         assert retrieved_entity is None
 
     def test_get_entity_unexpected_error(self, mock_db_session):
         entity_id = 4
-        # Simulate an error deeper in the query chain if query() itself doesn't fail
-        mock_query = mock_db_session.query.return_value
-        mock_filter = mock_query.filter.return_value
-        mock_filter.first.side_effect = Exception("Unexpected processing error")
+        # Simulate an error while fetching the result rather than in execute() itself
+        mock_db_session.execute.return_value.scalar_one_or_none.side_effect = Exception("Unexpected processing error")
 
         retrieved_entity = get_entity(mock_db_session, Company, entity_id)
         assert retrieved_entity is None
@@ -140,160 +166,178 @@ class TestGetEntity:
 class TestGetEntities:
     def test_get_entities_basic(self, mock_db_session):
         mock_entities = [MockBaseModel(id=1), MockBaseModel(id=2)]
-        mock_query = mock_db_session.query.return_value
-        mock_offset = mock_query.offset.return_value
-        mock_limit = mock_offset.limit.return_value
-        mock_limit.all.return_value = mock_entities
+        mock_db_session.execute.return_value.scalars.return_value.all.return_value = mock_entities
         
         # Using Lead as a concrete model type
         entities = get_entities(mock_db_session, Lead)
         
-        mock_db_session.query.assert_called_once_with(Lead)
-        mock_query.offset.assert_called_once_with(0) # Default skip
-        mock_offset.limit.assert_called_once_with(100) # Default limit
-        mock_limit.all.assert_called_once()
+        # Default skip and limit
+        assert executed_statement(mock_db_session).compare(select(Lead).offset(0).limit(100))
         assert entities == mock_entities
 
     def test_get_entities_with_filters(self, mock_db_session):
-        mock_query = mock_db_session.query.return_value
-        # Make filter itself return the mock_query to allow chaining of filters
-        mock_query.filter.return_value = mock_query 
-        mock_offset = mock_query.offset.return_value
-        mock_limit = mock_offset.limit.return_value
-        mock_limit.all.return_value = [MockBaseModel(id=1, name="Filtered Lead")]
+        mock_db_session.execute.return_value.scalars.return_value.all.return_value = [MockBaseModel(id=1, name="Filtered Lead")]
 
         filters = {"name": "Filtered Lead", "status__ilike": "%active%", "non_existent_attr": "value"}
         
         entities = get_entities(mock_db_session, Lead, filters=filters)
         
-        mock_db_session.query.assert_called_once_with(Lead)
-        # Assert filter was called for 'name' and 'status__ilike'
-        # This requires checking the call_args_list or using more specific mock setups for each filter call if needed
-        assert mock_query.filter.call_count == 2 
-        # Example of checking one specific call (order might vary)
-        # Difficult to assert specific filter expressions directly without deeper inspection or helper mocks
-        # For now, checking call_count implies it attempted to apply existing attribute filters.
-
-        mock_query.offset.assert_called_once_with(0)
-        mock_offset.limit.assert_called_once_with(100)
-        mock_limit.all.assert_called_once()
+        # Filters on existing attributes applied, the non-existent one ignored
+        expected = select(Lead).where(Lead.name == "Filtered Lead").where(Lead.status.ilike("%active%")).offset(0).limit(100)
+        assert executed_statement(mock_db_session).compare(expected)
         assert len(entities) == 1
         assert entities[0].name == "Filtered Lead"
 
     def test_get_entities_with_sorting(self, mock_db_session):
-        # Mock the query chain more directly
-        mock_query_obj = MagicMock() # Represents the Query object
-        mock_db_session.query.return_value = mock_query_obj
-        mock_query_obj.filter.return_value = mock_query_obj # filter returns self for chaining
-        mock_query_obj.order_by.return_value = mock_query_obj # order_by returns self
-        mock_query_obj.offset.return_value = mock_query_obj # offset returns self
-        mock_query_obj.limit.return_value = mock_query_obj # limit returns self
-        mock_query_obj.all.return_value = [Lead(name="Sorted Lead")]
+        mock_db_session.execute.return_value.scalars.return_value.all.return_value = [Lead(name="Sorted Lead")]
 
         leads = get_entities(mock_db_session, Lead, filters={}, order_by_column=Lead.name, sort_direction='asc')
 
-        mock_db_session.query.assert_called_once_with(Lead)
-        mock_query_obj.filter.assert_not_called() # Changed from assert_called_once_with()
-        mock_query_obj.order_by.assert_called_once() # Called once after query (since no filter)
-        args, _ = mock_query_obj.order_by.call_args
-        assert args[0].compare(Lead.name.asc()) # Check the SQLAlchemy expression
-
-        mock_query_obj.offset.assert_called_once_with(0)
-        mock_query_obj.limit.assert_called_once_with(100) # Default limit
-        mock_query_obj.all.assert_called_once()
+        assert executed_statement(mock_db_session).compare(select(Lead).order_by(Lead.name.asc()).offset(0).limit(100))
         assert len(leads) == 1
         assert leads[0].name == "Sorted Lead"
 
     def test_get_entities_desc_sorting(self, mock_db_session):
-        # Similar simplified setup
-        mock_query_obj = MagicMock()
-        mock_db_session.query.return_value = mock_query_obj
-        mock_query_obj.filter.return_value = mock_query_obj
-        mock_query_obj.order_by.return_value = mock_query_obj
-        mock_query_obj.offset.return_value = mock_query_obj
-        mock_query_obj.limit.return_value = mock_query_obj
-        mock_query_obj.all.return_value = [Lead(name="Sorted Desc Lead")]
-
         get_entities(mock_db_session, Lead, filters={}, order_by_column=Lead.name, sort_direction='desc')
         
-        mock_db_session.query.assert_called_once_with(Lead) # Ensure query reset if needed
-        mock_query_obj.filter.assert_not_called() # Changed from assert_called_once_with()
-        mock_query_obj.order_by.assert_called_once() 
-        args, _ = mock_query_obj.order_by.call_args
-        assert args[0].compare(Lead.name.desc())
-        mock_query_obj.offset.assert_called_once_with(0)
-        mock_query_obj.limit.assert_called_once_with(100)
-        mock_query_obj.all.assert_called_once()
+        assert executed_statement(mock_db_session).compare(select(Lead).order_by(Lead.name.desc()).offset(0).limit(100))
 
     def test_get_entities_with_pagination(self, mock_db_session):
-        mock_query = mock_db_session.query.return_value
-        mock_offset = mock_query.offset.return_value
-        mock_limit = mock_offset.limit.return_value
-        mock_limit.all.return_value = [MockBaseModel(id=1)]
-        
         skip, limit = 10, 50
         get_entities(mock_db_session, Lead, skip=skip, limit=limit)
         
-        mock_query.offset.assert_called_once_with(skip)
-        mock_offset.limit.assert_called_once_with(limit)
+        assert executed_statement(mock_db_session).compare(select(Lead).offset(skip).limit(limit))
 
     def test_get_entities_sqlalchemy_error(self, mock_db_session):
-        mock_db_session.query.side_effect = SQLAlchemyError("DB error")
+        mock_db_session.execute.side_effect = SQLAlchemyError("DB error")
         entities = get_entities(mock_db_session, Lead)
         assert entities == []
 
     def test_get_entities_unexpected_error(self, mock_db_session):
-        mock_query = mock_db_session.query.return_value
-        mock_query.offset.side_effect = Exception("Unexpected error")
+        mock_db_session.execute.return_value.scalars.side_effect = Exception("Unexpected error")
         entities = get_entities(mock_db_session, Lead)
         assert entities == []
 
     def test_get_entities_filter_none_value(self, mock_db_session):
-        mock_query = mock_db_session.query.return_value
-        mock_offset = mock_query.offset.return_value
-        mock_limit = mock_offset.limit.return_value
-        mock_limit.all.return_value = []
-
         filters = {"name": None} # Filter with None value should be skipped
         get_entities(mock_db_session, Lead, filters=filters)
-        mock_query.filter.assert_not_called() # filter should not be called for None value
+        assert executed_statement(mock_db_session).compare(select(Lead).offset(0).limit(100))
+
+    def test_get_entities_sqlite(self, sqlite_session):
+        for name in ("Bravo", "Alpha", "Charlie"):
+            create_entity(sqlite_session, Company, {"name": name, "industry": "Tech" if name != "Bravo" else "Retail"})
+
+        companies = get_entities(sqlite_session, Company, filters={"industry": "Tech"}, order_by_column=Company.name, sort_direction='desc')
+        assert [company.name for company in companies] == ["Charlie", "Alpha"]
+        assert [c.name for c in get_entities(sqlite_session, Company, filters={"name__ilike": "%RAV%"})] == ["Bravo"]
+
+    def test_get_entities_as_dict(self, sqlite_session):
+        for name in ("Bravo", "Alpha"):
+            create_entity(sqlite_session, Company, {"name": name})
+        sqlite_session.expunge_all()
+
+        rows = get_entities(sqlite_session, Company, order_by_column='name', as_dict=True)
+
+        assert [row["name"] for row in rows] == ["Alpha", "Bravo"]
+        assert set(rows[0].keys()) == set(Company.__table__.c.keys())
+        assert len(sqlite_session.identity_map) == 0 # No ORM instances were built
+
+    def test_get_entities_iter(self, sqlite_session):
+        for name in ("Bravo", "Alpha", "Charlie"):
+            create_entity(sqlite_session, Company, {"name": name, "industry": "Tech" if name != "Bravo" else "Retail"})
+
+        companies = get_entities_iter(sqlite_session, Company, filters={"industry": "Tech"}, chunk_size=1)
+
+        assert next(companies).name == "Alpha" # Lazily fetched, in ID order
+        assert [company.name for company in companies] == ["Charlie"]
+
+    def test_get_entities_iter_sqlalchemy_error(self, mock_db_session):
+        mock_db_session.execute.side_effect = SQLAlchemyError("DB error")
+        assert list(get_entities_iter(mock_db_session, Company)) == []
+
+    def test_get_entities_columns_as_dict(self, sqlite_session):
+        create_entity(sqlite_session, Lead, {"name": "Alice", "email": "alice@example.com", "notes": "Long notes", "status": LeadStatus.NEW})
+
+        rows = get_entities(sqlite_session, Lead, columns=["name", "email", "no_such_column"], as_dict=True)
+
+        assert [dict(row) for row in rows] == [{"id": 1, "name": "Alice", "email": "alice@example.com"}]
+
+    def test_get_entities_columns_load_only(self, sqlite_session):
+        create_entity(sqlite_session, Lead, {"name": "Alice", "notes": "Long notes", "status": LeadStatus.NEW})
+        sqlite_session.expunge_all()
+
+        with count_selects(sqlite_session) as selects:
+            (lead,) = get_entities(sqlite_session, Lead, columns=["name"])
+        assert "notes" not in selects[0]
+        assert lead.name == "Alice"
+        assert lead.notes == "Long notes" # Deferred columns still load on access
+
+    def test_get_entities_sort_by_column_name(self, mock_db_session):
+        get_entities(mock_db_session, Lead, order_by_column='name', sort_direction='desc')
+        assert executed_statement(mock_db_session).compare(select(Lead).order_by(Lead.name.desc()).offset(0).limit(100))
+
+    @pytest.mark.parametrize("order_by_name", ["no_such_column", "company", "__init__"]) # Unknown, relationship, not an attribute
+    def test_get_entities_ignores_unsortable_names(self, mock_db_session, order_by_name):
+        get_entities(mock_db_session, Lead, order_by_column=order_by_name)
+        assert executed_statement(mock_db_session).compare(select(Lead).offset(0).limit(100))
+
+class TestGetEntitiesStrict:
+    def test_strict_raises_on_lazy_load(self, sqlite_session):
+        company = create_entity(sqlite_session, Company, {"name": "Test Co"})
+        create_entity(sqlite_session, Lead, {"name": "Lead", "email": "lead@example.com", "status": LeadStatus.NEW, "company_id": company.id})
+        sqlite_session.expunge_all()
+
+        leads = get_entities(sqlite_session, Lead, strict=True)
+        assert [lead.name for lead in leads] == ["Lead"] # Column attributes load normally
+        with pytest.raises(InvalidRequestError):
+            leads[0].company
+
+    def test_non_strict_lazy_loads(self, sqlite_session):
+        company = create_entity(sqlite_session, Company, {"name": "Test Co"})
+        create_entity(sqlite_session, Lead, {"name": "Lead", "email": "lead@example.com", "status": LeadStatus.NEW, "company_id": company.id})
+        sqlite_session.expunge_all()
+
+        leads = get_entities(sqlite_session, Lead)
+        assert leads[0].company.name == "Test Co"
 
 # Tests for update_entity
 class TestUpdateEntity:
     def test_update_entity_success(self, mock_db_session):
         entity_id = 1
         update_data = {"name": "Updated Name", "status": "updated_status"}
-        # Mock the entity instance that query().get() will return
+        # Mock the entity instance that Session.get will return
         mock_entity_instance = MockBaseModel(id=entity_id, name="Old Name", status="old_status") 
-        
-        mock_query = mock_db_session.query.return_value
-        mock_query.get.return_value = mock_entity_instance
+        mock_db_session.get.return_value = mock_entity_instance
         
         # Call the function under test
         updated_entity = update_entity(mock_db_session, Company, entity_id, update_data)
         
-        mock_db_session.query.assert_called_once_with(Company)
-        mock_query.get.assert_called_once_with(entity_id)
+        mock_db_session.get.assert_called_once_with(Company, entity_id)
         
         # Check that attributes were updated on the mock instance
         assert mock_entity_instance.name == "Updated Name"
         assert mock_entity_instance.status == "updated_status"
         
         mock_db_session.commit.assert_called_once()
-        mock_db_session.refresh.assert_called_once_with(mock_entity_instance)
+        mock_db_session.refresh.assert_not_called()
         assert updated_entity is mock_entity_instance
 
+    def test_update_entity_refresh_opt_in(self, mock_db_session):
+        mock_entity_instance = MockBaseModel(id=1, name="Old Name")
+        mock_db_session.get.return_value = mock_entity_instance
+
+        update_entity(mock_db_session, Company, 1, {"name": "New Name"}, refresh=True)
+
+        mock_db_session.refresh.assert_called_once_with(mock_entity_instance)
+
     def test_update_entity_not_found(self, mock_db_session):
         entity_id = 99
         update_data = {"name": "Updated Name"}
-        
-        mock_query = mock_db_session.query.return_value
-        mock_query.get.return_value = None # Simulate entity not found
+        mock_db_session.get.return_value = None # Simulate entity not found
         
         updated_entity = update_entity(mock_db_session, Company, entity_id, update_data)
         
-        mock_db_session.query.assert_called_once_with(Company)
-        mock_query.get.assert_called_once_with(entity_id)
+        mock_db_session.get.assert_called_once_with(Company, entity_id)
         mock_db_session.commit.assert_not_called()
         mock_db_session.refresh.assert_not_called()
         assert updated_entity is None
@@ -302,9 +346,7 @@ class TestUpdateEntity:
         entity_id = 1
         update_data = {"name": "Unique Name Violation"}
         mock_entity_instance = MockBaseModel(id=entity_id, name="Old Name")
-        
-        mock_query = mock_db_session.query.return_value
-        mock_query.get.return_value = mock_entity_instance
+        mock_db_session.get.return_value = mock_entity_instance
         mock_db_session.commit.side_effect = IntegrityError("mock statement", "mock params", "mock orig")
         
         updated_entity = update_entity(mock_db_session, Company, entity_id, update_data)
@@ -319,9 +361,7 @@ class TestUpdateEntity:
         entity_id = 1
         update_data = {"name": "New Name"}
         mock_entity_instance = MockBaseModel(id=entity_id, name="Old Name")
-        
-        mock_query = mock_db_session.query.return_value
-        mock_query.get.return_value = mock_entity_instance
+        mock_db_session.get.return_value = mock_entity_instance
         mock_db_session.commit.side_effect = SQLAlchemyError("DB error on commit")
         
         updated_entity = update_entity(mock_db_session, Company, entity_id, update_data)
@@ -334,9 +374,7 @@ class TestUpdateEntity:
         entity_id = 1
         update_data = {"name": "Good Update", "non_existent_field": "bad_value"}
         mock_entity_instance = Company(id=entity_id, name="Old Name") # Use a real model for hasattr check
-        
-        mock_query = mock_db_session.query.return_value
-        mock_query.get.return_value = mock_entity_instance
+        mock_db_session.get.return_value = mock_entity_instance
         
         updated_entity = update_entity(mock_db_session, Company, entity_id, update_data)
         
@@ -345,31 +383,85 @@ class TestUpdateEntity:
         mock_db_session.commit.assert_called_once()
         assert updated_entity is mock_entity_instance
 
+    def test_update_entity_no_changes_skips_commit(self, mock_db_session):
+        mock_entity_instance = MockBaseModel(id=1, name="Same Name")
+        mock_db_session.get.return_value = mock_entity_instance
+
+        updated_entity = update_entity(mock_db_session, Company, 1, {"name": "Same Name"})
+
+        mock_db_session.commit.assert_not_called()
+        mock_db_session.refresh.assert_not_called()
+        assert updated_entity is mock_entity_instance
+
+    def test_update_entity_uses_identity_map(self, sqlite_session):
+        company = create_entity(sqlite_session, Company, {"name": "Old Name"}, refresh=True)
+
+        with count_selects(sqlite_session) as selects:
+            assert update_entity(sqlite_session, Company, company.id, {"name": "Old Name"}) is company
+        assert selects == [] # Already loaded and unchanged: no SELECT, no UPDATE
+
+        assert update_entity(sqlite_session, Company, company.id, {"name": "New Name"}).name == "New Name"
+
+class TestTransactionalBatching:
+    def test_nc_variants_do_not_commit(self, mock_db_session):
+        entity = create_entity_nc(mock_db_session, MockBaseModel, {"name": "New"})
+        mock_db_session.add.assert_called_once_with(entity)
+
+        mock_db_session.get.return_value = MockBaseModel(id=1, name="Old")
+        assert update_entity_nc(mock_db_session, Company, 1, {"name": "New"}).name == "New"
+
+        mock_db_session.commit.assert_not_called()
+        mock_db_session.refresh.assert_not_called()
+
+    def test_update_entity_nc_not_found(self, mock_db_session):
+        mock_db_session.get.return_value = None
+        assert update_entity_nc(mock_db_session, Company, 1, {"name": "New"}) is None
+
+    def test_nc_variants_in_one_transaction(self, sqlite_session):
+        company = create_entity(sqlite_session, Company, {"name": "Old Name"})
+
+        with sqlite_session.begin():
+            create_entity_nc(sqlite_session, Company, {"name": "Another"})
+            update_entity_nc(sqlite_session, Company, company.id, {"name": "New Name"})
+
+        assert sorted(sqlite_session.execute(select(Company.name)).scalars()) == ["Another", "New Name"]
+
+    def test_bulk_upsert_creates_and_updates(self, sqlite_session):
+        company = create_entity(sqlite_session, Company, {"name": "Old Name"})
+
+        entities = bulk_upsert(sqlite_session, Company, [{"id": company.id, "name": "New Name"}, {"name": "Another"}])
+        assert not sqlite_session.in_transaction() # Committed
+
+        assert entities[0] is company
+        assert [entity.name for entity in entities] == ["New Name", "Another"]
+        assert entities[1].id is not None
+        assert sorted(sqlite_session.execute(select(Company.name)).scalars()) == ["Another", "New Name"]
+
+    def test_bulk_upsert_rolls_back_whole_batch(self, sqlite_session):
+        with pytest.raises(DataProcessingError):
+            bulk_upsert(sqlite_session, Lead, [
+                {"name": "First", "email": "same@example.com", "status": LeadStatus.NEW},
+                {"name": "Second", "email": "same@example.com", "status": LeadStatus.NEW},
+            ])
+        assert sqlite_session.execute(select(Lead.id)).all() == []
+
 # Tests for delete_entity
 class TestDeleteEntity:
     def test_delete_entity_success(self, mock_db_session):
         entity_id = 1
         mock_entity_instance = MockBaseModel(id=entity_id)
-        
-        mock_query = mock_db_session.query.return_value
-        mock_filter = mock_query.filter.return_value
-        mock_filter.first.return_value = mock_entity_instance
+        mock_db_session.execute.return_value.scalar_one_or_none.return_value = mock_entity_instance
         
         result = delete_entity(mock_db_session, Company, entity_id)
         
-        mock_db_session.query.assert_called_once_with(Company)
-        # mock_query.filter.assert_called_once_with(Company.id == entity_id) # simplified check
-        mock_query.filter.assert_called_once()
-        mock_filter.first.assert_called_once()
+        assert executed_statement(mock_db_session).compare(select(Company).where(Company.id == entity_id))
         mock_db_session.delete.assert_called_once_with(mock_entity_instance)
         mock_db_session.commit.assert_called_once()
         assert result is True
 
     def test_delete_entity_not_found(self, mock_db_session):
         entity_id = 99
-        mock_query = mock_db_session.query.return_value
-        mock_filter = mock_query.filter.return_value
-        mock_filter.first.return_value = None # Simulate not found
+        mock_db_session.execute.return_value.scalar_one_or_none.return_value = None # Simulate not found
         
         result = delete_entity(mock_db_session, Company, entity_id)
         
@@ -380,10 +472,7 @@ class TestDeleteEntity:
     def test_delete_entity_sqlalchemy_error_on_delete(self, mock_db_session):
         entity_id = 1
         mock_entity_instance = MockBaseModel(id=entity_id)
-        
-        mock_query = mock_db_session.query.return_value
-        mock_filter = mock_query.filter.return_value
-        mock_filter.first.return_value = mock_entity_instance
+        mock_db_session.execute.return_value.scalar_one_or_none.return_value = mock_entity_instance
         mock_db_session.delete.side_effect = SQLAlchemyError("DB error on delete")
         
         result = delete_entity(mock_db_session, Company, entity_id)
@@ -395,10 +484,7 @@ class TestDeleteEntity:
     def test_delete_entity_sqlalchemy_error_on_commit(self, mock_db_session):
         entity_id = 1
         mock_entity_instance = MockBaseModel(id=entity_id)
-        
-        mock_query = mock_db_session.query.return_value
-        mock_filter = mock_query.filter.return_value
-        mock_filter.first.return_value = mock_entity_instance
+        mock_db_session.execute.return_value.scalar_one_or_none.return_value = mock_entity_instance
         mock_db_session.commit.side_effect = SQLAlchemyError("DB error on commit")
         
         result = delete_entity(mock_db_session, Company, entity_id)
@@ -407,125 +493,213 @@ class TestDeleteEntity:
         mock_db_session.rollback.assert_called_once()
         assert result is False
 
+    def test_delete_entity_cleans_up_applications(self, sqlite_session, lead_and_job):
+        lead_id, job_id = lead_and_job
+        add_lead_to_job_posting(sqlite_session, lead_id, job_id)
+
+        assert delete_entity(sqlite_session, Lead, lead_id) is True
+        assert sqlite_session.execute(select(job_applications)).all() == [] # ORM delete removes association rows
+
 # Tests for Many-to-Many relationship functions
-# Mock Lead and JobPosting instances with relationship attributes
 @pytest.fixture
-def mock_lead_instance():
-    lead = MagicMock(spec=Lead) # Use spec to get attributes like applied_jobs if they exist on Lead
-    lead.id = 1
-    lead.name = "Test Lead"
-    lead.applied_jobs = [] # Mock the relationship attribute as a list
-    return lead
+def sqlite_session():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+@contextlib.contextmanager
+def count_selects(session):
+    """Collects the SELECT statements a session's engine executes inside the block."""
+    selects = []
+    def before_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            selects.append(statement)
+    engine = session.get_bind()
+    event.listen(engine, "before_cursor_execute", before_execute)
+    try:
+        yield selects
+    finally:
+        event.remove(engine, "before_cursor_execute", before_execute)
 
 @pytest.fixture
-def mock_job_instance():
-    job = MagicMock(spec=JobPosting)
-    job.id = 101
-    job.title = "Test Job"
-    job.applicants = [] # Mock the relationship attribute as a list
-    return job
+def lead_and_job(sqlite_session):
+    lead = create_entity(sqlite_session, Lead, {"name": "Test Lead", "email": "lead@example.com", "status": LeadStatus.NEW})
+    job = create_entity(sqlite_session, JobPosting, {"title": "Test Job"})
+    return lead.id, job.id
 
 class TestJobApplicationFunctions:
-    @patch('src.database.db_utils.get_entity')
-    def test_add_lead_to_job_posting_success(self, mock_get_entity_func, mock_db_session, mock_lead_instance, mock_job_instance):
-        # Configure get_entity to return our mock instances
-        def get_entity_side_effect(db_sess, model_cls, entity_id):
-            if model_cls == Lead and entity_id == mock_lead_instance.id: return mock_lead_instance
-            if model_cls == JobPosting and entity_id == mock_job_instance.id: return mock_job_instance
-            return None
-        mock_get_entity_func.side_effect = get_entity_side_effect
-        
-        mock_lead_instance.applied_jobs = [] 
+    def test_add_lead_to_job_posting_success(self, sqlite_session, lead_and_job):
+        lead_id, job_id = lead_and_job
+
+        result = add_lead_to_job_posting(sqlite_session, lead_id, job_id, application_status="Interviewing")
 
-        result = add_lead_to_job_posting(mock_db_session, mock_lead_instance.id, mock_job_instance.id)
-        
-        assert mock_get_entity_func.call_count == 2
-        assert mock_job_instance in mock_lead_instance.applied_jobs
-        mock_db_session.commit.assert_called_once()
         assert result is True
+        rows = sqlite_session.execute(select(job_applications)).all()
+        assert [(row.lead_id, row.job_posting_id, row.status) for row in rows] == [(lead_id, job_id, "Interviewing")]
+        assert rows[0].application_date is not None # Column default applied
 
-    @patch('src.database.db_utils.get_entity')
-    def test_add_lead_to_job_posting_already_associated(self, mock_get_entity_func, mock_db_session, mock_lead_instance, mock_job_instance):
-        mock_get_entity_func.side_effect = [mock_lead_instance, mock_job_instance]
-        mock_lead_instance.applied_jobs = [mock_job_instance]
+    def test_add_lead_to_job_posting_already_associated(self, sqlite_session, lead_and_job):
+        lead_id, job_id = lead_and_job
+        assert add_lead_to_job_posting(sqlite_session, lead_id, job_id) is True
 
-        result = add_lead_to_job_posting(mock_db_session, mock_lead_instance.id, mock_job_instance.id)
-        
-        assert len(mock_lead_instance.applied_jobs) == 1
-        mock_db_session.commit.assert_not_called()
-        assert result is True
+        with count_selects(sqlite_session) as selects, patch('src.database.db_utils._insert_job_applications') as mock_insert:
+            assert add_lead_to_job_posting(sqlite_session, lead_id, job_id, application_status="Offer") is True
+        assert len(selects) == 1 # Answered by the EXISTS probes alone
+        mock_insert.assert_not_called()
+        statuses = sqlite_session.execute(select(job_applications.c.status)).scalars().all()
+        assert statuses == ["Applied"] # Existing link left as is, no duplicate
 
-    @patch('src.database.db_utils.get_entity', return_value=None)
-    def test_add_lead_to_job_posting_lead_not_found(self, mock_get_entity_func, mock_db_session, mock_job_instance):
-        result = add_lead_to_job_posting(mock_db_session, 999, mock_job_instance.id)
-        mock_db_session.commit.assert_not_called()
-        assert result is False
+    def test_add_lead_to_job_posting_lead_not_found(self, sqlite_session, lead_and_job):
+        _, job_id = lead_and_job
+        assert add_lead_to_job_posting(sqlite_session, 999, job_id) is False
+        assert sqlite_session.execute(select(job_applications)).all() == []
 
-    @patch('src.database.db_utils.get_entity')
-    def test_add_lead_to_job_posting_job_not_found(self, mock_get_entity_func, mock_db_session, mock_lead_instance):
-        mock_get_entity_func.side_effect = [mock_lead_instance, None]
-        result = add_lead_to_job_posting(mock_db_session, mock_lead_instance.id, 999)
-        mock_db_session.commit.assert_not_called()
-        assert result is False
+    def test_add_lead_to_job_posting_job_not_found(self, sqlite_session, lead_and_job):
+        lead_id, _ = lead_and_job
+        assert add_lead_to_job_posting(sqlite_session, lead_id, 999) is False
+        assert sqlite_session.execute(select(job_applications)).all() == []
 
-    @patch('src.database.db_utils.get_entity')
-    def test_add_lead_to_job_posting_db_error(self, mock_get_entity_func, mock_db_session, mock_lead_instance, mock_job_instance):
-        mock_get_entity_func.side_effect = [mock_lead_instance, mock_job_instance]
-        mock_lead_instance.applied_jobs = []
-        mock_db_session.commit.side_effect = SQLAlchemyError("DB commit error")
+    def test_add_lead_to_job_posting_db_error(self, mock_db_session):
+        mock_db_session.execute.side_effect = SQLAlchemyError("DB error")
         
-        result = add_lead_to_job_posting(mock_db_session, mock_lead_instance.id, mock_job_instance.id)
+        result = add_lead_to_job_posting(mock_db_session, 1, 101)
         
         mock_db_session.rollback.assert_called_once()
         assert result is False
+
+    def test_add_leads_to_job_postings(self, sqlite_session, lead_and_job):
+        lead_id, job_id = lead_and_job
+        other_job_id = create_entity(sqlite_session, JobPosting, {"title": "Other Job"}).id
+        assert add_lead_to_job_posting(sqlite_session, lead_id, job_id) is True
+
+        assert add_leads_to_job_postings(sqlite_session, [(lead_id, job_id), (lead_id, other_job_id)]) is True
+        pairs = sqlite_session.execute(select(job_applications.c.lead_id, job_applications.c.job_posting_id)).all()
+        assert sorted(pairs) == [(lead_id, job_id), (lead_id, other_job_id)] # Existing pair skipped
+
+    def test_add_leads_to_job_postings_without_on_conflict(self, sqlite_session, lead_and_job):
+        lead_id, job_id = lead_and_job
+        other_job_id = create_entity(sqlite_session, JobPosting, {"title": "Other Job"}).id
+        assert add_lead_to_job_posting(sqlite_session, lead_id, job_id) is True
+
+        with patch.dict('src.database.db_utils._CONFLICT_IGNORING_INSERTS', clear=True): # Backend with a plain INSERT
+            pairs = [(lead_id, job_id), (lead_id, other_job_id), (lead_id, other_job_id)]
+            assert add_leads_to_job_postings(sqlite_session, pairs) is True
+        pairs = sqlite_session.execute(select(job_applications.c.lead_id, job_applications.c.job_posting_id)).all()
+        assert sorted(pairs) == [(lead_id, job_id), (lead_id, other_job_id)]
+
+    def test_add_leads_to_job_postings_unexpected_error(self, mock_db_session):
+        mock_db_session.execute.side_effect = RuntimeError("boom")
+        assert add_leads_to_job_postings(mock_db_session, [(1, 2)]) is False
+        mock_db_session.rollback.assert_called_once()
+        mock_db_session.commit.assert_not_called()
+
+    def test_add_leads_to_job_postings_skips_missing_ids(self, sqlite_session, lead_and_job):
+        lead_id, job_id = lead_and_job
+
+        assert add_leads_to_job_postings(sqlite_session, [(lead_id, job_id), (999, job_id), (lead_id, 999)]) is True
+        pairs = sqlite_session.execute(select(job_applications.c.lead_id, job_applications.c.job_posting_id)).all()
+        assert pairs == [(lead_id, job_id)]
+
+    def test_get_entities_by_ids(self, sqlite_session, lead_and_job):
+        lead_id, job_id = lead_and_job
+        other_job_id = create_entity(sqlite_session, JobPosting, {"title": "Other Job"}).id
+
+        jobs = get_entities_by_ids(sqlite_session, JobPosting, [job_id, other_job_id, 999])
+        assert {entity_id: job.title for entity_id, job in jobs.items()} == {job_id: "Test Job", other_job_id: "Other Job"}
+        assert get_entities_by_ids(sqlite_session, JobPosting, []) == {}
+
+    def test_get_entities_by_ids_sqlalchemy_error(self, mock_db_session):
+        mock_db_session.execute.side_effect = SQLAlchemyError("DB error")
+        assert get_entities_by_ids(mock_db_session, Lead, [1, 2]) == {}
+
+    def test_add_leads_to_job_postings_empty(self, mock_db_session):
+        assert add_leads_to_job_postings(mock_db_session, []) is True
+        mock_db_session.execute.assert_not_called()
     
-    @patch('src.database.db_utils.get_entity')
-    def test_remove_lead_from_job_posting_success(self, mock_get_entity_func, mock_db_session, mock_lead_instance, mock_job_instance):
-        mock_get_entity_func.side_effect = [mock_lead_instance, mock_job_instance]
-        mock_lead_instance.applied_jobs = [mock_job_instance]
+    def test_remove_lead_from_job_posting_success(self, sqlite_session, lead_and_job):
+        lead_id, job_id = lead_and_job
+        add_lead_to_job_posting(sqlite_session, lead_id, job_id)
+
+        with count_selects(sqlite_session) as selects:
+            result = remove_lead_from_job_posting(sqlite_session, lead_id, job_id)
 
-        result = remove_lead_from_job_posting(mock_db_session, mock_lead_instance.id, mock_job_instance.id)
-        
-        assert mock_job_instance not in mock_lead_instance.applied_jobs
-        mock_db_session.commit.assert_called_once()
         assert result is True
+        assert selects == [] # Nothing is loaded: just the DELETE
+        assert get_lead_applications(sqlite_session, lead_id) == []
 
-    @patch('src.database.db_utils.get_entity')
-    def test_remove_lead_from_job_posting_not_associated(self, mock_get_entity_func, mock_db_session, mock_lead_instance, mock_job_instance):
-        mock_get_entity_func.side_effect = [mock_lead_instance, mock_job_instance]
-        mock_lead_instance.applied_jobs = []
+    def test_remove_lead_from_job_posting_not_associated(self, sqlite_session, lead_and_job):
+        lead_id, job_id = lead_and_job
+        assert remove_lead_from_job_posting(sqlite_session, lead_id, job_id) is False
+        assert remove_lead_from_job_posting(sqlite_session, 999, job_id) is False
 
-        result = remove_lead_from_job_posting(mock_db_session, mock_lead_instance.id, mock_job_instance.id)
-        
+    def test_remove_lead_from_job_posting_db_error(self, mock_db_session):
+        mock_db_session.execute.side_effect = SQLAlchemyError("DB error")
+        assert remove_lead_from_job_posting(mock_db_session, 1, 2) is False
+        mock_db_session.rollback.assert_called_once()
         mock_db_session.commit.assert_not_called()
-        assert result is False
-
-    @patch('src.database.db_utils.get_entity')
-    def test_get_lead_applications(self, mock_get_entity_func, mock_db_session, mock_lead_instance, mock_job_instance):
-        mock_get_entity_func.return_value = mock_lead_instance
-        mock_lead_instance.applied_jobs = [mock_job_instance, MagicMock(spec=JobPosting)]
-        
-        applications = get_lead_applications(mock_db_session, mock_lead_instance.id)
-        mock_get_entity_func.assert_called_once_with(mock_db_session, Lead, mock_lead_instance.id)
-        assert applications == mock_lead_instance.applied_jobs
 
-    @patch('src.database.db_utils.get_entity', return_value=None)
-    def test_get_lead_applications_lead_not_found(self, mock_get_entity_func, mock_db_session):
-        applications = get_lead_applications(mock_db_session, 999)
+    def test_get_lead_applications(self, sqlite_session, lead_and_job):
+        lead_id, _ = lead_and_job
+        job_ids = [
+            create_entity(sqlite_session, JobPosting, {"title": f"Job {i}", "company_id": create_entity(sqlite_session, Company, {"name": f"Co {i}"}).id}).id
+            for i in range(2)
+        ]
+        add_leads_to_job_postings(sqlite_session, [(lead_id, job_id) for job_id in job_ids])
+        sqlite_session.expunge_all() # Start from an empty identity map, as a fresh request would
+
+        with count_selects(sqlite_session) as selects:
+            applications = get_lead_applications(sqlite_session, lead_id)
+            assert sorted((job.title, job.company.name) for job in applications) == [("Job 0", "Co 0"), ("Job 1", "Co 1")]
+        assert len(selects) == 3 # Lead, its jobs, their companies: no per-row lazy loads
+
+    def test_get_lead_applications_lead_not_found(self, sqlite_session):
+        applications = get_lead_applications(sqlite_session, 999)
         assert applications == []
 
-    @patch('src.database.db_utils.get_entity')
-    def test_get_job_applicants(self, mock_get_entity_func, mock_db_session, mock_job_instance, mock_lead_instance):
-        mock_get_entity_func.return_value = mock_job_instance
-        mock_job_instance.applicants = [mock_lead_instance, MagicMock(spec=Lead)]
-        
-        applicants = get_job_applicants(mock_db_session, mock_job_instance.id)
-        mock_get_entity_func.assert_called_once_with(mock_db_session, JobPosting, mock_job_instance.id)
-        assert applicants == mock_job_instance.applicants
-
-    @patch('src.database.db_utils.get_entity', return_value=None)
-    def test_get_job_applicants_job_not_found(self, mock_get_entity_func, mock_db_session):
-        applicants = get_job_applicants(mock_db_session, 999)
+    def test_get_lead_applications_sqlalchemy_error(self, mock_db_session):
+        mock_db_session.execute.side_effect = SQLAlchemyError("DB error")
+        assert get_lead_applications(mock_db_session, 1) == []
+
+    def test_get_job_applicants(self, sqlite_session, lead_and_job):
+        _, job_id = lead_and_job
+        lead_ids = [
+            create_entity(sqlite_session, Lead, {"name": f"Lead {i}", "email": f"lead{i}@example.com", "status": LeadStatus.NEW,
+                                                 "company_id": create_entity(sqlite_session, Company, {"name": f"Co {i}"}).id}).id
+            for i in range(2)
+        ]
+        add_leads_to_job_postings(sqlite_session, [(lead_id, job_id) for lead_id in lead_ids])
+        sqlite_session.expunge_all()
+
+        with count_selects(sqlite_session) as selects:
+            applicants = get_job_applicants(sqlite_session, job_id)
+            assert sorted((lead.name, lead.company.name) for lead in applicants) == [("Lead 0", "Co 0"), ("Lead 1", "Co 1")]
+        assert len(selects) == 3 # Job, its applicants, their companies
+
+    def test_get_job_applicants_job_not_found(self, sqlite_session):
+        applicants = get_job_applicants(sqlite_session, 999)
         assert applicants == []
 
-# TODO: Add test cases for other db_utils functions 
\ No newline at end of file
+    def test_query_leads_with_applications(self, sqlite_session, lead_and_job):
+        lead_id, job_id = lead_and_job
+        other_lead_id = create_entity(sqlite_session, Lead, {"name": "Other Lead", "status": LeadStatus.NEW}).id
+        closed_job_id = create_entity(sqlite_session, JobPosting, {"title": "Closed Job", "status": "Closed"}).id
+        second_job_id = create_entity(sqlite_session, JobPosting, {"title": "Second Job"}).id
+        add_leads_to_job_postings(sqlite_session, [(lead_id, job_id), (lead_id, second_job_id), (lead_id, closed_job_id), (other_lead_id, job_id)])
+        sqlite_session.expunge_all()
+
+        with count_selects(sqlite_session) as selects:
+            leads = query_leads_with_applications(sqlite_session)
+            applications = {lead.id: sorted(job.id for job in lead.applied_jobs) for lead in leads}
+
+        assert applications == {lead_id: sorted([job_id, second_job_id]), other_lead_id: [job_id]}
+        assert len(selects) == 1 # Collections came from the join, no lazy loads
+        assert selects[0].count("JOIN") == 2 # leads -> job_applications -> job_postings, once
+
+    def test_query_leads_with_applications_sqlalchemy_error(self, mock_db_session):
+        mock_db_session.execute.side_effect = SQLAlchemyError("DB error")
+        assert query_leads_with_applications(mock_db_session) == []
+
+# TODO: Add test cases for other db_utils functions 
@@ -192,5 +192,11 @@ class TestJobPostingModel:
         job = JobPosting(title="No ID Job", status="Pending")
         assert repr(job) == "<JobPosting(id=None, title='No ID Job', status='Pending')>"
 
+class TestJobApplicationsTable:
+    def test_lookup_by_job_posting_uses_reverse_index(self, db_session):
+        from sqlalchemy import text
+        plan = db_session.execute(text("EXPLAIN QUERY PLAN SELECT lead_id FROM job_applications WHERE job_posting_id = 1")).all()
+        assert any("ix_job_applications_job_lead" in row[-1] for row in plan)
+
 # TODO: Add test cases for job_applications table (if direct interaction is needed)
 # TODO: Add test cases for Enums (LeadStatus, JobType) if they have methods or complex logic (they don't currently) 
\ No newline at end of file
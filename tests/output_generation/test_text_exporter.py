@@ -5,7 +5,15 @@ from unittest.mock import MagicMock, patch, mock_open
 from freezegun import freeze_time
 import datetime # Need the real datetime for isinstance
 
-from src.output_generation.text_exporter import TextFileExporter, OutputGenerationError
+from src.output_generation import text_exporter
+from src.output_generation.text_exporter import TextFileExporter, OutputGenerationError, EXPORT_WRITE_BUFFER_SIZE
+
+@pytest.fixture(autouse=True)
+def clear_ensured_dirs():
+    """Each test starts as a fresh process, with no output directory known to exist."""
+    text_exporter._ENSURED_DIRS.clear()
+    yield
+    text_exporter._ENSURED_DIRS.clear()
 
 class TestTextFileExporterInit:
     @patch('src.output_generation.text_exporter.os.makedirs')
@@ -35,6 +43,18 @@ class TestTextFileExporterInit:
         mock_log_warning.assert_called_once_with(f"Falling back to current directory for output.")
         assert exporter.output_dir == "."
 
+    @patch('src.output_generation.text_exporter.os.makedirs')
+    def test_init_ensures_each_directory_once(self, mock_makedirs):
+        TextFileExporter(output_dir="reused_dir")
+        TextFileExporter(output_dir="reused_dir")
+        mock_makedirs.assert_called_once_with("reused_dir", exist_ok=True)
+
+    @patch('src.output_generation.text_exporter.os.makedirs', side_effect=[OSError("Permission denied"), None])
+    def test_init_retries_directory_after_failure(self, mock_makedirs):
+        assert TextFileExporter(output_dir="flaky_dir").output_dir == "."
+        assert TextFileExporter(output_dir="flaky_dir").output_dir == "flaky_dir"
+        assert mock_makedirs.call_count == 2
+
     def test_init_default_output_dir(self):
         # Test with default output_dir="output"
         with patch('src.output_generation.text_exporter.os.makedirs') as mock_makedirs_default:
@@ -64,6 +84,10 @@ def sample_leads_data():
         }
     ]
 
+def written_content(mock_file_open):
+    """Everything written to a mock_open file handle, joined in call order."""
+    return ''.join(call.args[0] for call in mock_file_open().write.call_args_list)
+
 class TestExportLeadsToTxt:
     
     @patch('src.output_generation.text_exporter.open', new_callable=mock_open)
@@ -78,7 +102,7 @@ class TestExportLeadsToTxt:
         result_path = exporter.export_leads_to_txt(leads=sample_leads_data, filename=custom_filename)
 
         mock_path_join.assert_called_once_with("output", custom_filename)
-        mock_file_open.assert_called_once_with(expected_filepath, 'w', encoding='utf-8')
+        mock_file_open.assert_called_once_with(expected_filepath, 'w', encoding='utf-8', buffering=EXPORT_WRITE_BUFFER_SIZE)
         assert result_path == expected_filepath
 
     @patch('src.output_generation.text_exporter.open', new_callable=mock_open)
@@ -109,13 +133,12 @@ class TestExportLeadsToTxt:
         
         assert mock_log_warning.call_count == 3 # One for each invalid item
         # Check that data for valid leads was still written
-        handle = mock_file_open()
-        handle.write.assert_any_call("Lead #1\n")
-        handle.write.assert_any_call("Lead #2\n")
-        handle.write.assert_any_call("Lead #3\n")
+        content = written_content(mock_file_open)
+        assert "Lead #1\n" in content
+        assert "Lead #2\n" in content
+        assert "Lead #3\n" in content
         # Ensure it didn't try to write e.g. "Lead #4"
-        with pytest.raises(AssertionError): 
-            handle.write.assert_any_call("Lead #4\n")
+        assert "Lead #4\n" not in content
 
     @patch('src.output_generation.text_exporter.os.makedirs')
     @patch('src.output_generation.text_exporter.os.path.join', return_value='output/leads.txt')
@@ -173,16 +196,57 @@ class TestExportLeadsToTxt:
         result_path = exporter.export_leads_to_txt(leads=sample_leads_data, filename=test_filename)
 
         mock_path_join.assert_called_once_with("test_dir", test_filename)
-        mock_file_open.assert_called_once_with(expected_filepath, 'w', encoding='utf-8')
+        mock_file_open.assert_called_once_with(expected_filepath, 'w', encoding='utf-8', buffering=EXPORT_WRITE_BUFFER_SIZE)
         assert result_path == expected_filepath
 
         # Check if write calls were made (example check)
-        handle = mock_file_open() 
+        content = written_content(mock_file_open)
         # Header check might need adjustment if we no longer mock datetime.now for it
         # Check total leads and lead details write instead
-        handle.write.assert_any_call(f"Total Leads: {len(sample_leads_data)}\n")
-        handle.write.assert_any_call("Lead #1\n")
-        handle.write.assert_any_call("Name:       Alice A\n")
+        assert f"Total Leads: {len(sample_leads_data)}\n" in content
+        assert "Lead #1\n" in content
+        assert "Name:       Alice A\n" in content
         # The isinstance check inside the function should now work correctly
 
-        assert result_path == expected_filepath 
\ No newline at end of file
+        assert result_path == expected_filepath 
+
+class TestExportLeadsToTxtStream:
+
+    def test_stream_export_from_generator(self, tmp_path, sample_leads_data):
+        exporter = TextFileExporter(output_dir=str(tmp_path))
+
+        result_path = exporter.export_leads_to_txt_stream((lead for lead in sample_leads_data + [None]), filename="stream.txt")
+
+        assert result_path == os.path.join(str(tmp_path), "stream.txt")
+        with open(result_path, encoding='utf-8') as f:
+            content = f.read()
+        assert "Lead #1\n" in content and "Lead #3\n" in content
+        assert "Name:       Alice A\n" in content
+        assert "Lead #4\n" not in content # The None item is skipped
+        assert content.endswith("Total Leads: 4\n")
+
+    def test_stream_export_matches_list_export_records(self, tmp_path, sample_leads_data):
+        exporter = TextFileExporter(output_dir=str(tmp_path))
+        list_path = exporter.export_leads_to_txt(sample_leads_data, filename="list.txt")
+        stream_path = exporter.export_leads_to_txt_stream(iter(sample_leads_data), filename="stream.txt")
+
+        with open(list_path, encoding='utf-8') as f_list, open(stream_path, encoding='utf-8') as f_stream:
+            list_records = f_list.read().split("="*40 + "\n\n", 1)[1]
+            stream_records = f_stream.read().split("="*40 + "\n\n", 1)[1]
+        assert stream_records == list_records + f"Total Leads: {len(sample_leads_data)}\n"
+
+    @patch('src.output_generation.text_exporter.EXPORT_WRITE_BATCH_SIZE', 2)
+    @patch('src.output_generation.text_exporter.open', new_callable=mock_open)
+    @patch('src.output_generation.text_exporter.os.makedirs')
+    def test_records_written_in_batches(self, mock_mkdirs, mock_file_open, sample_leads_data):
+        TextFileExporter().export_leads_to_txt_stream(iter(sample_leads_data), filename="batched.txt")
+
+        record_writes = [call.args[0] for call in mock_file_open().write.call_args_list if call.args[0].startswith("Lead #")]
+        assert [write.count("Lead #") for write in record_writes] == [2, 1] # Batches of 2, then the remainder
+
+    @patch('src.output_generation.text_exporter.open', new_callable=mock_open)
+    @patch('src.output_generation.text_exporter.os.makedirs')
+    def test_stream_export_empty_iterable(self, mock_mkdirs, mock_file_open):
+        exporter = TextFileExporter()
+        assert exporter.export_leads_to_txt_stream(iter([])) == ""
+        mock_file_open.assert_not_called()
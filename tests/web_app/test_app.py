@@ -2,16 +2,17 @@
 import pytest
 from fastapi import status, FastAPI
 from fastapi.testclient import TestClient
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 from contextlib import contextmanager
 import datetime
+import logging
 
 # from src.web_app.app import app 
 
 # Import the app and dependencies from api_main
-from src.web_app.api_main import app, get_db, get_config, db_manager, config_manager
+from src.web_app.api_main import app, get_db, get_config, db_manager, config_manager, RequestLoggingMiddleware
 from src.database import models
 
 # --- Test Client Setup ---
@@ -92,6 +93,29 @@ class TestDependencies:
         from src.web_app.api_main import config_manager as global_config
         assert retrieved_config is global_config 
 
+class TestRequestLoggingMiddleware:
+    def test_logs_start_and_completion_with_status(self, test_client_for_app, caplog):
+        with caplog.at_level(logging.INFO, logger="src.web_app.api_main"):
+            test_client_for_app.get("/no-such-route")
+
+        messages = [record.getMessage() for record in caplog.records if record.name == "src.web_app.api_main"]
+        start_message = next(message for message in messages if "start request" in message)
+        completed_message = next(message for message in messages if "completed_in=" in message)
+        rid = start_message.split()[0]
+        assert start_message == f"{rid} start request path=/no-such-route"
+        assert completed_message.startswith(f"{rid} completed_in=")
+        assert completed_message.endswith("status_code=404")
+
+    def test_passes_through_non_http_scopes(self):
+        import asyncio
+        inner_app = AsyncMock()
+        middleware = RequestLoggingMiddleware(inner_app)
+        scope, receive, send = {"type": "lifespan"}, AsyncMock(), AsyncMock()
+
+        asyncio.run(middleware(scope, receive, send))
+
+        inner_app.assert_awaited_once_with(scope, receive, send) # The original send, unwrapped
+
 class TestExceptionHandlers:
     # Test the SQLAlchemyError handler
     # We need an endpoint that can potentially raise SQLAlchemyError during its operation.
@@ -102,6 +102,7 @@ def test_read_jobs_defaults(mock_get_entities, test_client):
     assert kwargs.get('skip') == 0
     assert kwargs.get('limit') == 100
     assert kwargs.get('filters') == {}
+    assert kwargs.get('as_dict') is True # List endpoints skip ORM materialization
     
     response_data = response.json()
     assert len(response_data) == 2
@@ -149,7 +149,7 @@ def test_read_leads_with_params(mock_get_entities, test_client):
         'company_id': 1
     }
     assert kwargs.get('filters') == expected_filters
-    assert kwargs.get('order_by_column') == models.Lead.name # Check column object
+    assert kwargs.get('order_by_column') == 'name' # Column name, resolved by db_utils
     assert kwargs.get('sort_direction') == 'desc'
 
     response_data = response.json()